@@ -0,0 +1,76 @@
+"""
+Run the benchmark suite and write the results as JSON.
+
+The benchmarks require a display. On headless machines they can be run
+with a virtual framebuffer large enough for 4K images, e.g.:
+
+    xvfb-run -s "-screen 0 3840x2160x24" python -m benchmarks -o results.json
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import sys
+
+import tkinter as tk
+
+from .scenarios import SCENARIOS
+
+parser = argparse.ArgumentParser(
+    description="Benchmark draw latency, draws per change, Tcl calls and memory of reacTk"
+)
+parser.add_argument(
+    "--scenario",
+    "-s",
+    choices=list(SCENARIOS),
+    action="append",
+    help="scenario to run (can be repeated) - all by default",
+)
+parser.add_argument(
+    "--changes",
+    "-n",
+    type=int,
+    default=50,
+    help="number of changes applied per scenario and parameter set",
+)
+parser.add_argument(
+    "--output",
+    "-o",
+    type=str,
+    default=None,
+    help="file the JSON results are written to - stdout by default",
+)
+args = parser.parse_args()
+
+if sys.platform.startswith("linux") and "DISPLAY" not in os.environ:
+    sys.exit("No display available - run the benchmarks with `xvfb-run`")
+
+root = tk.Tk()
+root.geometry("1280x720")
+root.update()
+
+results = []
+for name in args.scenario or list(SCENARIOS):
+    print(f"Running scenario {name}...", file=sys.stderr)
+    for result in SCENARIOS[name](root, args.changes):
+        results.append({"scenario": name, **result})
+root.destroy()
+
+report = {
+    "meta": {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tk": tk.TkVersion,
+        "changes": args.changes,
+    },
+    "results": results,
+}
+
+if args.output is None:
+    json.dump(report, sys.stdout, indent=2)
+else:
+    with open(args.output, mode="w") as f:
+        json.dump(report, f, indent=2)
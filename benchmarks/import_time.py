@@ -0,0 +1,100 @@
+"""
+Measure the time to import modules of reacTk in fresh interpreters.
+
+Besides the time, it reports which heavy dependencies were loaded by the
+import. Run it with:
+
+    python -m benchmarks.import_time -o import_time.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any
+
+from .lib import summarize
+
+MODULES = [
+    "reacTk.widget.label",
+    "reacTk.widget.chechbox",
+    "reacTk.util",
+    "reacTk.state",
+    "reacTk.decorator",
+    "reacTk.widget.canvas.image",
+    "reacTk.widget.canvas.raster",
+    "reacTk.widget.canvas.contour",
+]
+
+HEAVY_DEPENDENCIES = [
+    "cv2",
+    "numpy",
+    "PIL",
+    "screeninfo",
+    "asyncio",
+    "concurrent.futures.process",
+    "reacTk.state.store",
+]
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+duration = time.perf_counter() - start
+print(json.dumps({{
+    "duration": duration,
+    "loaded": [name for name in {dependencies} if name in sys.modules],
+}}))
+"""
+
+
+def measure_import(module: str) -> dict[str, Any]:
+    """
+    Import a module in a fresh interpreter and return the duration in
+    seconds and the heavy dependencies loaded.
+    """
+    script = SCRIPT.format(module=module, dependencies=HEAVY_DEPENDENCIES)
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def import_time(modules: list[str], n_runs: int) -> list[dict[str, Any]]:
+    results = []
+    for module in modules:
+        runs = [measure_import(module) for _ in range(n_runs)]
+        results.append(
+            {
+                "module": module,
+                "import_ms": summarize([run["duration"] for run in runs]),
+                "loaded": runs[0]["loaded"],
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the import time of modules of reacTk"
+    )
+    parser.add_argument(
+        "--modules", "-m", type=str, nargs="+", default=MODULES, choices=MODULES
+    )
+    parser.add_argument("--n_runs", "-n", type=int, default=5)
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="file the JSON results are written to - stdout by default",
+    )
+    args = parser.parse_args()
+
+    results = import_time(args.modules, args.n_runs)
+
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+    else:
+        with open(args.output, mode="w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,143 @@
+"""
+Utilities to measure draws, Tcl calls and memory of benchmark scenarios.
+"""
+
+from contextlib import contextmanager
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator, Type
+
+import tkinter as tk
+
+
+class CountingTk:
+    """
+    Proxy of a Tcl interpreter that counts calls.
+
+    Tk widgets issue all commands via their `tk` attribute, so replacing
+    it with this proxy counts the Tcl calls of a widget.
+    """
+
+    def __init__(self, tk_app: Any) -> None:
+        self.tk_app = tk_app
+        self.calls = 0
+
+    def call(self, *args: Any) -> Any:
+        self.calls += 1
+        return self.tk_app.call(*args)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.tk_app, name)
+
+
+@contextmanager
+def count_tcl_calls(widget: tk.Misc) -> Iterator[CountingTk]:
+    """
+    Count the Tcl calls issued by a widget inside the context.
+    """
+    counter = CountingTk(widget.tk)
+    widget.tk = counter
+    try:
+        yield counter
+    finally:
+        widget.tk = counter.tk_app
+
+
+class DrawRecorder:
+    """
+    Record the time each draw of a widget class finishes.
+    """
+
+    def __init__(self, cls: Type) -> None:
+        self.cls = cls
+        self.draw = cls.draw
+        self.times: list[float] = []
+
+    def __enter__(self) -> "DrawRecorder":
+        orig_draw = self.draw
+        times = self.times
+
+        def draw(widget: Any, state: Any) -> None:
+            orig_draw(widget, state)
+            times.append(time.perf_counter())
+
+        self.cls.draw = draw
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.cls.draw = self.draw
+
+    def since(self, start: float) -> list[float]:
+        return [t for t in self.times if t >= start]
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    """
+    Summarize measurements (in seconds) as milliseconds.
+    """
+    if len(values) == 0:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+
+    values = sorted(values)
+    return {
+        "mean": 1000 * statistics.fmean(values),
+        "p50": 1000 * values[len(values) // 2],
+        "p95": 1000 * values[min(int(0.95 * len(values)), len(values) - 1)],
+        "max": 1000 * values[-1],
+    }
+
+
+def measure_changes(
+    root: tk.Tk,
+    canvas: tk.Canvas,
+    recorders: list[DrawRecorder],
+    change: Callable[[int], None],
+    n_changes: int,
+) -> dict[str, Any]:
+    """
+    Apply changes one at a time and measure until Tk has processed them.
+
+    Parameters
+    ----------
+    root: tk.Tk
+        the application, updated after each change
+    canvas: tk.Canvas
+        the canvas of which Tcl calls are counted
+    recorders: list of DrawRecorder
+        recorders of the widget classes drawn by changes
+    change: callable
+        function applying the i-th change
+    n_changes: int
+        number of changes
+
+    Returns
+    -------
+    dict
+        change-to-draw latency, draws per change, Tcl calls per frame
+        and peak memory allocated by Python
+    """
+    latencies = []
+    draws = 0
+
+    tracemalloc.start()
+    with count_tcl_calls(canvas) as counter:
+        for i in range(n_changes):
+            start = time.perf_counter()
+            change(i)
+            root.update()
+
+            times = [t for recorder in recorders for t in recorder.since(start)]
+            draws += len(times)
+            if len(times) > 0:
+                latencies.append(max(times) - start)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "changes": n_changes,
+        "latency_ms": summarize(latencies),
+        "draws_per_change": draws / n_changes,
+        "tcl_calls_per_frame": counter.calls / n_changes,
+        "peak_memory_kb": peak / 1024,
+    }
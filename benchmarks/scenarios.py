@@ -0,0 +1,226 @@
+"""
+Representative scenarios of the hot paths of reacTk.
+
+Each scenario creates its widgets on a fresh canvas, applies changes and
+returns a list of results (one per parameter set).
+"""
+
+from contextlib import ExitStack
+import threading
+import time
+from typing import Any
+
+import numpy as np
+import tkinter as tk
+
+from reacTk.decorator import async_once, recurrency_filter
+from reacTk.state import PointState
+from reacTk.widget.canvas import Canvas, CanvasState
+from reacTk.widget.canvas.circle import Circle, CircleData, CircleState
+from reacTk.widget.canvas.contour import Contour, ContourData, ContourState
+from reacTk.widget.canvas.image import Image, ImageData, ImageState
+from reacTk.widget.canvas.line import Line
+from reacTk.widget.canvas.rectangle import Rectangle, RectangleData, RectangleState
+
+from .lib import DrawRecorder, measure_changes, summarize
+
+Result = dict[str, Any]
+
+
+def create_canvas(root: tk.Tk, width: int, height: int) -> Canvas:
+    canvas = Canvas(root, CanvasState())
+    canvas.config(width=width, height=height)
+    canvas.pack()
+    root.update()
+    return canvas
+
+
+def image(root: tk.Tk, n_changes: int) -> list[Result]:
+    """
+    Change the data of a 1080p/4K image and resize the canvas.
+    """
+    results = []
+    for name, (height, width) in {"1080p": (1080, 1920), "4k": (2160, 3840)}.items():
+        canvas = create_canvas(root, 1280, 720)
+        frames = [
+            np.random.randint(0, 256, size=(height, width, 3), dtype=np.uint8)
+            for _ in range(2)
+        ]
+        widget = Image(canvas, ImageState(ImageData(frames[0])))
+        root.update()
+
+        with DrawRecorder(Image) as recorder:
+            result = measure_changes(
+                root,
+                canvas,
+                [recorder],
+                lambda i: widget._state.data.set(frames[i % 2]),
+                n_changes,
+            )
+            results.append({"params": {"size": name, "change": "data"}, **result})
+
+            sizes = [(1280, 720), (960, 540)]
+            result = measure_changes(
+                root,
+                canvas,
+                [recorder],
+                lambda i: canvas.config(width=sizes[i % 2][0], height=sizes[i % 2][1]),
+                n_changes,
+            )
+            results.append({"params": {"size": name, "change": "resize"}, **result})
+
+        widget.delete()
+        canvas.destroy()
+    return results
+
+
+def contour(root: tk.Tk, n_changes: int) -> list[Result]:
+    """
+    Move, insert and remove vertices of contours with 100/1k/10k points.
+    """
+    results = []
+    for n_points in (100, 1_000, 10_000):
+        canvas = create_canvas(root, 1280, 720)
+
+        angles = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
+        points = [
+            PointState(int(640 + 300 * np.cos(a)), int(360 + 300 * np.sin(a)))
+            for a in angles
+        ]
+        widget = Contour(canvas, ContourState(ContourData(points)))
+        root.update()
+
+        data = widget._state.data
+
+        def insert_remove(i: int) -> None:
+            if i % 2 == 0:
+                data.insert(1, PointState(640, 360))
+            else:
+                data.remove(data[1])
+
+        with ExitStack() as stack:
+            recorders = [
+                stack.enter_context(DrawRecorder(cls))
+                for cls in (Contour, Line, Rectangle)
+            ]
+
+            result = measure_changes(
+                root,
+                canvas,
+                recorders,
+                lambda i: data[i % n_points].set(640 + i % 100, 360),
+                n_changes,
+            )
+            results.append({"params": {"points": n_points, "change": "move"}, **result})
+
+            result = measure_changes(root, canvas, recorders, insert_remove, n_changes)
+            results.append(
+                {"params": {"points": n_points, "change": "insert_remove"}, **result}
+            )
+
+        widget.delete()
+        canvas.destroy()
+    return results
+
+
+def items(root: tk.Tk, n_changes: int) -> list[Result]:
+    """
+    Move many rectangles and circles at once - each change moves all items.
+    """
+    results = []
+    for n_items in (100, 1_000):
+        canvas = create_canvas(root, 1280, 720)
+
+        rng = np.random.default_rng(0)
+        centers = [
+            PointState(int(x), int(y))
+            for x, y in rng.integers((0, 0), (1280, 720), size=(n_items, 2))
+        ]
+        half = n_items // 2
+        widgets = [
+            Rectangle(canvas, RectangleState(RectangleData(center, size=10)))
+            for center in centers[:half]
+        ] + [
+            Circle(canvas, CircleState(CircleData(center, radius=5)))
+            for center in centers[half:]
+        ]
+        root.update()
+
+        def move(i: int) -> None:
+            for center in centers:
+                center.set(center.x.value + (1 if i % 2 == 0 else -1), center.y.value)
+
+        with DrawRecorder(Rectangle) as rectangles, DrawRecorder(Circle) as circles:
+            result = measure_changes(
+                root, canvas, [rectangles, circles], move, n_changes
+            )
+        results.append({"params": {"items": n_items}, **result})
+
+        for widget in widgets:
+            widget.delete()
+        canvas.destroy()
+    return results
+
+
+def decorators(root: tk.Tk, n_changes: int) -> list[Result]:
+    """
+    Call functions decorated with `async_once` and `recurrency_filter` in bursts.
+    """
+    results = []
+    n_calls = 100 * n_changes
+
+    executed = []
+
+    @async_once
+    def process(i: int) -> int:
+        time.sleep(0.001)
+        executed.append(i)
+        return i
+
+    start = time.perf_counter()
+    futures = [process(i) for i in range(n_calls)]
+    issued = time.perf_counter()
+    futures[-1].result()
+    done = time.perf_counter()
+    results.append(
+        {
+            "params": {"decorator": "async_once", "calls": n_calls},
+            "executed": len(executed),
+            "issue_ms": 1000 * (issued - start),
+            "latest_result_ms": 1000 * (done - start),
+            "threads": threading.active_count(),
+        }
+    )
+
+    interval = 0.01
+    calls = []
+    finished = threading.Event()
+
+    @recurrency_filter(interval)
+    def throttled(i: int) -> None:
+        calls.append(time.perf_counter())
+        if i == n_calls - 1:
+            finished.set()
+
+    start = time.perf_counter()
+    for i in range(n_calls):
+        throttled(i)
+    issued = time.perf_counter()
+    finished.wait(timeout=10 * interval)
+    results.append(
+        {
+            "params": {"decorator": "recurrency_filter", "calls": n_calls},
+            "executed": len(calls),
+            "issue_ms": 1000 * (issued - start),
+            "delivery_ms": summarize([t - start for t in calls]),
+        }
+    )
+    return results
+
+
+SCENARIOS = {
+    "image": image,
+    "contour": contour,
+    "items": items,
+    "decorators": decorators,
+}
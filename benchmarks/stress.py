@@ -0,0 +1,276 @@
+"""
+Stress the decorators with concurrent calls from many threads and instances.
+
+The harness asserts the contracts of the decorators and reports thread
+counts, wall time and latencies. Run it with:
+
+    python -m benchmarks.stress -o stress.json
+"""
+
+import argparse
+from concurrent.futures import Future, wait
+from dataclasses import asdict, dataclass, field
+import json
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+from reacTk.decorator import async_once, recurrency_filter
+from reacTk.decorator.asynchron import MAX_WORKERS
+
+
+@dataclass
+class StressReport:
+    """
+    Result of a stress run.
+
+    * calls: number of calls issued
+    * executed: number of executions of the decorated function
+    * wall_time: seconds from the first call until all calls are settled
+    * max_latency: maximal seconds from a call until its execution finished
+    * max_threads: maximal number of threads alive during the run
+    * violations: descriptions of violated contracts
+    """
+
+    name: str
+    calls: int
+    executed: int = 0
+    wall_time: float = 0.0
+    max_latency: float = 0.0
+    max_threads: int = 0
+    violations: list[str] = field(default_factory=list)
+
+
+class ThreadMonitor:
+    """
+    Sample the number of threads alive in the background.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.max_threads = threading.active_count()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.max_threads = max(self.max_threads, threading.active_count())
+
+    def __enter__(self) -> "ThreadMonitor":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.stopped.set()
+        self.thread.join()
+        # the monitor thread itself does not count
+        self.max_threads -= 1
+
+
+def run_threads(n_threads: int, target: Callable[[int], None]) -> None:
+    """
+    Start threads executing `target(thread_index)` at the same time and join them.
+    """
+    barrier = threading.Barrier(n_threads)
+
+    def run(index: int) -> None:
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class AsyncOnceWorker:
+    """
+    Instance with a method decorated with `async_once` that checks that it
+    never runs concurrently.
+    """
+
+    def __init__(self, duration: float, report: StressReport, lock: threading.Lock):
+        self.duration = duration
+        self.report = report
+        self.lock = lock
+        self.running = 0
+        self.executed: list[int] = []
+
+    @async_once
+    def process(self, value: int, issued: float) -> float:
+        with self.lock:
+            self.running += 1
+            if self.running > 1:
+                self.report.violations.append(f"concurrent execution of {value}")
+            self.report.executed += 1
+
+        time.sleep(self.duration)
+        self.executed.append(value)
+
+        with self.lock:
+            self.running -= 1
+        return time.perf_counter() - issued
+
+
+def stress_async_once(
+    n_threads: int = 16,
+    n_instances: int = 8,
+    calls_per_thread: int = 1000,
+    duration: float = 0.0005,
+    timeout: float = 30.0,
+) -> StressReport:
+    """
+    Call an `async_once` method of many instances from many threads.
+
+    Contracts:
+      * a method never runs concurrently for the same instance
+      * every call is either executed or cancelled - and `wait` returns
+      * the latest call of each instance is executed last
+      * the number of threads is bounded by the shared pool
+    """
+    report = StressReport("async_once", calls=n_threads * calls_per_thread)
+    lock = threading.Lock()
+    workers = [AsyncOnceWorker(duration, report, lock) for _ in range(n_instances)]
+    futures: list[list[Future]] = [[] for _ in range(n_threads)]
+    # callers, the shared pool and threads that may already exist
+    max_threads = threading.active_count() + n_threads + MAX_WORKERS
+
+    def call(index: int) -> None:
+        for i in range(calls_per_thread):
+            worker = workers[(index + i) % n_instances]
+            futures[index].append(worker.process(i, time.perf_counter()))
+
+    start = time.perf_counter()
+    with ThreadMonitor() as monitor:
+        run_threads(n_threads, call)
+        # the final call of each instance is issued after all others
+        final = [worker.process(-1, time.perf_counter()) for worker in workers]
+        all_futures = [future for _futures in futures for future in _futures] + final
+        _, not_done = wait(all_futures, timeout=timeout)
+    report.wall_time = time.perf_counter() - start
+    report.max_threads = monitor.max_threads
+
+    if len(not_done) > 0:
+        report.violations.append(f"{len(not_done)} calls are not settled")
+    if report.max_threads > max_threads:
+        report.violations.append(
+            f"{report.max_threads} threads exceed the bound of {max_threads}"
+        )
+
+    latencies = [
+        future.result()
+        for future in all_futures
+        if future.done() and not future.cancelled() and future.exception() is None
+    ]
+    report.max_latency = max(latencies, default=0.0)
+
+    for i, (worker, future) in enumerate(zip(workers, final)):
+        if future.cancelled():
+            report.violations.append(f"the final call of instance {i} was cancelled")
+        elif len(worker.executed) == 0 or worker.executed[-1] != -1:
+            report.violations.append(
+                f"the final call of instance {i} was not executed last"
+            )
+    return report
+
+
+def stress_recurrency_filter(
+    n_threads: int = 16,
+    n_instances: int = 8,
+    calls_per_thread: int = 1000,
+    interval: float = 0.02,
+    tolerance: float = 0.005,
+) -> StressReport:
+    """
+    Call a throttled method of many instances from many threads.
+
+    Contracts:
+      * executions of the same instance are at least `interval` apart
+      * the latest call of each instance is executed eventually and last
+    """
+    report = StressReport("recurrency_filter", calls=n_threads * calls_per_thread)
+    lock = threading.Lock()
+
+    class Throttled:
+
+        def __init__(self) -> None:
+            self.executions: list[tuple[float, int, float]] = []
+
+        @recurrency_filter(interval)
+        def update(self, value: int, issued: float) -> None:
+            now = time.perf_counter()
+            with lock:
+                self.executions.append((now, value, now - issued))
+                report.executed += 1
+
+    instances = [Throttled() for _ in range(n_instances)]
+
+    def call(index: int) -> None:
+        for i in range(calls_per_thread):
+            instances[(index + i) % n_instances].update(i, time.perf_counter())
+
+    start = time.perf_counter()
+    with ThreadMonitor() as monitor:
+        run_threads(n_threads, call)
+        for instance in instances:
+            instance.update(-1, time.perf_counter())
+
+        deadline = time.perf_counter() + 10 * interval
+        while time.perf_counter() < deadline and not all(
+            len(instance.executions) > 0 and instance.executions[-1][1] == -1
+            for instance in instances
+        ):
+            time.sleep(interval / 4)
+    report.wall_time = time.perf_counter() - start
+    report.max_threads = monitor.max_threads
+
+    for i, instance in enumerate(instances):
+        times = sorted(execution[0] for execution in instance.executions)
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        if len(gaps) > 0 and min(gaps) < interval - tolerance:
+            report.violations.append(
+                f"instance {i} executed within {min(gaps):.4f}s < {interval}s"
+            )
+        if len(instance.executions) == 0 or instance.executions[-1][1] != -1:
+            report.violations.append(f"the final call of instance {i} was lost")
+
+        latencies = [execution[2] for execution in instance.executions]
+        report.max_latency = max([report.max_latency, *latencies])
+    return report
+
+
+STRESS_TESTS = {
+    "async_once": stress_async_once,
+    "recurrency_filter": stress_recurrency_filter,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Stress the decorators of reacTk with concurrent calls"
+    )
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--instances", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=1000, help="calls per thread")
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="file the JSON reports are written to - stdout by default",
+    )
+    args = parser.parse_args()
+
+    reports = [
+        asdict(stress(args.threads, args.instances, args.calls))
+        for stress in STRESS_TESTS.values()
+    ]
+
+    if args.output is None:
+        json.dump(reports, sys.stdout, indent=2)
+    else:
+        with open(args.output, mode="w") as f:
+            json.dump(reports, f, indent=2)
+
+    sys.exit(1 if any(report["violations"] for report in reports) else 0)
@@ -1,10 +1,10 @@
 #!/bin/bash
 
 echo "Black:" &&
-black --check reacTk example tests &&
+black --check reacTk example tests benchmarks &&
 echo "" &&
 echo "Flake8:" &&
-flake8 --max-line-length 127 reacTk example &&
+flake8 --max-line-length 127 reacTk example benchmarks &&
 echo "" &&
 echo "PyTest:" &&
 pytest tests
@@ -2,7 +2,8 @@
 Demo application that draws a contour on a canvas.
 
 The contour can be modified:
-  * vertices can be moved by dragging them with the mouse
+  * vertices can be moved by dragging them with the mouse - motion events
+    are compressed so that only the latest position is applied per frame
   * vertices can be removed on right click
   * vertices can be added by double-clicking somewhere on a line
 """
@@ -44,6 +45,7 @@ class ContourApp(App):
             "<B1-Motion>",
             lambda ev, rectangle: rectangle._state.data.center.set(ev.x, ev.y),
             _type="rectangle",
+            compress=True,
         )
         contour.tag_bind(
             "<Button-3>",
@@ -52,9 +54,8 @@ class ContourApp(App):
         )
         contour.tag_bind(
             "<Double-Button-1>",
-            lambda event, line: contour._state.data.insert(
-                contour._state.data.index(line._state.data.end),
-                PointState(event.x, event.y),
+            lambda event, line: contour._state.data.insert_before(
+                line._state.data.end, PointState(event.x, event.y)
             ),
             _type="line",
         )
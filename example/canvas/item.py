@@ -74,10 +74,12 @@ class ItemApp(App):
         )
         self.bb._state.style.rectangle_style.color.set("red")
         self.bb._state.data.x1.set(400)
-        for rect in self.bb.rectangles:
-            rect.tag_bind(
-                "<B1-Motion>", lambda ev, rect: rect._state.data.center.set(ev.x, ev.y)
-            )
+        self.bb.tag_bind(
+            "<B1-Motion>",
+            lambda ev, rect: rect._state.data.center.set(ev.x, ev.y),
+            _type="rectangle",
+            compress=True,
+        )
 
         self.text = Text(
             self.canvas,
@@ -1,10 +1,52 @@
+import importlib
+from typing import Any
+
 from .asynchron import asynchron, async_once
+from .batch import batch_update
+from .governor import get_governor, get_quality
+from .profiling import disable_profiling, enable_profiling, get_profiler
 from .recurrency_filter import recurrency_filter
 from .stateful import stateful
+from .tracing import get_tracer, start_tracing, stop_tracing, trace
+
+# names of modules that are expensive to import (e.g., because of asyncio or
+# process pools) are only imported on first access
+LAZY_NAMES = {
+    "feed": ".event_loop",
+    "get_event_loop_thread": ".event_loop",
+    "process_once": ".process",
+    "submit": ".event_loop",
+    "to_state": ".process",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(LAZY_NAMES[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "asynchron",
     "async_once",
+    "batch_update",
+    "disable_profiling",
+    "enable_profiling",
+    "feed",
+    "get_event_loop_thread",
+    "get_governor",
+    "get_profiler",
+    "get_quality",
+    "get_tracer",
+    "process_once",
     "recurrency_filter",
+    "start_tracing",
     "stateful",
+    "stop_tracing",
+    "submit",
+    "to_state",
+    "trace",
 ]
@@ -1,12 +1,22 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 import functools
 import inspect
+import os
 import threading
-from typing import Callable, Generic, Optional, ParamSpec
+import traceback
+import weakref
+from typing import Callable, Generic, Optional, ParamSpec, TypeVar
 from warnings import warn
 
-
 P = ParamSpec("P")
+R = TypeVar("R")
+
+# maximal number of threads executing functions decorated with `async_once`
+MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
 
 
 def is_instance_method(func: Callable) -> bool:
@@ -31,6 +41,87 @@ class AsyncData(Generic[P]):
         self.last_kwargs: Optional[P.kwargs] = None
 
 
+@dataclass
+class CallData(Generic[P, R]):
+    """
+    Calls of a function decorated with `async_once` (per instance for methods).
+    """
+
+    def __init__(self, instance: Optional[weakref.ref] = None) -> None:
+        self.instance = instance
+        self.current_call: Optional[Future[R]] = None
+        self.pending_call: Optional[tuple[Future[R], P.args, P.kwargs]] = None
+
+
+class CallRegistry(Generic[P, R]):
+    """
+    Registry of the calls of a function decorated with `async_once`.
+
+    Calls are tracked per instance for instance methods. An entry only
+    exists while a call is running or pending and it references its instance
+    weakly. Thus, the registry does not keep instances alive and does not
+    grow with the number of instances ever called.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls: dict[int, CallData[P, R]] = {}
+
+    def key(self, instance: Optional[object]) -> int:
+        return 0 if instance is None else id(instance)
+
+    def get(self, instance: Optional[object]) -> CallData[P, R]:
+        """
+        Get or create the call data of an instance - the lock must be held.
+        """
+        key = self.key(instance)
+        if key not in self.calls:
+            try:
+                ref = None if instance is None else weakref.ref(instance)
+            except TypeError:
+                # the instance does not support weak references
+                ref = None
+            self.calls[key] = CallData[P, R](ref)
+        return self.calls[key]
+
+    def release(self, instance: Optional[object]) -> None:
+        """
+        Remove the call data of an instance - the lock must be held.
+        """
+        self.calls.pop(self.key(instance), None)
+
+    def running(self, instance: Optional[object] = None) -> Optional[Future[R]]:
+        """
+        Get the future of the running call (of an instance).
+        """
+        with self.lock:
+            call_data = self.calls.get(self.key(instance))
+            return None if call_data is None else call_data.current_call
+
+    def pending(self, instance: Optional[object] = None) -> Optional[Future[R]]:
+        """
+        Get the future of the pending call (of an instance).
+        """
+        with self.lock:
+            call_data = self.calls.get(self.key(instance))
+            if call_data is None or call_data.pending_call is None:
+                return None
+            return call_data.pending_call[0]
+
+    def instances(self) -> list[object]:
+        """
+        Get all instances with running or pending calls.
+        """
+        with self.lock:
+            refs = [call_data.instance for call_data in self.calls.values()]
+        instances = [ref() for ref in refs if ref is not None]
+        return [instance for instance in instances if instance is not None]
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.calls)
+
+
 def asynchron(func: Callable[P, None]) -> Callable[P, None]:
     warn("`asynchron` decorator is deprecated. Use `async_once` instead")
     async_data = AsyncData()
@@ -68,47 +159,142 @@ def asynchron(func: Callable[P, None]) -> Callable[P, None]:
     return wrapper
 
 
-def async_once(func: Callable[P, None]) -> Callable[P, None]:
-    async_data_map_lock = threading.Lock()
-    async_data_map = {}
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool shared by all functions decorated with `async_once`.
+
+    The pool is created on first use and bounded by `MAX_WORKERS` threads.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_WORKERS, thread_name_prefix="async_once"
+            )
+        return _executor
+
+
+def report_exception(future: Future) -> None:
+    """
+    Print exceptions of calls to stderr as it happens for exceptions in threads.
+    """
+    if not future.cancelled() and future.exception() is not None:
+        exception = future.exception()
+        traceback.print_exception(type(exception), exception, exception.__traceback__)
+
+
+def supersede(future: Future) -> None:
+    """
+    Cancel a pending call that is superseded by a newer call.
+
+    The future never reaches an executor. Thus, it is also marked as notified
+    so that `concurrent.futures.wait` and `as_completed` consider it done.
+    """
+    future.cancel()
+    future.set_running_or_notify_cancel()
+
+
+def async_once(func: Callable[P, R]) -> Callable[P, Future[R]]:
+    """
+    Execute a function asynchronously, but never run it concurrently.
+
+    If the function is called while it is running, the call is
+    delayed until the running call is finished. Only the latest
+    delayed call is executed, and superseded calls are cancelled.
+    For instance methods, this applies per instance.
+
+    Calls are executed by a bounded thread pool shared by all decorated
+    functions (see `get_executor`). Running and pending calls can be
+    inspected with the `calls` registry of the decorated function (see
+    `CallRegistry`), e.g., `instance.method.calls.pending(instance)`.
+
+    Coroutine functions (`async def`) are executed by the shared asyncio
+    event loop (see `event_loop`) instead of the thread pool.
+
+    Returns
+    -------
+    Future
+        the future of the call - it is cancelled if the call is
+        superseded before it started, and cancelling it before it started
+        prevents its execution
+    """
+    registry = CallRegistry[P, R]()
     func_is_instance_method = is_instance_method(func)
+    func_is_coroutine = inspect.iscoroutinefunction(func)
+    if func_is_coroutine:
+        # asyncio is only imported if coroutine functions are decorated
+        from .event_loop import submit
 
-    def trigger_pending(async_data) -> None:
-        async_data.current_call.join()
+    def next_call(instance: Optional[object]) -> Optional[tuple]:
+        """
+        Get the pending call to execute next or release the instance if there is none.
+        """
+        with registry.lock:
+            call_data = registry.get(instance)
+            if call_data.pending_call is None:
+                registry.release(instance)
+                return None
 
-        with async_data.lock:
-            async_data.pending_call = None
+            call = call_data.pending_call
+            call_data.pending_call = None
+            call_data.current_call = call[0]
+            return call
 
-            async_data.current_call = threading.Thread(
-                target=func, args=async_data.last_args, kwargs=async_data.last_kwargs
-            )
-            async_data.current_call.start()
+    def run(
+        instance: Optional[object], future: Future[R], args: P.args, kwargs: P.kwargs
+    ) -> None:
+        while True:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
 
-    @functools.wraps(func)
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> None:
-        with async_data_map_lock:
-            _self = args[0] if func_is_instance_method else 0
-            if _self not in async_data_map:
-                async_data_map[_self] = AsyncData()
-            async_data = async_data_map[_self]
+            # execute the pending call in the same worker instead of
+            # submitting it, which could spawn another thread
+            call = next_call(instance)
+            if call is None:
+                return
+            future, args, kwargs = call
 
-        with async_data.lock:
-            if async_data.current_call is None:
-                async_data.current_call = threading.Thread(
-                    target=func, args=args, kwargs=kwargs
-                )
-                async_data.current_call.start()
+    async def run_async(
+        instance: Optional[object], future: Future[R], args: P.args, kwargs: P.kwargs
+    ) -> None:
+        while True:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(await func(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+
+            call = next_call(instance)
+            if call is None:
                 return
+            future, args, kwargs = call
 
-            async_data.last_args = args
-            async_data.last_kwargs = kwargs
-            if (
-                async_data.pending_call is None
-                or async_data.pending_call.is_alive() is False
-            ):
-                async_data.pending_call = threading.Thread(
-                    target=trigger_pending, args=[async_data]
-                )
-                async_data.pending_call.start()
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> Future[R]:
+        instance = args[0] if func_is_instance_method else None
+
+        future = Future()
+        future.add_done_callback(report_exception)
+
+        with registry.lock:
+            call_data = registry.get(instance)
+            if call_data.current_call is None:
+                call_data.current_call = future
+                if func_is_coroutine:
+                    submit(run_async(instance, future, args, kwargs))
+                else:
+                    get_executor().submit(run, instance, future, args, kwargs)
+                return future
+
+            if call_data.pending_call is not None:
+                supersede(call_data.pending_call[0])
+            call_data.pending_call = (future, args, kwargs)
+
+        return future
 
+    wrapper.calls = registry
     return wrapper
@@ -0,0 +1,66 @@
+"""
+Batch updates of states so that stateful widgets are redrawn once.
+"""
+
+from contextlib import contextmanager
+import threading
+from typing import Any, Iterator
+
+
+class Batch(threading.local):
+    """
+    Widgets with deferred draws of the current thread.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.widgets: dict[int, Any] = {}
+
+
+_batch = Batch()
+
+
+def is_batching() -> bool:
+    """
+    Test if the current thread is inside a `batch_update` context.
+    """
+    return _batch.depth > 0
+
+
+def defer(widget: Any) -> None:
+    """
+    Defer the draw of a stateful widget until the batch is finished.
+    """
+    _batch.widgets[id(widget)] = widget
+
+
+@contextmanager
+def batch_update() -> Iterator[None]:
+    """
+    Defer the draws of stateful widgets until the context is exited.
+
+    Changes of states inside the context do not schedule draws. Instead,
+    each affected widget is drawn once with its current state on exit.
+    This applies to changes made by the current thread and contexts
+    may be nested - draws are deferred until the outermost one exits.
+
+    Example
+    -------
+    >>> with batch_update():
+    ...     contour[0].x.value = 10
+    ...     bounding_box.x1.value = 10
+    ...     label.value = "moved"
+    """
+    _batch.depth += 1
+    try:
+        yield
+    finally:
+        _batch.depth -= 1
+        if _batch.depth == 0:
+            widgets = list(_batch.widgets.values())
+            _batch.widgets.clear()
+
+            for widget in widgets:
+                # the widget may have been unsubscribed during the batch
+                if widget._stateful_callback is not None:
+                    widget._stateful_notify()
@@ -0,0 +1,126 @@
+"""
+Asyncio event loop running next to the Tk mainloop.
+
+Coroutines are executed by a single event loop on a background thread.
+Thus, many I/O-bound data sources (sockets, file streams, subprocess pipes)
+can feed states without a thread per source. States may be changed from the
+event loop, because `stateful` widgets dispatch their draws to the Tk thread.
+"""
+
+import asyncio
+from concurrent.futures import Future
+import threading
+from typing import Any, AsyncIterable, Callable, Coroutine, Optional, TypeVar
+
+from widget_state import BasicState, State
+
+T = TypeVar("T")
+
+
+class EventLoopThread:
+    """
+    Asyncio event loop executed by a daemon thread.
+
+    The thread is started when the first coroutine is submitted.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the event loop and start it if it is not running.
+        """
+        with self.lock:
+            if self.loop is None or self.loop.is_closed():
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(
+                    target=self.run,
+                    args=(self.loop,),
+                    name="reacTk-asyncio",
+                    daemon=True,
+                )
+                self.thread.start()
+            return self.loop
+
+    def run(self, loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def submit(self, coroutine: Coroutine[Any, Any, T]) -> Future[T]:
+        """
+        Execute a coroutine on the event loop - this can be called from any thread.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.get_loop())
+
+    def stop(self) -> None:
+        """
+        Stop the event loop and wait for its thread to finish.
+        """
+        with self.lock:
+            loop, thread = self.loop, self.thread
+            self.loop = self.thread = None
+
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+
+_event_loop_thread = EventLoopThread()
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    """
+    Get the event loop thread shared by all decorators.
+    """
+    return _event_loop_thread
+
+
+def submit(coroutine: Coroutine[Any, Any, T]) -> Future[T]:
+    """
+    Execute a coroutine on the shared event loop.
+    """
+    return _event_loop_thread.submit(coroutine)
+
+
+def feed(
+    state: State,
+    source: AsyncIterable[T],
+    update: Optional[Callable[[State, T], None]] = None,
+) -> Future[None]:
+    """
+    Update a state with every value of an asynchronous source.
+
+    Parameters
+    ----------
+    state: State
+        the state receiving the values
+    source: AsyncIterable
+        source of values, e.g., an asynchronous generator reading a socket
+    update: callable, optional
+        function that updates the state with a value. By default, the
+        value of basic states is set and other states copy from the values
+
+    Returns
+    -------
+    Future
+        future finished when the source is exhausted - cancel it to stop feeding
+    """
+
+    async def _feed() -> None:
+        async for value in source:
+            if update is not None:
+                update(state, value)
+            elif isinstance(state, BasicState):
+                state.value = value
+            else:
+                state.copy_from(value)
+
+    return submit(_feed())
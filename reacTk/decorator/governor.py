@@ -0,0 +1,186 @@
+"""
+Global frame-rate governor for stateful widgets.
+
+If enabled, draws are not executed for every state change. Instead, widgets
+are marked as dirty and drawn together in frames, of which at most `fps`
+are executed per second. If frames take longer than the budget, the quality
+of expensive drawing operations is reduced and restored once there is
+headroom again.
+"""
+
+import threading
+import time
+from typing import Any, Optional
+import weakref
+
+import tkinter as tk
+
+from .visibility import draw_if_visible, draw_state
+
+# virtual event used to execute frames on the Tk thread
+FRAME_EVENT = "<<reacTkFrame>>"
+
+# quality levels read by canvas items when drawing
+QUALITY_LOW = 0  # + contour vertex handles are hidden
+QUALITY_MEDIUM = 1  # nearest neighbour image interpolation, no anti-aliasing
+QUALITY_HIGH = 2
+
+
+class Governor:
+    """
+    Cap the number of draw passes per second and adapt the drawing quality.
+
+    Parameters
+    ----------
+    fps: float
+        maximal number of frames per second
+    step_up_frames: int
+        number of consecutive frames with headroom required to increase the quality
+    headroom: float
+        a frame has headroom if it takes less than this fraction of the budget
+    """
+
+    def __init__(
+        self, fps: float = 60.0, step_up_frames: int = 30, headroom: float = 0.5
+    ) -> None:
+        self.enabled = False
+        self.fps = fps
+        self.step_up_frames = step_up_frames
+        self.headroom = headroom
+
+        self.lock = threading.Lock()
+        self.dirty: dict[int, Any] = {}
+        self.scheduled = False
+        self.last_frame = -float("inf")
+
+        self.quality = QUALITY_HIGH
+        self.frames_with_headroom = 0
+        # widgets drawn with reduced quality that are redrawn once it increases
+        self.degraded: weakref.WeakSet[Any] = weakref.WeakSet()
+        self.roots: weakref.WeakSet[tk.Misc] = weakref.WeakSet()
+
+    def configure(
+        self, enabled: Optional[bool] = None, fps: Optional[float] = None
+    ) -> None:
+        """
+        Enable/disable the governor or change the frame rate.
+        """
+        if fps is not None:
+            assert fps > 0, f"Frames per second must be positive, not {fps}"
+            self.fps = fps
+        if enabled is not None:
+            self.enabled = enabled
+            if not enabled:
+                self.quality = QUALITY_HIGH
+                self.frames_with_headroom = 0
+
+    def budget(self) -> float:
+        """
+        Time in seconds available per frame.
+        """
+        return 1.0 / self.fps
+
+    def request(self, widget: Any, tk_widget: tk.Misc) -> None:
+        """
+        Request a draw of a stateful widget in the next frame - this can be
+        called from any thread.
+        """
+        root = tk_widget._root()
+        with self.lock:
+            self.dirty[id(widget)] = widget
+            # bound while holding the lock, so that each root is bound once
+            if root not in self.roots:
+                root.bind_all(FRAME_EVENT, self.on_frame_event, add="+")
+                self.roots.add(root)
+
+            if self.scheduled:
+                return
+            self.scheduled = True
+
+        try:
+            tk_widget.event_generate(FRAME_EVENT, when="tail")
+        except tk.TclError:
+            # the widget was destroyed
+            with self.lock:
+                self.dirty.pop(id(widget), None)
+                self.scheduled = False
+            widget.unsubscribe()
+
+    def on_frame_event(self, event: tk.Event) -> None:
+        delay = self.last_frame + self.budget() - time.monotonic()
+        if delay > 0:
+            event.widget.after(round(delay * 1000), self.frame)
+        else:
+            self.frame()
+
+    def frame(self) -> None:
+        """
+        Draw all dirty widgets and adapt the quality to the time it took.
+        """
+        with self.lock:
+            widgets = list(self.dirty.values())
+            self.dirty.clear()
+            self.scheduled = False
+
+        start = self.last_frame = time.monotonic()
+        for widget in widgets:
+            # the widget may have been unsubscribed in the meantime
+            if widget._stateful_callback is None:
+                continue
+
+            draw_if_visible(widget, draw_state(widget))
+            if self.quality < QUALITY_HIGH:
+                self.degraded.add(widget)
+
+        if self.adapt(time.monotonic() - start):
+            # redraw widgets drawn with lower quality
+            for widget in list(self.degraded):
+                if widget._stateful_callback is not None:
+                    tk_widget = (
+                        widget if isinstance(widget, tk.Widget) else widget.widget
+                    )
+                    self.request(widget, tk_widget)
+            self.degraded.clear()
+
+    def adapt(self, duration: float) -> bool:
+        """
+        Adapt the quality to the duration of a frame.
+
+        Returns
+        -------
+        bool
+            if the quality was increased
+        """
+        if duration > self.budget():
+            self.quality = max(self.quality - 1, QUALITY_LOW)
+            self.frames_with_headroom = 0
+            return False
+
+        if duration > self.headroom * self.budget() or self.quality == QUALITY_HIGH:
+            self.frames_with_headroom = 0
+            return False
+
+        self.frames_with_headroom += 1
+        if self.frames_with_headroom < self.step_up_frames:
+            return False
+
+        self.quality += 1
+        self.frames_with_headroom = 0
+        return True
+
+
+_governor = Governor()
+
+
+def get_governor() -> Governor:
+    """
+    Get the governor shared by all stateful widgets.
+    """
+    return _governor
+
+
+def get_quality() -> int:
+    """
+    Get the quality level canvas items should draw with.
+    """
+    return _governor.quality if _governor.enabled else QUALITY_HIGH
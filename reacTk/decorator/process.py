@@ -0,0 +1,371 @@
+"""
+Decorator to offload CPU-heavy functions to a process pool.
+
+Large NumPy arrays are passed to and from the worker processes via
+shared memory instead of being pickled.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+import functools
+import importlib
+from multiprocessing import shared_memory
+import queue
+import threading
+import traceback
+from typing import Any, Callable, NamedTuple, Optional, ParamSpec, TypeVar
+import weakref
+
+import tkinter as tk
+from widget_state import BasicState, State
+
+from ..lazy import is_imported, lazy_import
+from .asynchron import (
+    CallData,
+    get_executor,
+    is_instance_method,
+    report_exception,
+    supersede,
+)
+
+np = lazy_import("numpy")
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# arrays with less bytes are pickled because shared memory has a setup overhead
+MIN_SHARED_BYTES = 1 << 16
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_process_executor() -> ProcessPoolExecutor:
+    """
+    Get the process pool shared by all functions decorated with `process_once`.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor()
+        return _executor
+
+
+class SharedArray(NamedTuple):
+    """
+    Reference to an array in shared memory that can be pickled cheaply.
+    """
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+def share(value: Any, blocks: list[shared_memory.SharedMemory]) -> Any:
+    """
+    Copy a large array into shared memory and return a reference to it.
+
+    Other values are returned as they are. The created shared memory
+    block is appended to `blocks`.
+    """
+    # without NumPy imported, the value cannot be an array
+    if (
+        not is_imported("numpy")
+        or not isinstance(value, np.ndarray)
+        or value.nbytes < MIN_SHARED_BYTES
+    ):
+        return value
+
+    block = shared_memory.SharedMemory(create=True, size=value.nbytes)
+    blocks.append(block)
+
+    array = np.ndarray(value.shape, dtype=value.dtype, buffer=block.buf)
+    array[...] = value
+    return SharedArray(block.name, value.shape, value.dtype.str)
+
+
+def attach(value: Any, blocks: list[shared_memory.SharedMemory]) -> Any:
+    """
+    Resolve a reference to an array in shared memory into an array.
+
+    The array is a view of the shared memory block appended to `blocks`.
+    """
+    if not isinstance(value, SharedArray):
+        return value
+
+    block = shared_memory.SharedMemory(name=value.name)
+    blocks.append(block)
+    return np.ndarray(value.shape, dtype=np.dtype(value.dtype), buffer=block.buf)
+
+
+def close(blocks: list[shared_memory.SharedMemory], unlink: bool = False) -> None:
+    for block in blocks:
+        block.close()
+        if unlink:
+            block.unlink()
+    blocks.clear()
+
+
+def execute(
+    module_name: str, qualname: str, args: tuple, kwargs: dict[str, Any]
+) -> Any:
+    """
+    Execute a decorated function inside a worker process.
+
+    The function is resolved by its module and qualified name, so that it
+    does not need to be pickled.
+    """
+    func = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        func = getattr(func, name)
+    func = getattr(func, "__wrapped__", func)
+
+    blocks = []
+    try:
+        args = tuple(attach(arg, blocks) for arg in args)
+        kwargs = {key: attach(value, blocks) for key, value in kwargs.items()}
+        result = func(*args, **kwargs)
+    finally:
+        # views into shared memory must not outlive their blocks
+        del args, kwargs
+        close(blocks)
+
+    result_blocks = []
+    result = share(result, result_blocks)
+    # the block is unlinked by the parent process after reading it
+    close(result_blocks)
+    return result
+
+
+def receive(value: Any) -> Any:
+    """
+    Copy a result returned via shared memory and release the memory.
+    """
+    blocks = []
+    array = attach(value, blocks)
+    if len(blocks) == 0:
+        return value
+
+    array = array.copy()
+    close(blocks, unlink=True)
+    return array
+
+
+def process_once(func: Callable[P, R]) -> Callable[P, Future[R]]:
+    """
+    Execute a function in a process pool, but never run it concurrently.
+
+    This is the process based sibling of `async_once`: If the function is
+    called while it is running, only the latest call is executed afterwards
+    and superseded calls are cancelled. It is meant for CPU-heavy functions
+    (e.g., using NumPy or OpenCV) that would otherwise compete with the
+    GUI thread for the GIL.
+
+    The function must be defined at the top level of a module so that worker
+    processes can import it. NumPy arrays given as arguments or returned
+    are transferred via shared memory if they are larger than `MIN_SHARED_BYTES`.
+
+    Returns
+    -------
+    Future
+        the future of the call, see `to_state` for setting its result to a state
+    """
+    assert not is_instance_method(
+        func
+    ), "`process_once` cannot decorate instance methods"
+
+    lock = threading.Lock()
+    call_data = CallData[P, R]()
+
+    def start(future: Future[R], args: P.args, kwargs: P.kwargs) -> None:
+        if not future.set_running_or_notify_cancel():
+            start_pending()
+            return
+
+        blocks = []
+        try:
+            _args = tuple(share(arg, blocks) for arg in args)
+            _kwargs = {key: share(value, blocks) for key, value in kwargs.items()}
+            process_future = get_process_executor().submit(
+                execute, func.__module__, func.__qualname__, _args, _kwargs
+            )
+        except BaseException as e:
+            close(blocks, unlink=True)
+            future.set_exception(e)
+            start_pending()
+            return
+
+        process_future.add_done_callback(functools.partial(on_done, future, blocks))
+
+    def on_done(
+        future: Future[R],
+        blocks: list[shared_memory.SharedMemory],
+        process_future: Future,
+    ) -> None:
+        # done-callbacks are executed by the management thread of the process
+        # pool, which must not be blocked by copying results or starting calls
+        get_executor().submit(finish, future, blocks, process_future)
+
+    def finish(
+        future: Future[R],
+        blocks: list[shared_memory.SharedMemory],
+        process_future: Future,
+    ) -> None:
+        try:
+            close(blocks, unlink=True)
+            future.set_result(receive(process_future.result()))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            start_pending()
+
+    def start_pending() -> None:
+        with lock:
+            if call_data.pending_call is None:
+                call_data.current_call = None
+                return
+
+            future, args, kwargs = call_data.pending_call
+            call_data.pending_call = None
+            call_data.current_call = future
+
+        start(future, args, kwargs)
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> Future[R]:
+        future = Future()
+        future.add_done_callback(report_exception)
+
+        with lock:
+            if call_data.current_call is not None:
+                if call_data.pending_call is not None:
+                    supersede(call_data.pending_call[0])
+                call_data.pending_call = (future, args, kwargs)
+                return future
+
+            call_data.current_call = future
+
+        start(future, args, kwargs)
+        return future
+
+    return wrapper
+
+
+class TkResults:
+    """
+    Hand the results of futures over to the Tk thread.
+
+    Done-callbacks of futures are executed by the threads finishing them,
+    which must not use Tk. Instead, they put the updates into a queue,
+    which is polled by the Tk thread with `after` while futures are outstanding.
+    There is one instance per widget.
+    """
+
+    _instances: weakref.WeakKeyDictionary[tk.Misc, "TkResults"] = (
+        weakref.WeakKeyDictionary()
+    )
+
+    @classmethod
+    def of(cls, widget: tk.Misc) -> "TkResults":
+        if widget not in cls._instances:
+            cls._instances[widget] = cls(widget)
+        return cls._instances[widget]
+
+    def __init__(self, widget: tk.Misc, interval: int = 10) -> None:
+        self.widget = widget
+        self.interval = interval
+        self.updates: queue.SimpleQueue[Optional[Callable[[], None]]] = (
+            queue.SimpleQueue()
+        )
+        self.outstanding = 0
+
+    def add(self, future: Future[R], update: Callable[[R], None]) -> None:
+        """
+        Call `update` with the result of a future on the Tk thread.
+
+        This must be called from the Tk thread. Nothing is called if the
+        future is cancelled or fails.
+        """
+
+        def on_done(future: Future[R]) -> None:
+            if future.cancelled() or future.exception() is not None:
+                self.updates.put(None)
+                return
+            result = future.result()
+            self.updates.put(lambda: update(result))
+
+        self.outstanding += 1
+        if self.outstanding == 1:
+            self.widget.after(self.interval, self.poll)
+        future.add_done_callback(on_done)
+
+    def poll(self) -> None:
+        while True:
+            try:
+                update = self.updates.get_nowait()
+            except queue.Empty:
+                break
+
+            self.outstanding -= 1
+            if update is None:
+                continue
+            try:
+                update()
+            except Exception:
+                traceback.print_exc()
+
+        if self.outstanding > 0:
+            try:
+                self.widget.after(self.interval, self.poll)
+            except tk.TclError:
+                # the widget was destroyed
+                pass
+
+
+def to_state(
+    future: Future[R],
+    state: State,
+    widget: tk.Misc,
+    update: Optional[Callable[[State, R], None]] = None,
+) -> None:
+    """
+    Set the result of a future to a state on the GUI thread.
+
+    This must be called from the GUI thread, e.g., by the event handler
+    calling a function decorated with `process_once` (see `TkResults`).
+
+    Parameters
+    ----------
+    future: Future
+        future of a call, e.g., returned by `process_once`
+    state: State
+        the state receiving the result
+    widget: tk.Misc
+        widget used to schedule the update on the GUI thread
+    update: callable, optional
+        function that updates the state with the result. By default, the
+        value of basic states (e.g., `ImageData`) is set and states with a
+        `set_numpy` method (e.g., `ContourState` or `BoundingBoxState`) are
+        set from array results. It is required for other states, because
+        results that are states cannot be returned by worker processes.
+
+    Example
+    -------
+    >>> # `find_contour` is decorated with `process_once` and returns an (N, 2) array
+    >>> to_state(find_contour(mask), contour_state, canvas)
+    """
+    simple = isinstance(state, BasicState) or hasattr(state, "set_numpy")
+    if update is None and not simple:
+        raise TypeError(
+            f"Cannot set results to a {state.__class__.__name__} without `update`"
+        )
+
+    def _update(result: R) -> None:
+        if update is not None:
+            update(state, result)
+        elif isinstance(state, BasicState):
+            state.value = result
+        else:
+            state.set_numpy(np.asarray(result))
+
+    TkResults.of(widget).add(future, _update)
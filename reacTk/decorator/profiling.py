@@ -0,0 +1,176 @@
+"""
+Profiling of the draws of stateful widgets.
+
+Profiling is disabled by default. Then, stateful widgets only check if a
+profiler is set, so that there is no measurable overhead.
+"""
+
+from collections import deque
+import threading
+import time
+from typing import Any, Optional
+import weakref
+
+# number of recent durations kept per widget to compute percentiles
+WINDOW = 1000
+
+
+def summarize(durations: list[float]) -> dict[str, float]:
+    """
+    Summarize durations (in seconds) in milliseconds.
+    """
+    if len(durations) == 0:
+        return {"total": 0.0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+
+    durations = sorted(durations)
+    return {
+        "total": 1000 * sum(durations),
+        "mean": 1000 * sum(durations) / len(durations),
+        "p50": 1000 * durations[len(durations) // 2],
+        "p95": 1000 * durations[min(int(0.95 * len(durations)), len(durations) - 1)],
+        "max": 1000 * durations[-1],
+    }
+
+
+class DrawStats:
+    """
+    Draw statistics of a widget or a widget class.
+
+    * changes: number of state changes that requested a draw
+    * draws: number of executed draws - the difference to `changes` was
+             coalesced (e.g., by batches, the governor, or skipped while invisible)
+    * draw_time: cumulative draw time in seconds
+    * draw_times: recent draw times
+    * queue_waits: recent times from the first requested change until the draw
+    """
+
+    def __init__(self) -> None:
+        self.changes = 0
+        self.draws = 0
+        self.draw_time = 0.0
+        self.draw_times: deque[float] = deque(maxlen=WINDOW)
+        self.queue_waits: deque[float] = deque(maxlen=WINDOW)
+
+    def record(self, duration: float, queue_wait: Optional[float]) -> None:
+        self.draws += 1
+        self.draw_time += duration
+        self.draw_times.append(duration)
+        if queue_wait is not None:
+            self.queue_waits.append(queue_wait)
+
+    def to_dict(self) -> dict[str, Any]:
+        draw_ms = summarize(list(self.draw_times))
+        draw_ms["total"] = 1000 * self.draw_time
+        return {
+            "changes": self.changes,
+            "draws": self.draws,
+            "coalesced": max(self.changes - self.draws, 0),
+            "draw_ms": draw_ms,
+            "queue_wait_ms": summarize(list(self.queue_waits)),
+        }
+
+
+class Profiler:
+    """
+    Record draw statistics per widget class and instance.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.classes: dict[str, DrawStats] = {}
+        self.instances: weakref.WeakKeyDictionary[Any, DrawStats] = (
+            weakref.WeakKeyDictionary()
+        )
+        # time of the first change of a widget that was not yet drawn
+        self.requested: weakref.WeakKeyDictionary[Any, float] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def stats_of(self, widget: Any) -> tuple[DrawStats, DrawStats]:
+        """
+        Get the statistics of a widget and its class - the lock must be held.
+        """
+        name = type(widget).__name__
+        if name not in self.classes:
+            self.classes[name] = DrawStats()
+        if widget not in self.instances:
+            self.instances[widget] = DrawStats()
+        return self.instances[widget], self.classes[name]
+
+    def change(self, widget: Any) -> None:
+        """
+        Record a change of the state of a widget - this can be called from any thread.
+        """
+        with self.lock:
+            for stats in self.stats_of(widget):
+                stats.changes += 1
+            self.requested.setdefault(widget, time.perf_counter())
+
+    def draw(self, widget: Any, state: Any) -> None:
+        """
+        Draw a widget and record the time it took.
+        """
+        start = time.perf_counter()
+        widget.draw(state)
+        duration = time.perf_counter() - start
+
+        with self.lock:
+            requested = self.requested.pop(widget, None)
+            queue_wait = None if requested is None else start - requested
+            for stats in self.stats_of(widget):
+                stats.record(duration, queue_wait)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Get the statistics per widget class sorted by cumulative draw time.
+        """
+        with self.lock:
+            stats = {name: stats.to_dict() for name, stats in self.classes.items()}
+        return dict(
+            sorted(stats.items(), key=lambda item: -item[1]["draw_ms"]["total"])
+        )
+
+    def instance_stats(self) -> list[tuple[Any, dict[str, Any]]]:
+        """
+        Get the statistics of all widgets alive sorted by cumulative draw time.
+        """
+        with self.lock:
+            stats = [
+                (widget, stats.to_dict()) for widget, stats in self.instances.items()
+            ]
+        return sorted(stats, key=lambda item: -item[1]["draw_ms"]["total"])
+
+    def reset(self) -> None:
+        with self.lock:
+            self.classes.clear()
+            self.instances.clear()
+            self.requested.clear()
+
+
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Optional[Profiler]:
+    """
+    Get the active profiler or None if profiling is disabled.
+    """
+    return _profiler
+
+
+def enable_profiling() -> Profiler:
+    """
+    Start recording draw statistics of all stateful widgets.
+    """
+    global _profiler
+
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def disable_profiling() -> None:
+    """
+    Stop recording draw statistics.
+    """
+    global _profiler
+    _profiler = None
@@ -1,61 +1,207 @@
 from dataclasses import dataclass
 import functools
+import inspect
 import threading
 import time
-from typing import Callable, Generic, Optional, TypeVar, ParamSpec
+from typing import Callable, Generic, Literal, Optional, TypeVar, ParamSpec
+import weakref
+
+import tkinter as tk
+
+from .asynchron import get_executor, is_instance_method, report_exception
+from .scheduler import get_scheduler
 
 T = TypeVar("T")
 P = ParamSpec("P")
 
+Mode = Literal["throttle", "leading", "trailing", "debounce"]
+
 
 @dataclass
 class RecurrencyData(Generic[P]):
     def __init__(self, interval: float) -> None:
         self.interval = interval
         self.lock = threading.Lock()
-        self.pending_call: Optional[threading.Thread] = None
+        self.pending_call = False
 
-        self.last_call = 0.0
+        self.last_call = -float("inf")
+        self.deadline = 0.0
         self.last_args: Optional[P.args] = None
         self.last_kwargs: Optional[P.kwargs] = None
 
 
-def _recurrency_filter(func: Callable[P, None], interval: float) -> Callable[P, None]:
-    recurrency_data = RecurrencyData[P](interval=interval)
+def get_widget(instance: Optional[object], after: bool | tk.Misc) -> tk.Misc:
+    """
+    Resolve the widget used to deliver calls with `after`.
+    """
+    if isinstance(after, tk.Misc):
+        return after
+    if isinstance(instance, tk.Misc):
+        return instance
+
+    widget = getattr(instance, "widget", None)
+    assert isinstance(
+        widget, tk.Misc
+    ), f"Cannot deliver calls with `after` because {instance} is not a tk widget nor provides one via a `widget` attribute"
+    return widget
+
+
+def _recurrency_filter(
+    func: Callable[P, None],
+    interval: float,
+    mode: Mode = "throttle",
+    after: bool | tk.Misc = False,
+) -> Callable[P, None]:
+    assert mode in (
+        "throttle",
+        "leading",
+        "trailing",
+        "debounce",
+    ), f"Unknown mode {mode}"
+
+    recurrency_data_map_lock = threading.Lock()
+    recurrency_data_map: dict[int, RecurrencyData[P]] = {}
+    func_is_instance_method = is_instance_method(func)
+
+    if inspect.iscoroutinefunction(func):
+        # asyncio is only imported if coroutine functions are decorated
+        from .event_loop import submit
+
+        def execute(*args: P.args, **kwargs: P.kwargs) -> None:
+            submit(func(*args, **kwargs)).add_done_callback(report_exception)
+
+        execute_delayed = execute
+
+    else:
+        execute = func
+
+        def execute_delayed(*args: P.args, **kwargs: P.kwargs) -> None:
+            if after is not False:
+                func(*args, **kwargs)
+                return
+
+            # the scheduler thread only keeps time, so that a slow function
+            # does not delay the calls of others
+            future = get_executor().submit(func, *args, **kwargs)
+            future.add_done_callback(report_exception)
+
+    def get_recurrency_data(instance: Optional[object]) -> RecurrencyData[P]:
+        key = 0 if instance is None else id(instance)
+        with recurrency_data_map_lock:
+            if key in recurrency_data_map:
+                return recurrency_data_map[key]
 
-    def trigger_pending() -> None:
-        # print("Trigger pending")
+            recurrency_data_map[key] = RecurrencyData[P](interval=interval)
+            try:
+                if instance is not None:
+                    # remove the data once the instance is garbage collected
+                    weakref.finalize(instance, recurrency_data_map.pop, key, None)
+            except TypeError:
+                # the instance does not support weak references
+                pass
+            return recurrency_data_map[key]
+
+    def schedule(
+        instance: Optional[object], recurrency_data: RecurrencyData[P], delay: float
+    ) -> None:
+        callback = functools.partial(trigger_pending, instance, recurrency_data)
+        if after is False:
+            get_scheduler().call_later(delay, callback)
+        else:
+            get_widget(instance, after).after(max(round(delay * 1000), 0), callback)
+
+    def trigger_pending(
+        instance: Optional[object], recurrency_data: RecurrencyData[P]
+    ) -> None:
         with recurrency_data.lock:
-            recurrency_data.last_call = time.time()
-            recurrency_data.pending_call = None
-        assert recurrency_data.last_args is not None
-        assert recurrency_data.last_kwargs is not None
-        func(*recurrency_data.last_args, **recurrency_data.last_kwargs)
+            current_time = time.monotonic()
+            if current_time < recurrency_data.deadline:
+                # the deadline was postponed by a call in debounce mode
+                schedule(
+                    instance, recurrency_data, recurrency_data.deadline - current_time
+                )
+                return
+
+            recurrency_data.last_call = current_time
+            recurrency_data.pending_call = False
+
+            args, kwargs = recurrency_data.last_args, recurrency_data.last_kwargs
+            recurrency_data.last_args = recurrency_data.last_kwargs = None
+
+        assert args is not None
+        assert kwargs is not None
+        execute_delayed(*args, **kwargs)
 
     @functools.wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> None:
+        instance = args[0] if func_is_instance_method else None
+        recurrency_data = get_recurrency_data(instance)
+
         with recurrency_data.lock:
-            current_time = time.time()
+            current_time = time.monotonic()
             passed_time = current_time - recurrency_data.last_call
-            if passed_time >= recurrency_data.interval:
+
+            if (
+                mode in ("throttle", "leading")
+                and passed_time >= recurrency_data.interval
+                and not recurrency_data.pending_call
+            ):
                 recurrency_data.last_call = current_time
-                func(*args, **kwargs)
+                call_now = True
             else:
-                # print("Schedule")
+                call_now = False
+
+            if not call_now and mode != "leading":
                 recurrency_data.last_args = args
-                # print(recurrency_data)
                 recurrency_data.last_kwargs = kwargs
-                # print(recurrency_data)
-                if recurrency_data.pending_call is None:
-                    # print(f"Create pending")
-                    remaining_time = recurrency_data.interval - passed_time
-                    recurrency_data.pending_call = threading.Timer(
-                        remaining_time, trigger_pending
-                    )
-                    recurrency_data.pending_call.start()
+
+                if mode == "debounce":
+                    recurrency_data.deadline = current_time + recurrency_data.interval
+
+                if not recurrency_data.pending_call:
+                    recurrency_data.pending_call = True
+                    if mode == "throttle":
+                        delay = recurrency_data.interval - passed_time
+                    else:
+                        delay = recurrency_data.interval
+                    schedule(instance, recurrency_data, delay)
+
+        if call_now:
+            execute(*args, **kwargs)
 
     return wrapper
 
 
-def recurrency_filter(interval: float) -> functools.partial[Callable[P, None]]:
-    return functools.partial(_recurrency_filter, interval=interval)
+def recurrency_filter(
+    interval: float, mode: Mode = "throttle", after: bool | tk.Misc = False
+) -> functools.partial[Callable[P, None]]:
+    """
+    Limit how often a function is executed.
+
+    For instance methods, calls are filtered per instance. Immediate calls
+    are executed by the calling thread and delayed calls by the thread pool
+    shared with `async_once` (see `get_executor`). Coroutine functions
+    (`async def`) are executed by the shared asyncio event loop.
+
+    Parameters
+    ----------
+    interval: float
+        the interval in seconds
+    mode: str
+        * throttle: execute a call immediately if the last execution is at
+          least `interval` ago, otherwise execute the latest call once the
+          interval has passed (the default)
+        * leading: execute a call immediately if the last execution is at
+          least `interval` ago and drop it otherwise
+        * trailing: execute the latest call `interval` seconds after the
+          first call that was not yet executed
+        * debounce: execute the latest call once no call occurred for `interval`
+    after: bool or tk.Misc
+        if not False, delayed calls are delivered on the Tk thread with `after`
+        instead of the shared thread pool. If True, the widget is
+        resolved from the instance (the instance itself or its `widget` attribute),
+        otherwise the given widget is used
+    """
+    return functools.partial(
+        _recurrency_filter, interval=interval, mode=mode, after=after
+    )
@@ -0,0 +1,75 @@
+"""
+Scheduler executing delayed calls from a single background thread.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from typing import Callable, Optional
+
+
+class Scheduler:
+    """
+    Execute callbacks after a delay.
+
+    All callbacks are executed by the same daemon thread in the order of
+    their deadlines. Thus, scheduling a callback does not create a thread,
+    but long-running callbacks delay the execution of others.
+    """
+
+    def __init__(self) -> None:
+        self.condition = threading.Condition()
+        self.timers: list[tuple[float, int, Callable[[], None]]] = []
+        self.counter = itertools.count()
+        self.thread: Optional[threading.Thread] = None
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        """
+        Execute a callback after `delay` seconds.
+        """
+        deadline = time.monotonic() + max(delay, 0.0)
+        with self.condition:
+            heapq.heappush(self.timers, (deadline, next(self.counter), callback))
+
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, name="reacTk-scheduler", daemon=True
+                )
+                self.thread.start()
+
+            self.condition.notify()
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                if len(self.timers) == 0:
+                    self.condition.wait()
+                    continue
+
+                remaining = self.timers[0][0] - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+
+                _, _, callback = heapq.heappop(self.timers)
+
+            try:
+                callback()
+            except Exception:
+                traceback.print_exc()
+
+    def __len__(self) -> int:
+        with self.condition:
+            return len(self.timers)
+
+
+_scheduler = Scheduler()
+
+
+def get_scheduler() -> Scheduler:
+    """
+    Get the scheduler shared by all decorators.
+    """
+    return _scheduler
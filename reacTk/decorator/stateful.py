@@ -1,15 +1,25 @@
 import functools
 from uuid import uuid4 as uuid
-from typing import ParamSpec, Type, TypeVar
+from typing import Callable, Optional, ParamSpec, Type, TypeVar
+import weakref
 
 import tkinter as tk
 from widget_state import State
 
+from ..state.util import remove_callback
+from .batch import defer, is_batching
+from .governor import get_governor
+from .profiling import get_profiler
+from .tracing import get_tracer
+from .visibility import draw, draw_if_visible, draw_state
+
 T = TypeVar("T")
 P = ParamSpec("P")
 
 
-def stateful(cls: Type[T]) -> Type[T]:
+def stateful(
+    cls: Optional[Type[T]] = None, snapshot: bool = False
+) -> Type[T] | Callable[[Type[T]], Type[T]]:
     """
     Make a widget stateful.
 
@@ -27,8 +37,38 @@ def stateful(cls: Type[T]) -> Type[T]:
     tkinter event. The reason for this is that state changes may
     occur in separate threads. Firing a tkinter event means that the
     GUI thread is responsible for executing the `draw` function.
+
+    Note: The state only references the widget weakly. The widget stops
+    reacting to changes once it is destroyed, its `delete` method is called,
+    or it is garbage collected.
+
+    Note: Once the mainloop is running, draws of widgets that are not
+    viewable and of canvas items outside the visible region are skipped
+    and caught up when they become visible (see `visibility`).
+
+    Note: If the global governor is enabled (see `governor`), draws are
+    collected and executed in frames limited to a number per second.
+
+    Note: Inside a `batch_update` context, draws are deferred and each
+    widget is drawn once when the context exits.
+
+    Parameters
+    ----------
+    snapshot: bool
+        if True (use as `@stateful(snapshot=True)`), `draw` receives an
+        immutable snapshot of the state instead of the state. It is taken
+        once per draw by the GUI thread and only copies the parts of the
+        state that changed (see `Snapshots`). Thus, draws do not observe
+        single changes of other threads in the middle of a draw. Changes
+        of several values that belong together must still be grouped with
+        `with state:` (or a `set` method) to not be drawn partially.
+        `draw` has to read from the state it receives instead of `self._state`.
     """
+    if cls is None:
+        return functools.partial(stateful, snapshot=snapshot)
+
     orig_init = cls.__init__
+    orig_delete = getattr(cls, "delete", None)
 
     @functools.wraps(orig_init)
     def __init__(self: T, *args: P.args, **kwargs: P.kwargs) -> None:
@@ -59,21 +99,155 @@ def stateful(cls: Type[T]) -> Type[T]:
 
         """
         The next part is a little complicated.
-        We first register the draw method to directly react to state changes (and trigger it immediately).
-        Afterwards we use tkinters `after` method to remove this callback and instead fire an event, which we
+        We first register a callback that directly calls the draw method on state changes (and trigger it immediately).
+        Afterwards we use tkinters `after` method to instead let the callback fire an event, which we
         bind the widget to.
         The reason for this convoluted event handling is that using tk events is only possible
         once the mainloop has started. Thus, if we do not do it this way, changes done to the state before
         the mainloop will not be handled.
         """
-        callback_id = self._state.on_change(self.draw, trigger=True)
+        self.__dict__["_stateful_dispatch"] = lambda: draw(self, draw_state(self))
+        self.__dict__["_stateful_bind_event"] = None
+        self.__dict__["_stateful_callback"] = None
+        self.__dict__["_stateful_funcid"] = None
+        self.__dict__["_stateful_snapshots"] = None
+        self.rebind(self._state)
+
+        # callbacks registered with Tk only reference the widget weakly, so
+        # that widgets dropped without being destroyed or deleted are collected
+        ref = weakref.ref(self)
+
+        def on_event(_: tk.Event) -> None:
+            _self = ref()
+            if _self is not None:
+                draw_if_visible(_self, draw_state(_self))
+
+        def bind_event():
+            _self = ref()
+            _self.__dict__["_stateful_funcid"] = widget.bind(_self.event_id, on_event)
+
+        def dispatch():
+            _self = ref()
+            governor = get_governor()
+            if governor.enabled:
+                governor.request(_self, widget)
+                return
+
+            try:
+                widget.event_generate(_self.event_id)
+            except tk.TclError:
+                # the widget was destroyed
+                _self.unsubscribe()
 
         def after_mainloop():
-            self._state.remove_callback(callback_id)
-            self._state.on_change(lambda _: widget.event_generate(self.event_id))
-            widget.bind(self.event_id, lambda _: self.draw(self._state))
+            _self = ref()
+            if _self is None:
+                return
+
+            _self.__dict__["_stateful_bind_event"] = bind_event
+            _self.__dict__["_stateful_dispatch"] = dispatch
+
+            if _self._stateful_callback is not None:
+                bind_event()
 
         widget.after(0, after_mainloop)
 
+        if widget is self:
+
+            def on_destroy(event: tk.Event) -> None:
+                _self = ref()
+                if _self is not None and str(event.widget) == str(_self):
+                    _self.unsubscribe()
+
+            self.bind("<Destroy>", on_destroy, add="+")
+
+    def rebind(self: T, state: State) -> None:
+        """
+        Bind the widget to another state and redraw it.
+
+        This allows to reuse widgets (and their canvas items and bindings)
+        for different states instead of creating new ones.
+        """
+        if self._stateful_callback is not None:
+            remove_callback(self._state, self._stateful_callback)
+
+        self.__dict__["_state"] = state
+
+        ref = weakref.ref(self)
+
+        def callback(state: State) -> None:
+            widget = ref()
+            if widget is None:
+                remove_callback(state, callback)
+                return
+            profiler = get_profiler()
+            if profiler is not None:
+                profiler.change(widget)
+            tracer = get_tracer()
+            if tracer is not None:
+                tracer.dispatch(widget)
+
+            if is_batching():
+                defer(widget)
+                return
+            widget._stateful_notify()
+
+        self.__dict__["_stateful_callback"] = callback
+        if self._stateful_funcid is None and self._stateful_bind_event is not None:
+            # the event binding was removed by `unsubscribe`
+            self._stateful_bind_event()
+        self._state.on_change(callback)
+        if snapshot:
+            # imported here to keep importing widgets without snapshots fast
+            from ..state.snapshot import Snapshots
+
+            if self._stateful_snapshots is not None:
+                self._stateful_snapshots.close()
+            self.__dict__["_stateful_snapshots"] = Snapshots(state)
+        # the initial draw is not deferred by batches so that items exist right away
+        self._stateful_dispatch()
+
+    def _stateful_notify(self: T) -> None:
+        """
+        Dispatch a draw of the widget because its state changed.
+        """
+        self._stateful_dispatch()
+
+    def unsubscribe(self: T) -> None:
+        """
+        Stop redrawing the widget on changes of its state.
+        """
+        if self._stateful_callback is None:
+            return
+
+        remove_callback(self._state, self._stateful_callback)
+        self.__dict__["_stateful_callback"] = None
+        if self._stateful_snapshots is not None:
+            self._stateful_snapshots.close()
+            self.__dict__["_stateful_snapshots"] = None
+
+        if self._stateful_funcid is not None:
+            widget = self if isinstance(self, tk.Widget) else self.widget
+            try:
+                widget.unbind(self.event_id, self._stateful_funcid)
+            except tk.TclError:
+                # the widget was already destroyed
+                pass
+            self.__dict__["_stateful_funcid"] = None
+
     cls.__init__ = __init__
+    cls.rebind = rebind
+    cls._stateful_notify = _stateful_notify
+    cls.unsubscribe = unsubscribe
+
+    # tk widgets such as the canvas have `delete` methods with a different meaning
+    if orig_delete is not None and not issubclass(cls, tk.Widget):
+
+        @functools.wraps(orig_delete)
+        def delete(self: T, *args: P.args, **kwargs: P.kwargs) -> None:
+            self.unsubscribe()
+            orig_delete(self, *args, **kwargs)
+
+        cls.delete = delete
+
     return cls
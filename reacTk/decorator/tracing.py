@@ -0,0 +1,230 @@
+"""
+Tracing of change propagation from states to draws.
+
+While tracing, each change of a state is stamped with a trace id that
+follows it through the notifications of dependent states, the dispatch
+of stateful widgets and their draws. The recorded spans can be exported
+in the Chrome trace format and viewed, e.g., in Perfetto or `chrome://tracing`.
+
+Tracing is disabled by default. Then, `State.notify_change` is not
+patched and stateful widgets only check if a tracer is set.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+import weakref
+
+from widget_state import State
+
+# maximal number of recorded events - older events are dropped
+MAX_EVENTS = 200_000
+
+
+def timestamp() -> float:
+    """
+    Timestamp in microseconds as used by the Chrome trace format.
+    """
+    return time.perf_counter_ns() / 1000
+
+
+class Tracer:
+    """
+    Record spans of notifications, dispatches and draws.
+    """
+
+    def __init__(self, max_events: int = MAX_EVENTS) -> None:
+        self.events: deque[dict[str, Any]] = deque(maxlen=max_events)
+        self.trace_ids = itertools.count(1)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        # trace ids of changes dispatched to a widget but not yet drawn
+        self.pending: weakref.WeakKeyDictionary[Any, list[int]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.threads: dict[int, str] = {}
+
+    def current_trace_id(self) -> Optional[int]:
+        """
+        Get the trace id of the change currently propagated by this thread.
+        """
+        return getattr(self.local, "trace_id", None)
+
+    def add_event(self, event: dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        event["pid"] = os.getpid()
+        event["tid"] = thread.ident
+        self.events.append(event)
+
+        if thread.ident not in self.threads:
+            self.threads[thread.ident] = thread.name
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[None]:
+        start = timestamp()
+        try:
+            yield
+        finally:
+            self.add_event(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start,
+                    "dur": timestamp() - start,
+                    "args": args,
+                }
+            )
+
+    def notify(self, state: State, notify_change: Callable[[State], None]) -> None:
+        """
+        Trace the notification of a state - a new trace id is assigned if it
+        is not caused by the notification of another state.
+        """
+        trace_id = self.current_trace_id()
+        if trace_id is None:
+            self.local.trace_id = next(self.trace_ids)
+
+        try:
+            with self.span(
+                f"notify {type(state).__name__}",
+                "state",
+                trace_id=self.local.trace_id,
+            ):
+                notify_change(state)
+        finally:
+            if trace_id is None:
+                self.local.trace_id = None
+
+    def dispatch(self, widget: Any) -> None:
+        """
+        Trace the dispatch of a draw of a widget caused by the current change.
+        """
+        trace_id = self.current_trace_id()
+        if trace_id is None:
+            return
+
+        with self.lock:
+            self.pending.setdefault(widget, []).append(trace_id)
+        # flow events connect the change to the draw, possibly across threads
+        self.add_event(
+            {
+                "name": "change",
+                "cat": "dispatch",
+                "ph": "s",
+                "id": trace_id,
+                "ts": timestamp(),
+            }
+        )
+
+    def draw(self, widget: Any, draw: Callable[[], None]) -> None:
+        """
+        Trace the draw of a widget.
+        """
+        with self.lock:
+            trace_ids = self.pending.pop(widget, [])
+
+        start = timestamp()
+        for trace_id in trace_ids:
+            self.add_event(
+                {
+                    "name": "change",
+                    "cat": "dispatch",
+                    "ph": "f",
+                    "bp": "e",
+                    "id": trace_id,
+                    "ts": start,
+                }
+            )
+
+        with self.span(f"draw {type(widget).__name__}", "draw", trace_ids=trace_ids):
+            draw()
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the recorded events in the Chrome trace format.
+        """
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in list(self.threads.items())
+        ]
+        return {"traceEvents": metadata + list(self.events), "displayTimeUnit": "ms"}
+
+    def export(self, path: str) -> None:
+        """
+        Write the recorded events as Chrome trace JSON.
+        """
+        with open(path, mode="w") as f:
+            json.dump(self.to_dict(), f)
+
+
+_tracer: Optional[Tracer] = None
+_notify_change = State.notify_change
+
+
+def _traced_notify_change(self: State) -> None:
+    tracer = _tracer
+    if tracer is None or not self._active:
+        _notify_change(self)
+        return
+    tracer.notify(self, _notify_change)
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Get the active tracer or None if tracing is disabled.
+    """
+    return _tracer
+
+
+def start_tracing(max_events: int = MAX_EVENTS) -> Tracer:
+    """
+    Start tracing change propagation.
+    """
+    global _tracer
+
+    if _tracer is None:
+        _tracer = Tracer(max_events)
+        State.notify_change = _traced_notify_change
+    return _tracer
+
+
+def stop_tracing() -> Optional[Tracer]:
+    """
+    Stop tracing and return the tracer with the recorded events.
+    """
+    global _tracer
+
+    tracer, _tracer = _tracer, None
+    State.notify_change = _notify_change
+    return tracer
+
+
+@contextmanager
+def trace(path: Optional[str] = None) -> Iterator[Tracer]:
+    """
+    Trace change propagation inside the context and export it to `path`.
+
+    Example
+    -------
+    >>> with trace("trace.json"):
+    ...     point.x.value = 10
+    """
+    tracer = start_tracing()
+    try:
+        yield tracer
+    finally:
+        stop_tracing()
+        if path is not None:
+            tracer.export(path)
@@ -0,0 +1,150 @@
+"""
+Skip draws of stateful widgets that are not visible.
+
+Draws of widgets that are not viewable (e.g., in a hidden notebook tab) and
+of canvas items outside the visible region of a canvas are skipped. The
+widgets are remembered as stale and drawn once they become visible again.
+"""
+
+from typing import Any, Optional
+import weakref
+
+import tkinter as tk
+
+from .profiling import get_profiler
+from .tracing import get_tracer
+
+Bounds = tuple[float, float, float, float]
+
+# virtual event fired by canvases if their visible region changes
+VIEW_CHANGED = "<<ViewChanged>>"
+
+
+class StaleWidgets:
+    """
+    Stateful widgets with skipped draws that are drawn once an event occurs.
+
+    There is one instance per widget and event sequence, e.g., for the
+    `<Map>` events of a toplevel window or the `VIEW_CHANGED` events of a canvas.
+    """
+
+    _instances: weakref.WeakKeyDictionary[tk.Misc, dict[str, "StaleWidgets"]] = (
+        weakref.WeakKeyDictionary()
+    )
+
+    @classmethod
+    def of(cls, widget: tk.Misc, sequence: str) -> "StaleWidgets":
+        instances = cls._instances.setdefault(widget, {})
+        if sequence not in instances:
+            instances[sequence] = cls(widget, sequence)
+        return instances[sequence]
+
+    def __init__(self, widget: tk.Misc, sequence: str) -> None:
+        self.widgets: weakref.WeakSet[Any] = weakref.WeakSet()
+        widget.bind(sequence, self.flush, add="+")
+
+    def add(self, widget: Any) -> None:
+        self.widgets.add(widget)
+
+    def flush(self, event: Optional[tk.Event] = None) -> None:
+        """
+        Draw all stale widgets - widgets still not visible become stale again.
+        """
+        widgets = list(self.widgets)
+        self.widgets.clear()
+
+        for widget in widgets:
+            # the widget may have been unsubscribed in the meantime
+            if widget._stateful_callback is not None:
+                draw_if_visible(widget, draw_state(widget))
+
+
+def draw_state(widget: Any) -> Any:
+    """
+    Get the state a stateful widget is drawn with - a new snapshot if
+    it takes snapshots and its state otherwise.
+    """
+    snapshots = widget.__dict__.get("_stateful_snapshots")
+    return widget._state if snapshots is None else snapshots.take()
+
+
+def outside(bounds: Bounds, region: Bounds) -> bool:
+    """
+    Test if bounds (left, top, right, bottom) do not intersect a region.
+    """
+    return (
+        bounds[2] < region[0]
+        or bounds[0] > region[2]
+        or bounds[3] < region[1]
+        or bounds[1] > region[3]
+    )
+
+
+def execute(widget: Any, state: Any) -> None:
+    """
+    Call the draw method of a stateful widget, profiled and traced if enabled.
+    """
+    profiler = get_profiler()
+    tracer = get_tracer()
+    if profiler is None and tracer is None:
+        widget.draw(state)
+        return
+
+    def _draw() -> None:
+        if profiler is None:
+            widget.draw(state)
+        else:
+            profiler.draw(widget, state)
+
+    if tracer is None:
+        _draw()
+    else:
+        tracer.draw(widget, _draw)
+
+
+def draw(widget: Any, state: Any) -> None:
+    """
+    Draw a stateful widget and remember its bounds if it is a canvas item.
+    """
+    execute(widget, state)
+
+    bounds = getattr(widget, "bounds", None)
+    if bounds is not None:
+        widget.__dict__["_stateful_bounds"] = bounds(state)
+
+
+def draw_if_visible(widget: Any, state: Any) -> None:
+    """
+    Draw a stateful widget if it is visible and remember it as stale otherwise.
+
+    A canvas item is considered invisible if its bounds (see `CanvasItem.bounds`)
+    as well as the bounds when it was last drawn are outside the visible
+    region of the canvas. This requires a canvas providing a `visible_region`
+    and notifying changes with `VIEW_CHANGED` events, like the reacTk `Canvas`.
+    """
+    tk_widget = widget if isinstance(widget, tk.Widget) else widget.widget
+
+    if not tk_widget.winfo_viewable():
+        StaleWidgets.of(tk_widget.winfo_toplevel(), "<Map>").add(widget)
+        return
+
+    bounds = getattr(widget, "bounds", None)
+    visible_region = getattr(tk_widget, "visible_region", None)
+    if bounds is None or visible_region is None:
+        draw(widget, state)
+        return
+
+    region = visible_region()
+    drawn_bounds = widget.__dict__.get("_stateful_bounds")
+    new_bounds = bounds(state)
+    if (
+        new_bounds is not None
+        and drawn_bounds is not None
+        and outside(new_bounds, region)
+        and outside(drawn_bounds, region)
+    ):
+        StaleWidgets.of(tk_widget, VIEW_CHANGED).add(widget)
+        return
+
+    execute(widget, state)
+    widget.__dict__["_stateful_bounds"] = new_bounds
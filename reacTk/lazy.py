@@ -0,0 +1,68 @@
+"""
+Lazy imports of heavy optional dependencies such as OpenCV, Pillow and NumPy.
+
+Modules that need them for drawing only, e.g., to render an image, should
+not pay their import time when imported. `lazy_import` returns a proxy
+that imports the module on first attribute access:
+
+    cv = lazy_import("cv2")
+
+    def resize(img):
+        return cv.resize(img, (100, 100))  # cv2 is imported here
+"""
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Any
+
+_lock = threading.RLock()
+
+
+class LazyModule:
+    """
+    Proxy of a module that is imported on first attribute access.
+
+    Accessed attributes are cached on the proxy, so that later accesses
+    are as fast as accesses of the module itself.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with _lock:
+                if self._module is None:
+                    self.__dict__["_module"] = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._load(), name)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Cannot set attribute {name} of lazy module {self._name}")
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule | ModuleType:
+    """
+    Import a module on first use - it is returned directly if it is already imported.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def is_imported(name: str) -> bool:
+    """
+    Test if a module was imported (e.g., to avoid importing it to inspect a value).
+    """
+    return name in sys.modules
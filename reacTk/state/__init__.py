@@ -1,11 +1,51 @@
+import importlib
+from typing import Any
+
 from .bounding_box import BoundingBoxState
 from .contour import ContourState
-from .point import PointState
-from .util import to_tk_var
+from .point import PointExpression, PointState
+from .snapshot import Snapshots, snapshot
+from .util import (
+    detach,
+    prepend_callback,
+    remove_callback,
+    remove_observer,
+    to_tk_var,
+    weak_callback,
+)
+
+# names of modules that are only needed by applications loading or storing
+# annotations are imported on first access
+LAZY_NAMES = {
+    "AnnotationStore": ".store",
+    "load_npz": ".persistence",
+    "save_npz": ".persistence",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(LAZY_NAMES[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
+    "AnnotationStore",
     "BoundingBoxState",
     "ContourState",
+    "PointExpression",
     "PointState",
+    "Snapshots",
+    "detach",
+    "load_npz",
+    "prepend_callback",
+    "remove_callback",
+    "remove_observer",
+    "save_npz",
+    "snapshot",
     "to_tk_var",
+    "weak_callback",
 ]
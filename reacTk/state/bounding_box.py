@@ -1,6 +1,17 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from widget_state import DictState, IntState
 
+from ..lazy import lazy_import
 from .point import PointState
+from .util import init_dict_state
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+np = lazy_import("numpy")
 
 
 class BoundingBoxState(DictState):
@@ -12,24 +23,54 @@ class BoundingBoxState(DictState):
         x2: int | IntState,
         y2: int | IntState,
     ):
-        super().__init__()
+        init_dict_state(self)
 
         self.x1 = IntState(x1) if isinstance(x1, int) else x1
         self.y1 = IntState(y1) if isinstance(y1, int) else y1
         self.x2 = IntState(x2) if isinstance(x2, int) else x2
         self.y2 = IntState(y2) if isinstance(y2, int) else y2
 
+        # corner points share the coordinate states and are thus created only once
+        self._top_left = PointState(self.x1, self.y1)
+        self._top_right = PointState(self.x2, self.y1)
+        self._bottom_left = PointState(self.x1, self.y2)
+        self._bottom_right = PointState(self.x2, self.y2)
+
+    @classmethod
+    def from_numpy(cls, tlbr: NDArray[np.int64]) -> BoundingBoxState:
+        return cls(*tlbr.astype(int).tolist())
+
+    def to_numpy(self) -> NDArray[np.int64]:
+        return np.array(self.tlbr(), dtype=np.int64)
+
+    def set_numpy(self, tlbr: NDArray[np.int64]) -> None:
+        """
+        Set the coordinates from an array of x1, y1, x2, y2 and notify only once.
+        """
+        self.set(*tlbr.astype(int).tolist())
+
     def tlbr(self) -> tuple[int, int, int, int]:
         return (self.x1.value, self.y1.value, self.x2.value, self.y2.value)
 
-    def top_left(self):
-        return PointState(self.x1, self.y1)
+    def top_left(self) -> PointState:
+        return self._top_left
+
+    def top_right(self) -> PointState:
+        return self._top_right
 
-    def top_right(self):
-        return PointState(self.x2, self.y1)
+    def bottom_left(self) -> PointState:
+        return self._bottom_left
 
-    def bottom_left(self):
-        return PointState(self.x1, self.y2)
+    def bottom_right(self) -> PointState:
+        return self._bottom_right
 
-    def bottom_right(self):
-        return PointState(self.x2, self.y2)
+    def corners(self) -> list[PointState]:
+        """
+        Get all corners ordered as top left, top right, bottom left and bottom right.
+        """
+        return [
+            self._top_left,
+            self._top_right,
+            self._bottom_left,
+            self._bottom_right,
+        ]
@@ -1,30 +1,168 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-import numpy as np
-from numpy.typing import NDArray
 from widget_state import ListState
 
+from ..lazy import lazy_import
 from .point import PointState
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+np = lazy_import("numpy")
+
+
+def to_coordinates(contour: NDArray, keep_type: bool) -> list[list[Any]]:
+    contour = contour.reshape(-1, 2)
+    return (contour if keep_type else contour.astype(int)).tolist()
+
+
+class IdentityIndex:
+    """
+    Map from the identity of the elements of a list to their index.
+
+    The map is only valid for a prefix of the list: a change at an index
+    shortens the prefix and a lookup behind the prefix extends it. Thus,
+    lookups of elements before the latest change are O(1) and changes near
+    the end of a list only re-index the elements behind them.
+    """
+
+    def __init__(self) -> None:
+        self.indices: dict[int, int] = {}
+        self.valid = 0
+
+    def lookup(self, elements: list[Any] | tuple[Any, ...], elem: Any) -> int:
+        # entries of elements behind the prefix may be outdated
+        index = self.indices.get(id(elem))
+        if index is not None and index < self.valid and elements[index] is elem:
+            return index
+
+        for index in range(self.valid, len(elements)):
+            self.indices[id(elements[index])] = index
+            if elements[index] is elem:
+                self.valid = index + 1
+                return index
+
+        self.valid = len(elements)
+        raise ValueError(f"{elem} is not in list")
+
+    def changed(self, index: int) -> None:
+        """
+        Invalidate the indices from `index` on.
+        """
+        self.valid = min(self.valid, index)
+
+    def inserted(self, index: int, elem: Any) -> None:
+        if index <= self.valid:
+            self.indices[id(elem)] = index
+            self.valid = index + 1
+
+    def removed(self, index: int, elem: Any) -> None:
+        self.indices.pop(id(elem), None)
+        self.changed(index)
+
+    def invalidate(self) -> None:
+        self.indices.clear()
+        self.valid = 0
+
 
 class ContourState(ListState):
+    """
+    List of the points of a contour.
+
+    The index of each point is tracked by its identity so that looking up
+    points (e.g., with `index`, `remove` or `insert_before`) does not scan
+    the list.
+    """
 
     def __init__(self, points: Optional[list[PointState]] = None) -> None:
+        self._identity_index = IdentityIndex()
         super().__init__(points if points is not None else [])
 
+    def index(self, point: PointState) -> int:
+        return self._identity_index.lookup(self._list, point)
+
+    def append(self, point: PointState) -> None:
+        super().append(point)
+        self._identity_index.inserted(len(self) - 1, point)
+
+    def extend(self, points: list[PointState] | ContourState) -> None:
+        # as `ListState.extend`, but without appending the points one by one
+        points = list(points)
+        for point in points:
+            point._parent = self
+            point.on_change(self._elem_obs)
+        self._list.extend(points)
+        self.notify_change()
+
+    def insert(self, index: int, point: PointState) -> None:
+        # normalize the index as `list.insert` does
+        index = max(index + len(self), 0) if index < 0 else min(index, len(self))
+        self._identity_index.changed(index)
+        super().insert(index, point)
+        self._identity_index.inserted(index, point)
+
+    def insert_before(self, point: PointState, new_point: PointState) -> None:
+        """
+        Insert a new point before a point of the contour.
+        """
+        self.insert(self.index(point), new_point)
+
+    def insert_after(self, point: PointState, new_point: PointState) -> None:
+        """
+        Insert a new point after a point of the contour.
+        """
+        self.insert(self.index(point) + 1, new_point)
+
+    def pop(self, index: int = -1) -> PointState:
+        index = index + len(self) if index < 0 else index
+        self._identity_index.removed(index, self._list[index])
+        return super().pop(index)
+
+    def remove(self, point: PointState) -> None:
+        self.pop(self.index(point))
+
+    def clear(self) -> None:
+        self._identity_index.invalidate()
+        super().clear()
+
+    def reverse(self) -> None:
+        self._identity_index.invalidate()
+        super().reverse()
+
+    def sort(self, key: Callable[[PointState], Any]) -> None:
+        self._identity_index.invalidate()
+        super().sort(key)
+
     @classmethod
-    def from_numpy(cls, contour: NDArray[np.int64]) -> ContourState:
-        contour = contour.astype(int).tolist()
-        return cls([PointState(*pt) for pt in contour])
+    def from_numpy(cls, contour: NDArray, keep_type: bool = False) -> ContourState:
+        """
+        Create a contour from an (N, 2) array.
 
-    def to_numpy(self) -> NDArray[np.int64]:
-        return np.array([(pt.x.value, pt.y.value) for pt in self])
+        Coordinates are cast to int unless `keep_type` is True (e.g., to
+        keep sub-pixel positions).
+        """
+        return cls(PointState.many(to_coordinates(contour, keep_type)))
 
-    def deserialize(self, points: list[dict[str, int]]) -> None:
+    def to_numpy(self) -> NDArray:
+        return np.array([pt.values() for pt in self]).reshape(-1, 2)
+
+    def set_points(self, points: list[PointState]) -> None:
+        """
+        Replace all points and notify only once.
+        """
         with self:
             self.clear()
+            self.extend(points)
+
+    def set_numpy(self, contour: NDArray, keep_type: bool = False) -> None:
+        """
+        Replace all points by the vertices of an (N, 2) array and notify only once.
 
-            for pt in points:
-                self.append(PointState(**pt))
+        Coordinates are cast to int unless `keep_type` is True.
+        """
+        self.set_points(PointState.many(to_coordinates(contour, keep_type)))
+
+    def deserialize(self, points: list[dict[str, int]]) -> None:
+        self.set_points([PointState(**pt) for pt in points])
@@ -0,0 +1,164 @@
+"""
+Binary persistence of annotation states.
+
+Points, contours and bounding boxes (and lists of them) are stored as
+flat NumPy arrays in an `.npz` file instead of nested dicts. Thus, saving
+and loading does not walk JSON structures and each loaded contour is
+constructed in a single pass.
+
+Arrays are stored under keys `<name>:<kind>` with the kinds:
+  * point: (2,) array
+  * points: (N, 2) array
+  * contour: (N, 2) array
+  * contours: (M, 2) array of the vertices of all contours - their
+              lengths are stored under `<name>:contours:lengths`
+  * bounding_box: (4,) array of x1, y1, x2, y2
+  * bounding_boxes: (N, 4) array
+  * empty: an empty list
+
+Coordinates of points and contours keep their type (e.g., floats of
+sub-pixel positions), while those of bounding boxes are integers.
+"""
+
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING, Any, Union
+
+from ..lazy import lazy_import
+from .bounding_box import BoundingBoxState
+from .contour import ContourState
+from .point import PointState
+from .util import gc_paused
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+np = lazy_import("numpy")
+
+Annotation = Union[
+    PointState,
+    ContourState,
+    BoundingBoxState,
+    list[PointState],
+    list[ContourState],
+    list[BoundingBoxState],
+]
+File = Union[str, IO[bytes]]
+
+# kinds of single states and lists of them
+KINDS = {
+    PointState: ("point", "points"),
+    ContourState: ("contour", "contours"),
+    BoundingBoxState: ("bounding_box", "bounding_boxes"),
+}
+
+
+def kind_of(annotation: Annotation) -> str:
+    """
+    Get the kind under which an annotation is stored.
+    """
+    if isinstance(annotation, (list, tuple)):
+        if len(annotation) == 0:
+            return "empty"
+
+        for cls, (_, kind) in KINDS.items():
+            if all(isinstance(elem, cls) for elem in annotation):
+                return kind
+        raise TypeError("Lists of annotations must contain states of a single type")
+
+    for cls, (kind, _) in KINDS.items():
+        if isinstance(annotation, cls):
+            return kind
+    raise TypeError(f"Cannot save annotations of type {type(annotation).__name__}")
+
+
+def to_arrays(name: str, annotation: Annotation) -> dict[str, NDArray]:
+    kind = kind_of(annotation)
+    key = f"{name}:{kind}"
+
+    if kind == "point":
+        return {key: np.array(annotation.values())}
+    if kind == "points":
+        return {key: np.array([point.values() for point in annotation]).reshape(-1, 2)}
+    if kind == "contour":
+        return {key: annotation.to_numpy()}
+    if kind == "contours":
+        return {
+            key: np.concatenate([contour.to_numpy() for contour in annotation]),
+            f"{key}:lengths": np.array([len(contour) for contour in annotation]),
+        }
+    if kind == "bounding_box":
+        return {key: annotation.to_numpy()}
+    if kind == "bounding_boxes":
+        return {key: np.array([box.tlbr() for box in annotation]).reshape(-1, 4)}
+    return {key: np.zeros(0)}
+
+
+def from_arrays(kind: str, array: NDArray, arrays: Any, key: str) -> Annotation:
+    if kind == "point":
+        return PointState(*array.tolist())
+    if kind == "points":
+        return PointState.many(array.tolist())
+    if kind == "contour":
+        return ContourState.from_numpy(array, keep_type=True)
+    if kind == "contours":
+        offsets = np.cumsum(arrays[f"{key}:lengths"])[:-1]
+        return [
+            ContourState.from_numpy(part, keep_type=True)
+            for part in np.split(array, offsets)
+        ]
+    if kind == "bounding_box":
+        return BoundingBoxState.from_numpy(array)
+    if kind == "bounding_boxes":
+        return [BoundingBoxState(*box) for box in array.astype(int).tolist()]
+    if kind == "empty":
+        return []
+    raise ValueError(f"Unknown kind of annotation {kind}")
+
+
+def save_npz(file: File, compressed: bool = False, **annotations: Annotation) -> None:
+    """
+    Save annotations by name into an `.npz` file.
+
+    Parameters
+    ----------
+    file: str or file
+        the file or path to write to
+    compressed: bool
+        compress the arrays - this makes files smaller but saving slower
+    annotations: Annotation
+        points, contours, bounding boxes, or lists of them by name
+
+    Example
+    -------
+    >>> save_npz("project.npz", contours=contours, roi=bounding_box)
+    """
+    arrays = {}
+    for name, annotation in annotations.items():
+        assert ":" not in name, f"Names of annotations must not contain ':' - {name}"
+        arrays.update(to_arrays(name, annotation))
+
+    if compressed:
+        np.savez_compressed(file, **arrays)
+    else:
+        np.savez(file, **arrays)
+
+
+def load_npz(file: File) -> dict[str, Annotation]:
+    """
+    Load annotations saved with `save_npz`.
+
+    Returns
+    -------
+    dict
+        new states (or lists of new states) by name
+    """
+    annotations = {}
+    with np.load(file, allow_pickle=False) as arrays, gc_paused():
+        for key in arrays.files:
+            name, _, kind = key.partition(":")
+            if ":" in kind:
+                # additional arrays such as the lengths of contours
+                continue
+            annotations[name] = from_arrays(kind, arrays[key], arrays, key)
+    return annotations
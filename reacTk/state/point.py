@@ -1,11 +1,31 @@
 from __future__ import annotations
 
-from typing import Generic, TypeVar
+import operator
+from typing import Any, Callable, Generic, Iterable, TypeVar, Union
+import weakref
 
-from widget_state import NumberState, DictState
+from widget_state import NumberState, DictState, State
+
+from .util import (
+    computed_state_names,
+    gc_paused,
+    init_dict_state,
+    remove_callback,
+)
 
 NT = TypeVar("NT", int, float)
 
+# attributes of a `NumberState` initialized without precision - they must
+# match the pinned version of widget_state (see `test_many_points_match_states`)
+NUMBER_ATTRIBUTES = {
+    "_active": True,
+    "_enter_count": 0,
+    "_verify_change": True,
+    "_precision": None,
+}
+
+Operand = Union[int, float, NumberState, "PointState", "PointExpression"]
+
 
 class PointState(DictState, Generic[NT]):
     """
@@ -19,32 +39,201 @@ class PointState(DictState, Generic[NT]):
         x: NT | NumberState[NT],
         y: NT | NumberState[NT],
     ):
-        super().__init__()
+        init_dict_state(self)
 
         self.x = x if isinstance(x, NumberState) else NumberState(x)
         self.y = y if isinstance(y, NumberState) else NumberState(y)
 
+    @classmethod
+    def many(cls, values: Iterable[tuple[NT, NT]]) -> list[PointState[NT]]:
+        """
+        Create points in bulk - equivalent to `[PointState(x, y) for x, y in values]`.
+
+        The states are initialized directly instead of by assigning their
+        attributes through the `__setattr__` methods of `widget_state`,
+        which dominate the time to create many points (e.g., on loading).
+        Thus, it depends on the attributes of the pinned version of widget_state.
+        """
+        if cls.__init__ is not PointState.__init__ or computed_state_names(cls):
+            # subclasses may initialize further attributes
+            return [cls(x, y) for x, y in values]
+
+        points = []
+        with gc_paused():
+            for x, y in values:
+                point = object.__new__(cls)
+                notify = forward_to(point)
+                _x, _y = object.__new__(NumberState), object.__new__(NumberState)
+                _x.__dict__.update(NUMBER_ATTRIBUTES, value=x)
+                _x.__dict__.update(_callbacks=[notify], _parent=point)
+                _y.__dict__.update(NUMBER_ATTRIBUTES, value=y)
+                _y.__dict__.update(_callbacks=[notify], _parent=point)
+                point.__dict__.update(
+                    _callbacks=[],
+                    _active=True,
+                    _enter_count=0,
+                    _parent=None,
+                    _computed_states={},
+                    _labels=["x", "y"],
+                    x=_x,
+                    y=_y,
+                )
+                points.append(point)
+        return points
+
+    def lazy(self) -> PointExpression:
+        """
+        Start a lazy expression with this point (see `PointExpression`).
+        """
+        return PointExpression.of(self)
+
     def __add__(self, other: NumberState | PointState[NT]) -> PointState[NT]:
+        if isinstance(other, PointExpression):
+            return NotImplemented
         other = other if isinstance(other, PointState) else PointState(other, other)
         return PointState(self.x + other.x, self.y + other.y)
 
     def __sub__(self, other: NumberState | PointState[NT]) -> PointState[NT]:
+        if isinstance(other, PointExpression):
+            return NotImplemented
         other = other if isinstance(other, PointState) else PointState(other, other)
         return PointState(self.x - other.x, self.y - other.y)
 
     def __mul__(self, other: NumberState | PointState[NT]) -> PointState[NT]:
+        if isinstance(other, PointExpression):
+            return NotImplemented
         other = other if isinstance(other, PointState) else PointState(other, other)
         return PointState(self.x * other.x, self.y * other.y)
 
 
-if __name__ == "__main__":
-    pt1 = PointState(5.0, 3.141)
-    pt2 = PointState(2.0, 2.7)
+def forward_to(state: State) -> Callable[[State], None]:
+    """
+    Create the callback with which a higher order state observes its children.
+    """
+    return lambda _: state.notify_change()
+
+
+class PointExpression:
+    """
+    Lazy arithmetic expression of points, numbers and number states.
+
+    The operators of `PointState` create a derived point (and two derived
+    numbers) for each operation. Thus, an expression such as
+    `(p - origin) * scale + offset` creates a chain of intermediate states,
+    each with its own callbacks. An expression only records the operations
+    and `state` fuses them into a single derived point, which observes the
+    inputs directly and is recomputed in one step if any of them changes.
+
+    Numbers and number states apply to both coordinates. A number state
+    on the left of an operator has to be wrapped with `PointExpression.of`,
+    because `NumberState` treats all operands as numbers itself, e.g.,
+    `PointExpression.of(scale) * p.lazy()`.
+
+    Example
+    -------
+    >>> expression = (p.lazy() - origin) * scale + offset
+    >>> q = expression.state()
+    """
+
+    def __init__(
+        self, evaluate: Callable[[], tuple[Any, Any]], inputs: tuple[State, ...]
+    ) -> None:
+        self.evaluate = evaluate
+        self.inputs = inputs
+
+    @classmethod
+    def of(cls, operand: Operand) -> PointExpression:
+        if isinstance(operand, PointExpression):
+            return operand
+
+        if isinstance(operand, PointState):
+            x, y = operand.x, operand.y
+            return cls(lambda: (x.value, y.value), (operand,))
+
+        if isinstance(operand, NumberState):
+            return cls(lambda: (operand.value, operand.value), (operand,))
+
+        if isinstance(operand, (int, float)):
+            return cls(lambda: (operand, operand), ())
+
+        raise TypeError(f"Unsupported operand of a point expression {operand}")
+
+    def combine(
+        self, other: Operand, op: Callable[[Any, Any], Any], reflected: bool = False
+    ) -> PointExpression:
+        other = PointExpression.of(other)
+        left, right = (other, self) if reflected else (self, other)
+        evaluate_left, evaluate_right = left.evaluate, right.evaluate
+
+        def evaluate() -> tuple[Any, Any]:
+            (x1, y1), (x2, y2) = evaluate_left(), evaluate_right()
+            return op(x1, x2), op(y1, y2)
+
+        return PointExpression(evaluate, left.inputs + right.inputs)
+
+    def __add__(self, other: Operand) -> PointExpression:
+        return self.combine(other, operator.add)
+
+    def __radd__(self, other: Operand) -> PointExpression:
+        return self.combine(other, operator.add, reflected=True)
+
+    def __sub__(self, other: Operand) -> PointExpression:
+        return self.combine(other, operator.sub)
+
+    def __rsub__(self, other: Operand) -> PointExpression:
+        return self.combine(other, operator.sub, reflected=True)
+
+    def __mul__(self, other: Operand) -> PointExpression:
+        return self.combine(other, operator.mul)
+
+    def __rmul__(self, other: Operand) -> PointExpression:
+        return self.combine(other, operator.mul, reflected=True)
+
+    def __truediv__(self, other: Operand) -> PointExpression:
+        return self.combine(other, operator.truediv)
+
+    def __rtruediv__(self, other: Operand) -> PointExpression:
+        return self.combine(other, operator.truediv, reflected=True)
+
+    def __neg__(self) -> PointExpression:
+        evaluate = self.evaluate
+
+        def negate() -> tuple[Any, Any]:
+            x, y = evaluate()
+            return -x, -y
+
+        return PointExpression(negate, self.inputs)
+
+    def value(self) -> tuple[Any, Any]:
+        """
+        Compute the current coordinates without creating a state.
+        """
+        return self.evaluate()
+
+    def state(self) -> PointState:
+        """
+        Fuse the expression into a single derived point.
+
+        The inputs only reference the derived point weakly. Once it is
+        garbage collected, its callbacks are removed from the inputs.
+        """
+        evaluate = self.evaluate
+        result = PointState(*evaluate())
+        ref = weakref.ref(result)
+
+        def update(_: State) -> None:
+            _result = ref()
+            if _result is not None:
+                _result.set(*evaluate())
+
+        # observe inputs used multiple times only once
+        inputs = list({id(state): state for state in self.inputs}.values())
+        for state in inputs:
+            state.on_change(update)
 
-    res = pt2 * NumberState(5)
-    # res = pt1 - pt2
-    res.on_change(lambda _: print(f"Res: {res}"), trigger=True)
-    print()
+        def unobserve() -> None:
+            for state in inputs:
+                remove_callback(state, update)
 
-    pt2.x.value = 200
-    print()
+        weakref.finalize(result, unobserve)
+        return result
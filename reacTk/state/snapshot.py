@@ -0,0 +1,293 @@
+"""
+Immutable snapshots of states.
+
+A snapshot is a copy of a state (and all states it contains) that is an
+instance of a frozen subclass of the state's class. Thus, it provides the
+same attributes and methods for reading (e.g., `PointState.values`), but
+it does not reference callbacks and cannot be changed.
+"""
+
+import threading
+from typing import Any, Callable, Optional, TypeVar
+import weakref
+
+from widget_state import ListState, State
+
+from .util import remove_callback
+
+S = TypeVar("S", bound=State)
+
+
+class FrozenState:
+    """
+    Mixin that makes a state immutable.
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(
+            f"Cannot set `{name}` because {type(self).__name__} is an immutable snapshot"
+        )
+
+    def on_change(self, *args: Any, **kwargs: Any) -> int:
+        raise AttributeError(
+            f"Cannot observe {type(self).__name__} because it is an immutable snapshot"
+        )
+
+    def notify_change(self) -> None:
+        pass
+
+
+_frozen_classes: dict[type, type] = {}
+
+
+def frozen_class(cls: type[S]) -> type[S]:
+    """
+    Get the frozen subclass of a state class.
+    """
+    if cls not in _frozen_classes:
+        _frozen_classes[cls] = type(f"Frozen{cls.__name__}", (FrozenState, cls), {})
+    return _frozen_classes[cls]
+
+
+def freeze(state: S, freeze_child: Callable[[State], State]) -> S:
+    """
+    Create an immutable copy of a single state whose contained states
+    are replaced by `freeze_child`.
+    """
+    frozen = object.__new__(frozen_class(type(state)))
+
+    attributes = {}
+    for name, value in state.__dict__.items():
+        if name == "_parent":
+            value = None
+        elif name == "_callbacks":
+            value = []
+        elif name in ("_computed_states", "_elem_obs"):
+            # reference the original state and are not needed for reading
+            value = {} if name == "_computed_states" else None
+        elif name == "_identity_index":
+            # indexes the elements of the original list
+            value = type(value)()
+        elif name == "_list":
+            value = tuple(freeze_child(elem) for elem in value)
+        elif isinstance(value, State):
+            value = freeze_child(value)
+        elif isinstance(value, (list, dict, set)):
+            value = type(value)(value)
+        attributes[name] = value
+
+    frozen.__dict__.update(attributes)
+    return frozen
+
+
+def snapshot(state: S, _memo: Optional[dict[int, State]] = None) -> S:
+    """
+    Create an immutable snapshot of a state.
+
+    States shared within the state (e.g., the coordinates of the corners of
+    a bounding box) are also shared within the snapshot. Values of basic
+    states are not copied, so mutable values such as arrays must be replaced
+    instead of changed in place to not be visible in snapshots.
+
+    The state is read as is, so it must not be changed by other threads
+    meanwhile. Use `Snapshots` to take snapshots of states changed concurrently.
+    """
+    memo = {} if _memo is None else _memo
+    if id(state) in memo:
+        return memo[id(state)]
+
+    if isinstance(state, FrozenState):
+        return state
+
+    memo[id(state)] = freeze(state, lambda child: snapshot(child, memo))
+    return memo[id(state)]
+
+
+def contained_states(state: State) -> list[State]:
+    """
+    Get the states directly contained in a state.
+    """
+    if isinstance(state, ListState):
+        return list(state._list)
+    return [
+        value
+        for name, value in state.__dict__.items()
+        if name != "_parent" and isinstance(value, State)
+    ]
+
+
+class Snapshots:
+    """
+    Consecutive snapshots of a state that share unchanged parts.
+
+    All states contained in the state are observed and marked when they
+    change. A new snapshot only copies the marked states and the states
+    containing them, all others are shared with the previous snapshot.
+    E.g., if a vertex of a large contour is moved, the point and the list
+    of frozen points are copied, but not the other points.
+
+    Snapshots are consistent even if the state is changed by other threads:
+    if a state changes while a snapshot is taken or a `with` block is open
+    on one of the copied states, the snapshot is taken again. If this does
+    not succeed after `attempts` tries, the previous snapshot is returned
+    and the changes are part of the next one. Note that writers must still
+    group values that belong together with `with state:` (or a `set` method)
+    so that no snapshot contains only some of them.
+
+    Example
+    -------
+    >>> snapshots = Snapshots(contour)
+    >>> frozen = snapshots.take()
+    >>> contour[0].x.value = 10
+    >>> snapshots.take()[1] is frozen[1]
+    True
+    """
+
+    def __init__(self, state: State, attempts: int = 3) -> None:
+        self.state = state
+        self.attempts = attempts
+
+        # `changed` is written by the callbacks of any thread
+        self.lock = threading.Lock()
+        self.changed: set[int] = set()
+        # snapshots are taken by the GUI thread, but before the mainloop
+        # draws are executed by the threads changing states
+        self.taking = threading.Lock()
+
+        self.observed: dict[int, tuple[State, Callable[[State], None]]] = {}
+        self.frozen: dict[int, State] = {}
+        self.children: dict[int, set[int]] = {}
+        self.parents: dict[int, set[int]] = {}
+        # states copied while taking a snapshot
+        self.copied: list[State] = []
+
+        self.latest: Optional[State] = None
+        self.take()
+
+    def observe(self, state: State) -> None:
+        key = id(state)
+        ref = weakref.ref(self)
+
+        def mark(_: State) -> None:
+            snapshots = ref()
+            if snapshots is None:
+                remove_callback(state, mark)
+                return
+            with snapshots.lock:
+                snapshots.changed.add(key)
+
+        # mark the state before other callbacks are notified, as they may
+        # (indirectly) cause a draw taking the next snapshot
+        state._callbacks = [mark, *state._callbacks]
+        self.observed[key] = (state, mark)
+
+    def forget(self, key: int) -> None:
+        """
+        Stop observing a state that is no longer contained.
+        """
+        state, mark = self.observed.pop(key)
+        remove_callback(state, mark)
+        self.frozen.pop(key, None)
+        self.parents.pop(key, None)
+        for child in self.children.pop(key, set()):
+            self.unlink(key, child)
+
+    def unlink(self, parent: int, child: int) -> None:
+        parents = self.parents.get(child, set())
+        parents.discard(parent)
+        if len(parents) == 0 and child in self.observed:
+            self.forget(child)
+
+    def containing(self, changed: set[int]) -> set[int]:
+        """
+        Get changed states and all states containing them.
+        """
+        keys: set[int] = set()
+        stack = [key for key in changed if key in self.observed]
+        while len(stack) > 0:
+            key = stack.pop()
+            if key not in keys:
+                keys.add(key)
+                stack.extend(self.parents.get(key, ()))
+        return keys
+
+    def copy(self, state: State, keys: set[int], changed: set[int]) -> State:
+        """
+        Freeze a state if it is new or in `keys` and reuse its frozen copy otherwise.
+
+        Frozen states are removed from `keys`, so that states shared within
+        the state are frozen once.
+        """
+        key = id(state)
+        if key not in self.observed:
+            self.observe(state)
+        elif key not in keys:
+            return self.frozen[key]
+        keys.discard(key)
+        self.copied.append(state)
+
+        children: set[int] = set()
+        frozen = self.frozen
+
+        def freeze_child(child: State) -> State:
+            child_key = id(child)
+            children.add(child_key)
+            if child_key in frozen and child_key not in keys:
+                # shortcut for the common case of large lists with few changes
+                return frozen[child_key]
+            return self.copy(child, keys, changed)
+
+        self.frozen[key] = freeze(state, freeze_child)
+
+        # only states that notified themselves can contain other states than before
+        if key in changed or key not in self.children:
+            previous = self.children.get(key, set())
+            self.children[key] = children
+            for child in children - previous:
+                self.parents.setdefault(child, set()).add(key)
+            for child in previous - children:
+                self.unlink(key, child)
+        return self.frozen[key]
+
+    def take(self) -> State:
+        """
+        Get a consistent snapshot of the current state.
+        """
+        with self.taking:
+            with self.lock:
+                changed, self.changed = self.changed, set()
+            if len(changed) == 0 and self.latest is not None:
+                return self.latest
+
+            for _ in range(self.attempts):
+                self.copied = []
+                frozen = self.copy(self.state, self.containing(changed), changed)
+
+                with self.lock:
+                    torn = len(self.changed) > 0 or any(
+                        state._enter_count > 0 for state in self.copied
+                    )
+                    changed |= self.changed
+                    self.changed = set()
+                if not torn:
+                    self.latest = frozen
+                    return frozen
+
+            with self.lock:
+                self.changed |= changed
+            if self.latest is None:
+                # there is no consistent snapshot yet
+                self.latest = frozen
+            return self.latest
+
+    def close(self) -> None:
+        """
+        Stop observing the state.
+        """
+        with self.taking:
+            for key in list(self.observed):
+                state, mark = self.observed.pop(key)
+                remove_callback(state, mark)
+            self.frozen.clear()
+            self.children.clear()
+            self.parents.clear()
@@ -0,0 +1,318 @@
+"""
+Memory-mapped store of contour annotations for large projects.
+
+All contours of a project are kept in two flat files that are mapped into
+memory. Only the contours of the images that are displayed are
+materialized as reactive `ContourState`s, so that memory scales with what
+is on screen rather than with the size of the project.
+
+The store is a directory with the files:
+  * vertices.i32: (M, 2) int32 vertices of all contours
+  * contours.i64: (K, 3) int64 rows of image index, first vertex and number
+                  of vertices - removed contours have a length of -1
+
+Changes of materialized contours are written back when they happen. A
+moved vertex only overwrites its own row. If points are inserted or
+removed, the vertices of the contour are appended and the previous ones
+become garbage until the store is compacted.
+
+Vertices are stored as int32. Thus, the fractional parts of float
+coordinates (e.g., of sub-pixel positions) are truncated.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from widget_state import State
+
+from ..lazy import lazy_import
+from .contour import ContourState
+from .point import PointState
+from .util import remove_callback
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+np = lazy_import("numpy")
+
+VERTICES = "vertices.i32"
+CONTOURS = "contours.i64"
+
+IMAGE, START, LENGTH = range(3)
+REMOVED = -1
+
+
+def map_file(path: str, dtype: str, columns: int) -> NDArray:
+    """
+    Map a file of rows with `columns` values into memory.
+    """
+    n_rows = os.path.getsize(path) // (np.dtype(dtype).itemsize * columns)
+    if n_rows == 0:
+        # empty files cannot be mapped
+        return np.zeros((0, columns), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r+", shape=(n_rows, columns))
+
+
+class AnnotationStore:
+    """
+    Store of contours per image backed by memory-mapped files.
+
+    Example
+    -------
+    >>> store = AnnotationStore("project.annotations")
+    >>> contour_id = store.add(image=3, contour=np.array([[0, 0], [10, 0], [10, 10]]))
+    >>> contours = store.materialize(image=3)  # dict of id to ContourState
+    >>> contours[contour_id][0].set(5, 5)  # written to the store
+    >>> store.release(image=3)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        for name in (VERTICES, CONTOURS):
+            open(os.path.join(path, name), mode="ab").close()
+
+        self.vertices = map_file(os.path.join(path, VERTICES), "int32", 2)
+        self.contours = map_file(os.path.join(path, CONTOURS), "int64", 3)
+
+        # contour ids sorted by image to look up the contours of an image
+        self._index: Optional[tuple[NDArray, NDArray]] = None
+
+        # materialized contours by image and functions removing their write-backs
+        self.materialized: dict[int, dict[int, ContourState]] = {}
+        self.callbacks: dict[int, Callable[[], None]] = {}
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.contours[:, LENGTH] != REMOVED))
+
+    def append(self, name: str, rows: NDArray) -> None:
+        """
+        Append rows to a file and map it again.
+        """
+        path = os.path.join(self.path, name)
+        array = self.vertices if name == VERTICES else self.contours
+        if isinstance(array, np.memmap):
+            array.flush()
+
+        with open(path, mode="ab") as f:
+            f.write(np.ascontiguousarray(rows).tobytes())
+
+        if name == VERTICES:
+            self.vertices = map_file(path, "int32", 2)
+        else:
+            self.contours = map_file(path, "int64", 3)
+            self._index = None
+
+    def index(self) -> tuple[NDArray, NDArray]:
+        if self._index is None:
+            order = np.argsort(self.contours[:, IMAGE], kind="stable")
+            self._index = (self.contours[order, IMAGE], order)
+        return self._index
+
+    def contour_ids(self, image: int) -> list[int]:
+        """
+        Get the ids of all contours of an image.
+        """
+        images, order = self.index()
+        start, stop = np.searchsorted(images, [image, image + 1])
+        ids = order[start:stop]
+        return ids[self.contours[ids, LENGTH] != REMOVED].tolist()
+
+    def images(self) -> list[int]:
+        """
+        Get all images with contours.
+        """
+        valid = self.contours[:, LENGTH] != REMOVED
+        return np.unique(self.contours[valid, IMAGE]).tolist()
+
+    def get(self, contour_id: int) -> NDArray:
+        """
+        Get the vertices of a contour without materializing it.
+
+        The returned array is a view into the store.
+        """
+        _, start, length = self.contours[contour_id]
+        assert length != REMOVED, f"Contour {contour_id} was removed"
+        stop = start + length
+        return self.vertices[start:stop]
+
+    def add_many(self, image: int, contours: Iterable[NDArray]) -> list[int]:
+        """
+        Add contours given as (N, 2) arrays to an image.
+
+        Coordinates are stored as int32 - fractional parts are truncated.
+
+        Returns
+        -------
+        list of int
+            the ids of the added contours
+        """
+        contours = [
+            np.asarray(contour, dtype=np.int32).reshape(-1, 2) for contour in contours
+        ]
+        if len(contours) == 0:
+            return []
+
+        lengths = np.array([len(contour) for contour in contours], dtype=np.int64)
+        starts = len(self.vertices) + np.cumsum(lengths) - lengths
+        rows = np.stack([np.full(len(contours), image), starts, lengths], axis=1)
+
+        first_id = len(self.contours)
+        self.append(VERTICES, np.concatenate(contours))
+        self.append(CONTOURS, rows.astype(np.int64))
+
+        ids = list(range(first_id, first_id + len(contours)))
+        if image in self.materialized:
+            for contour_id in ids:
+                self.materialized[image][contour_id] = self.bind(contour_id)
+        return ids
+
+    def add(self, image: int, contour: NDArray | ContourState) -> int:
+        """
+        Add a contour to an image and get its id.
+        """
+        if isinstance(contour, ContourState):
+            contour = contour.to_numpy()
+        return self.add_many(image, [contour])[0]
+
+    def remove(self, contour_id: int) -> None:
+        """
+        Remove a contour - its vertices remain until the store is compacted.
+        """
+        image = int(self.contours[contour_id, IMAGE])
+        self.unbind(contour_id)
+        self.materialized.get(image, {}).pop(contour_id, None)
+        self.contours[contour_id, LENGTH] = REMOVED
+
+    def write(self, contour_id: int, contour: NDArray) -> None:
+        """
+        Write the vertices of a contour to the store.
+
+        Coordinates are stored as int32 - fractional parts are truncated.
+        """
+        contour = np.asarray(contour, dtype=np.int32).reshape(-1, 2)
+        _, start, length = self.contours[contour_id]
+        if len(contour) == length:
+            stop = start + length
+            self.vertices[start:stop] = contour
+            return
+
+        start = len(self.vertices)
+        self.append(VERTICES, contour)
+        self.contours[contour_id, START] = start
+        self.contours[contour_id, LENGTH] = len(contour)
+
+    def bind(self, contour_id: int) -> ContourState:
+        """
+        Create the reactive state of a contour that writes its changes to the store.
+
+        Changes of single points only write their vertex, while changes of
+        the list of points write all vertices of the contour.
+        """
+        state = ContourState.from_numpy(self.get(contour_id))
+        observed: dict[int, PointState] = {}
+
+        def write_vertex(point: PointState) -> None:
+            _, start, length = self.contours[contour_id]
+            try:
+                index = state.index(point)
+            except ValueError:
+                index = None
+            if index is None or len(state) != length:
+                # the points changed in a batch, which writes all vertices on exit
+                return
+            self.vertices[start + index] = point.values()
+
+        def observe_points() -> None:
+            points = {id(point): point for point in state}
+            for _id in observed.keys() - points.keys():
+                remove_callback(observed.pop(_id), write_vertex)
+            for _id in points.keys() - observed.keys():
+                observed[_id] = points[_id]
+                observed[_id].on_change(write_vertex)
+
+        def write_back(state: State) -> None:
+            self.write(contour_id, state.to_numpy())
+            observe_points()
+
+        def unbind() -> None:
+            remove_callback(state, write_back)
+            for point in observed.values():
+                remove_callback(point, write_vertex)
+            observed.clear()
+
+        observe_points()
+        state.on_change(write_back)
+        self.callbacks[contour_id] = unbind
+        return state
+
+    def unbind(self, contour_id: int) -> None:
+        if contour_id in self.callbacks:
+            self.callbacks.pop(contour_id)()
+
+    def materialize(self, image: int) -> dict[int, ContourState]:
+        """
+        Get the contours of an image as reactive states by id.
+
+        Changes of the states are written to the store until the image is released.
+        """
+        if image not in self.materialized:
+            self.materialized[image] = {
+                contour_id: self.bind(contour_id)
+                for contour_id in self.contour_ids(image)
+            }
+        return self.materialized[image]
+
+    def release(self, image: int) -> None:
+        """
+        Release the reactive states of the contours of an image.
+        """
+        for contour_id in self.materialized.pop(image, {}):
+            self.unbind(contour_id)
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Write changes of the mapped files to disk.
+        """
+        for array in (self.vertices, self.contours):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def garbage(self) -> int:
+        """
+        Number of vertices not referenced by any contour.
+        """
+        valid = self.contours[:, LENGTH] != REMOVED
+        return len(self.vertices) - int(self.contours[valid, LENGTH].sum())
+
+    def compact(self) -> None:
+        """
+        Rewrite the store without removed contours and unreferenced vertices.
+
+        Contour ids change. Thus, all images must be released before.
+        """
+        assert len(self.materialized) == 0, "Release all images before compacting"
+
+        valid = self.contours[:, LENGTH] != REMOVED
+        rows = np.array(self.contours[valid])
+        starts, lengths = rows[:, START], rows[:, LENGTH]
+        vertices = [
+            self.vertices[start:stop] for start, stop in zip(starts, starts + lengths)
+        ]
+        vertices = np.concatenate(vertices) if len(vertices) > 0 else np.zeros((0, 2))
+        rows[:, START] = np.cumsum(lengths) - lengths
+
+        # release the mappings before the files are replaced
+        self.vertices = self.contours = None
+        for name, array in ((VERTICES, vertices.astype(np.int32)), (CONTOURS, rows)):
+            path = os.path.join(self.path, name)
+            with open(path + ".tmp", mode="wb") as f:
+                f.write(np.ascontiguousarray(array).tobytes())
+            os.replace(path + ".tmp", path)
+
+        self.vertices = map_file(os.path.join(self.path, VERTICES), "int32", 2)
+        self.contours = map_file(os.path.join(self.path, CONTOURS), "int64", 3)
+        self._index = None
@@ -1,6 +1,20 @@
+from contextlib import contextmanager
+import functools
+import gc
+import inspect
 import tkinter as tk
+from typing import Callable, Iterator
+import weakref
 
-from widget_state import BoolState, NumberState, StringState
+from widget_state import (
+    BoolState,
+    DictState,
+    HigherOrderState,
+    ListState,
+    NumberState,
+    State,
+    StringState,
+)
 
 
 def to_tk_var(state: BoolState | NumberState | StringState) -> tk.Variable:
@@ -20,3 +34,134 @@ def to_tk_var(state: BoolState | NumberState | StringState) -> tk.Variable:
     variable.trace_add("write", lambda *_: state.set(variable.get()))
 
     return variable
+
+
+def remove_callback(state: State, callback: Callable[[State], None]) -> None:
+    """
+    Remove a callback from a state.
+
+    In contrast to `State.remove_callback`, the callback list is replaced
+    instead of modified. Thus, callbacks can be removed while the state
+    notifies them (e.g., by the callback itself) without skipping others.
+    Removing a callback that is not registered is a no-op.
+    """
+    state._callbacks = [cb for cb in state._callbacks if cb is not callback]
+
+    if isinstance(state, ListState):
+        state._elem_obs._callbacks = [
+            cb for cb in state._elem_obs._callbacks if cb is not callback
+        ]
+
+
+def prepend_callback(state: State, callback: Callable[[State], None]) -> None:
+    """
+    Register a callback that is notified before all callbacks registered so far.
+
+    This allows to record a change before other callbacks (e.g., of a
+    higher order state containing the state) cause a draw that reads it.
+    """
+    state._callbacks = [callback, *state._callbacks]
+
+
+def refers_to(callback: Callable[[State], None], obj: object) -> bool:
+    """
+    Test if a callback is a method of or a closure over an object.
+    """
+    if getattr(callback, "__self__", None) is obj:
+        return True
+
+    closure = getattr(callback, "__closure__", None) or ()
+    return any(cell.cell_contents is obj for cell in closure)
+
+
+def remove_observer(state: State, observer: object) -> None:
+    """
+    Remove all callbacks of a state that refer to an observer.
+
+    This is required to remove callbacks registered by `widget_state`
+    internally, e.g., by `depends_on` or by a higher order state on its children.
+    """
+    for callback in [cb for cb in state._callbacks if refers_to(cb, observer)]:
+        remove_callback(state, callback)
+
+
+def detach(state: HigherOrderState | ListState) -> None:
+    """
+    Detach a state from its child states.
+
+    Higher order states observe their children to forward notifications.
+    If a higher order state is discarded while its children live on (e.g.,
+    a `LineState` created for points of a contour), these callbacks keep
+    it alive and make the callback lists of the children grow.
+    Note that children are not detached recursively.
+    """
+    if isinstance(state, ListState):
+        for elem in state:
+            remove_callback(elem, state._elem_obs)
+        return
+
+    for child in state.dict().values():
+        remove_observer(child, state)
+
+
+def weak_callback(method: Callable[[State], None]) -> Callable[[State], None]:
+    """
+    Wrap a bound method into a state callback that only references its instance weakly.
+
+    Once the instance is garbage collected, the callback removes itself
+    from the state notifying it.
+    """
+    ref = weakref.WeakMethod(method)
+
+    def callback(state: State) -> None:
+        _method = ref()
+        if _method is None:
+            remove_callback(state, callback)
+            return
+        _method(state)
+
+    return callback
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Pause the cyclic garbage collector while states are created in bulk.
+
+    Creating many states triggers collections which traverse all of them
+    again and again, although none of them is garbage.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+@functools.cache
+def computed_state_names(cls: type[HigherOrderState]) -> tuple[str, ...]:
+    """
+    Get the names of the computed states of a higher order state class.
+    """
+    return tuple(
+        name
+        for name, member in inspect.getmembers(cls)
+        if inspect.isfunction(member) and hasattr(member, "is_computed_state")
+    )
+
+
+def init_dict_state(state: DictState) -> None:
+    """
+    Initialize a dict state as `DictState.__init__` does, but with the
+    computed states of its class only discovered once.
+
+    `HigherOrderState.__init__` inspects all members of every instance, which
+    dominates the time to create small states such as points in bulk.
+    """
+    State.__init__(state)
+    state._computed_states = {
+        name: getattr(state, name) for name in computed_state_names(type(state))
+    }
+    state._labels = []
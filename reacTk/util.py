@@ -1,6 +1,36 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
+import functools
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+import weakref
+
+import tkinter as tk
+from widget_state import BasicState
+
+from .lazy import lazy_import
+
+if TYPE_CHECKING:
+    from screeninfo import Monitor
+
+# querying monitors is only needed to place windows
+screeninfo = lazy_import("screeninfo")
+
 
-import screeninfo
+@functools.lru_cache(maxsize=256)
+def parse_geometry(geometry_str: str) -> tuple[int, int, int, int]:
+    """
+    Parse a geometry string `WIDTHxHEIGHT+X+Y` into `(width, height, x, y)`.
+
+    Results are cached because windows report the same geometries repeatedly.
+    """
+    _split = geometry_str.split("+")
+    width, height = map(int, _split[0].split("x"))
+    x, y = map(int, _split[1:])
+    return width, height, x, y
 
 
 @dataclass
@@ -12,19 +42,212 @@ class Geometry:
 
     @classmethod
     def from_str(cls, geometry_str: str):
-        _split = geometry_str.split("+")
-        width, height = map(int, _split[0].split("x"))
-        x, y = map(int, _split[1:])
+        width, height, x, y = parse_geometry(geometry_str)
         return cls(width=width, height=height, x=x, y=y)
 
+    @classmethod
+    def of_window(cls, window: tk.Misc):
+        """
+        Get the geometry of a window in screen coordinates.
+        """
+        return cls(
+            width=window.winfo_width(),
+            height=window.winfo_height(),
+            x=window.winfo_rootx(),
+            y=window.winfo_rooty(),
+        )
+
+    def contains(self, other: Geometry) -> bool:
+        """
+        Test if another rectangle lies completely inside this one.
+        """
+        return (
+            self.x <= other.x
+            and self.y <= other.y
+            and other.x + other.width <= self.x + self.width
+            and other.y + other.height <= self.y + self.height
+        )
+
+    def overlap(self, other: Geometry) -> int:
+        """
+        Area of the intersection with another rectangle.
+        """
+        width = min(self.x + self.width, other.x + other.width) - max(self.x, other.x)
+        height = min(self.y + self.height, other.y + other.height) - max(
+            self.y, other.y
+        )
+        return max(width, 0) * max(height, 0)
+
     def __str__(self):
         return f"{self.width}x{self.height}+{self.x}+{self.y}"
 
 
-def get_active_monitor(geometry: str | Geometry) -> screeninfo.common.Monitor:
-    geometry = Geometry.from_str(geometry) if isinstance(geometry, str) else geometry
+def monitor_geometry(monitor: Monitor) -> Geometry:
+    return Geometry(
+        width=monitor.width, height=monitor.height, x=monitor.x, y=monitor.y
+    )
+
+
+class MonitorState(BasicState[Optional["Monitor"]]):
+    """
+    Reactive state of the monitor a window is shown on.
+    """
+
+    def __init__(self, value: Optional[Monitor] = None) -> None:
+        super().__init__(value)
+
+
+class MonitorService:
+    """
+    Cache of the monitor topology.
+
+    Querying monitors is a round trip to the display server. Thus, the
+    topology is cached and only queried again if it is older than `ttl`
+    seconds, if the cache is invalidated (e.g., on a signal that monitors
+    changed), or if a window lies outside of all known monitors. The latter
+    happens at most once per `ttl` seconds, as windows moved off-screen
+    report a new geometry on every `<Configure>` event.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 30.0,
+        get_monitors: Optional[Callable[[], list[Monitor]]] = None,
+    ) -> None:
+        self.ttl = ttl
+        self._get_monitors = get_monitors
+        self.lock = threading.Lock()
+        self._monitors: Optional[list[tuple[Monitor, Geometry]]] = None
+        self.timestamp = 0.0
+        # time and geometry of the last refresh because a rectangle lay outside
+        self.missed_timestamp = -math.inf
+        self.missed: Optional[Geometry] = None
+        self.states: weakref.WeakKeyDictionary[tk.Misc, MonitorState] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def query(self) -> list[Monitor]:
+        if self._get_monitors is not None:
+            return self._get_monitors()
+        return screeninfo.get_monitors()
+
+    def invalidate(self) -> None:
+        """
+        Signal that monitors changed - they are queried again on next use.
+        """
+        with self.lock:
+            self._monitors = None
+
+    def expired(self) -> bool:
+        return self._monitors is None or (
+            self.ttl is not None and time.monotonic() - self.timestamp > self.ttl
+        )
+
+    def cached_monitors(self) -> list[tuple[Monitor, Geometry]]:
+        with self.lock:
+            if self.expired():
+                self._monitors = [
+                    (monitor, monitor_geometry(monitor)) for monitor in self.query()
+                ]
+                self.timestamp = time.monotonic()
+            return self._monitors
+
+    def monitors(self) -> list[Monitor]:
+        """
+        Get all monitors.
+        """
+        return [monitor for monitor, _ in self.cached_monitors()]
+
+    def primary(self) -> Optional[Monitor]:
+        """
+        Get the primary monitor or the first one if none is marked as primary.
+        """
+        monitors = self.monitors()
+        for monitor in monitors:
+            if monitor.is_primary:
+                return monitor
+        return monitors[0] if len(monitors) > 0 else None
+
+    def find(self, geometry: Geometry) -> Optional[Monitor]:
+        """
+        Find the monitor containing a rectangle completely or, otherwise,
+        the one sharing the largest area with it.
+        """
+        best, best_overlap = None, 0
+        for monitor, bounds in self.cached_monitors():
+            if bounds.contains(geometry):
+                return monitor
+
+            overlap = bounds.overlap(geometry)
+            if overlap > best_overlap:
+                best, best_overlap = monitor, overlap
+        return best
+
+    def may_refresh(self, geometry: Geometry) -> bool:
+        """
+        Test if monitors may be queried again because a rectangle lies
+        outside of all of them and remember it if so.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if geometry == self.missed or (
+                self.ttl is not None and now - self.missed_timestamp < self.ttl
+            ):
+                return False
+
+            self.missed, self.missed_timestamp = geometry, now
+            return True
+
+    def monitor_of(self, geometry: str | Geometry) -> Optional[Monitor]:
+        """
+        Get the monitor a rectangle is shown on.
+
+        If the rectangle lies outside of all known monitors, the topology
+        is assumed to have changed and queried again (see `may_refresh`).
+        If it still lies outside, the primary monitor is returned.
+        """
+        geometry = (
+            Geometry.from_str(geometry) if isinstance(geometry, str) else geometry
+        )
+
+        monitor = self.find(geometry)
+        if monitor is None and not self.expired() and self.may_refresh(geometry):
+            self.invalidate()
+            monitor = self.find(geometry)
+        return monitor if monitor is not None else self.primary()
+
+    def current_monitor(self, window: tk.Misc) -> MonitorState:
+        """
+        Get a reactive state of the monitor the toplevel of a window is shown on.
+
+        The state is updated when the toplevel is moved or resized and only
+        notifies if the monitor changes.
+        """
+        toplevel = window.winfo_toplevel()
+        if toplevel in self.states:
+            return self.states[toplevel]
+
+        state = MonitorState(self.monitor_of(Geometry.of_window(toplevel)))
+        self.states[toplevel] = state
+
+        def on_configure(event: tk.Event) -> None:
+            # the binding of a toplevel is also triggered for its children
+            if event.widget is toplevel:
+                state.value = self.monitor_of(Geometry.of_window(toplevel))
+
+        toplevel.bind("<Configure>", on_configure, add="+")
+        return state
+
+
+_monitor_service = MonitorService()
+
+
+def get_monitor_service() -> MonitorService:
+    """
+    Get the monitor service shared by all windows.
+    """
+    return _monitor_service
+
 
-    for monitor in screeninfo.get_monitors():
-        if monitor.x <= geometry.x < monitor.x + monitor.width:
-            return monitor
-    return screeninfo.get_monitors()[0]
+def get_active_monitor(geometry: str | Geometry) -> Monitor:
+    return get_monitor_service().monitor_of(geometry)
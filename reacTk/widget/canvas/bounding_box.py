@@ -1,9 +1,11 @@
 import tkinter as tk
-from typing import Optional
+from typing import Any, Callable, Literal, Optional
 
 from widget_state import HigherOrderState, IntState
 
+from ...decorator import stateful
 from ...state import BoundingBoxState as BoundingBoxData
+from .lib import CanvasItem, release_state
 from .line import Line, LineState, LineStyle, LineData
 from .rectangle import Rectangle, RectangleState, RectangleStyle, RectangleData
 
@@ -37,57 +39,110 @@ class BoundingBoxState(HigherOrderState):
         self.style = style if style is not None else BoundingBoxStyle()
 
 
+@stateful
 class BoundingBox:
+    """
+    Draw a bounding box as four lines with a handle rectangle at each corner.
+
+    Lines and handles are created once and reference the cached corner
+    points of the bounding box data. Thus, they update themselves in place
+    and dragging a handle moves the edges adjacent to its corner. If the
+    widget is rebound to another bounding box, they are rebound as well.
+    """
 
     def __init__(self, canvas: tk.Canvas, state: BoundingBoxState):
         self.canvas = canvas
-        self._state = state
+        self.widget = canvas
 
         self.lines = []
         self.rectangles = []
 
-        self.draw(self._state)
+        self.bindings_rectangle = {}
+        self.bindings_line = {}
 
     def draw(self, state: BoundingBoxState):
+        top_left, top_right, bottom_left, bottom_right = state.data.corners()
         point_pairs = [
-            (state.data.top_left(), state.data.top_right()),
-            (state.data.top_left(), state.data.bottom_left()),
-            (state.data.bottom_left(), state.data.bottom_right()),
-            (state.data.bottom_right(), state.data.top_right()),
+            (top_left, top_right),
+            (top_left, bottom_left),
+            (bottom_left, bottom_right),
+            (bottom_right, top_right),
         ]
-        self.lines.extend(
-            [
-                Line(
-                    self.canvas,
-                    LineState(LineData(start, end), style=state.style.line_style),
-                )
-                for start, end in point_pairs
-            ]
-        )
 
-        points = [
-            state.data.top_left(),
-            state.data.top_right(),
-            state.data.bottom_left(),
-            state.data.bottom_right(),
-        ]
-        self.rectangles = [
-            Rectangle(
-                self.canvas,
-                RectangleState(
-                    data=RectangleData(point, size=state.style.rectangle_size),
-                    style=state.style.rectangle_style,
-                ),
+        # lines and handles draw changes of their states themselves - they
+        # are only rebound if the widget is rebound to another bounding box
+        for i, (start, end) in enumerate(point_pairs):
+            line = self.lines[i] if i < len(self.lines) else None
+            if (
+                line is not None
+                and line._state.data.start is start
+                and line._state.data.end is end
+                and line._state.style is state.style.line_style
+            ):
+                continue
+
+            line_state = LineState(LineData(start, end), style=state.style.line_style)
+            if line is not None:
+                release_state(line._state)
+                line.rebind(line_state)
+                continue
+
+            self.lines.append(Line(self.canvas, line_state))
+            for binding, (callback, options) in self.bindings_line.items():
+                self.lines[i].tag_bind(binding, callback, **options)
+
+        for i, point in enumerate(state.data.corners()):
+            rectangle = self.rectangles[i] if i < len(self.rectangles) else None
+            if (
+                rectangle is not None
+                and rectangle._state.data.center is point
+                and rectangle._state.data.size is state.style.rectangle_size
+                and rectangle._state.style is state.style.rectangle_style
+            ):
+                continue
+
+            rectangle_state = RectangleState(
+                data=RectangleData(point, size=state.style.rectangle_size),
+                style=state.style.rectangle_style,
             )
-            for point in points
-        ]
+            if rectangle is not None:
+                release_state(rectangle._state)
+                rectangle.rebind(rectangle_state)
+                continue
 
-    def delete(self) -> None:
-        for line in self.lines.values():
-            line.delete()
+            self.rectangles.append(Rectangle(self.canvas, rectangle_state))
+            for binding, (callback, options) in self.bindings_rectangle.items():
+                self.rectangles[i].tag_bind(binding, callback, **options)
 
-        for rectangle in self.rectangles.values():
-            rectangle.delete()
+    def tag_bind(
+        self,
+        binding: str,
+        callback: Callable[[tk.Event, CanvasItem], None],
+        _type: Literal["rectangle", "line"],
+        **options: Any,
+    ) -> None:
+        """
+        Bind a callback to events of the rectangles or lines.
+
+        Options such as `compress` and `snap_to` are passed to `CanvasItem.tag_bind`.
+        """
+        bindings = (
+            self.bindings_rectangle if _type == "rectangle" else self.bindings_line
+        )
+        bindings[binding] = (callback, options)
+
+        for item in self.rectangles if _type == "rectangle" else self.lines:
+            item.tag_bind(binding, callback, **options)
+
+    def delete(self) -> None:
+        for item in [*self.lines, *self.rectangles]:
+            item.delete()
+            release_state(item._state)
+        self.lines.clear()
+        self.rectangles.clear()
+
+        self.bindings_rectangle.clear()
+        self.bindings_line.clear()
 
 
 __all__ = ["BoundingBox", "BoundingBoxData", "BoundingBoxStyle", "BoundingBoxState"]
@@ -0,0 +1,274 @@
+"""
+Canvas item that displays many bounding boxes at once.
+
+It is meant for per-frame detector output: the boxes of a frame are
+set as an (N, 4) array and drawn by a pool of rectangle and text items
+that is reused across frames.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+from uuid import uuid4 as uuid
+
+import tkinter as tk
+from widget_state import DictState, HigherOrderState, IntState, ObjectState, StringState
+
+from ...decorator import stateful
+from ...lazy import lazy_import
+from .lib import CanvasItem
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+np = lazy_import("numpy")
+
+TCL_ESCAPES = {"\n": "\\n", "\t": "\\t", "\r": "\\r"}
+TCL_SPECIAL = set(' \\{}[]$";')
+
+
+def tcl_quote(text: str) -> str:
+    """
+    Quote a string so that it is a single word in a Tcl script.
+    """
+    if text == "":
+        return "{}"
+    return "".join(
+        TCL_ESCAPES.get(c, "\\" + c if c in TCL_SPECIAL else c) for c in text
+    )
+
+
+class BoundingBoxCollectionData(HigherOrderState):
+    """
+    Bounding boxes of a single frame.
+
+    * boxes: array of shape (N, 4) containing boxes as (x1, y1, x2, y2)
+    * labels: optional list of N labels
+    * scores: optional array of N scores
+    """
+
+    def __init__(
+        self,
+        boxes: Optional[NDArray] = None,
+        labels: Optional[list[str]] = None,
+        scores: Optional[NDArray] = None,
+    ):
+        super().__init__()
+
+        self.boxes = ObjectState(boxes if boxes is not None else np.zeros((0, 4)))
+        self.labels = ObjectState(labels)
+        self.scores = ObjectState(scores)
+
+    def set(
+        self,
+        boxes: NDArray,
+        labels: Optional[list[str]] = None,
+        scores: Optional[NDArray] = None,
+    ) -> None:
+        """
+        Replace all boxes and notify only once.
+        """
+        with self:
+            self.boxes.value = boxes
+            self.labels.value = labels
+            self.scores.value = scores
+
+    def texts(self) -> list[str]:
+        """
+        Compute the text displayed for each box from its label and score.
+        """
+        n = len(self.boxes.value)
+        labels = self.labels.value
+        scores = self.scores.value
+
+        if labels is None and scores is None:
+            return [""] * n
+
+        labels = [str(label) for label in labels] if labels is not None else [""] * n
+        scores = (
+            [f"{score:.2f}" for score in scores] if scores is not None else [""] * n
+        )
+        return [f"{label} {score}".strip() for label, score in zip(labels, scores)]
+
+
+class BoundingBoxCollectionStyle(DictState):
+
+    def __init__(
+        self,
+        color: Optional[str | StringState] = "red",
+        width: Optional[int | IntState] = 2,
+        text_color: Optional[str | StringState] = "red",
+        font_name: Optional[str | StringState] = None,
+        font_size: Optional[int | IntState] = 10,
+    ):
+        super().__init__()
+
+        self.color = color if isinstance(color, StringState) else StringState(color)
+        self.width = width if isinstance(width, IntState) else IntState(width)
+        self.text_color = (
+            text_color
+            if isinstance(text_color, StringState)
+            else StringState(text_color)
+        )
+        self.font_name = (
+            font_name if isinstance(font_name, StringState) else StringState(font_name)
+        )
+        self.font_size = (
+            font_size if isinstance(font_size, IntState) else IntState(font_size)
+        )
+
+
+class BoundingBoxCollectionState(HigherOrderState):
+
+    def __init__(
+        self,
+        data: Optional[BoundingBoxCollectionData] = None,
+        style: Optional[BoundingBoxCollectionStyle] = None,
+    ):
+        super().__init__()
+
+        self.data = data if data is not None else BoundingBoxCollectionData()
+        self.style = style if style is not None else BoundingBoxCollectionStyle()
+
+
+@stateful
+class BoundingBoxCollection(CanvasItem):
+    """
+    Draw an array of bounding boxes with optional labels and scores.
+
+    Rectangle and text items are kept in a pool that only grows. Items
+    that are not needed for the current frame are hidden instead of deleted.
+    All coordinate, text and visibility updates of a frame are sent to Tcl
+    as a single script and items whose values did not change are skipped.
+
+    The `id` of the collection is a tag shared by all its items. Thus,
+    `tag_bind` applies to all boxes and `box_at` can be used to resolve the
+    box index of an event.
+    """
+
+    def __init__(self, canvas: tk.Canvas, state: BoundingBoxCollectionState):
+        super().__init__(canvas, state)
+
+        self.id = f"bbc_{uuid().hex}"
+        self.tag_rectangle = f"{self.id}_rectangle"
+        self.tag_text = f"{self.id}_text"
+
+        self.rectangles: list[int] = []
+        self.texts: list[int] = []
+        self.index: dict[int, int] = {}
+
+        # values currently displayed by each pooled item
+        self.drawn_coords: list[Optional[list[int]]] = []
+        self.drawn_texts: list[Optional[str]] = []
+        self.drawn_style: Optional[list] = None
+        self.n_visible = 0
+
+    def draw(self, state: BoundingBoxCollectionState) -> None:
+        boxes = np.asarray(state.data.boxes.value).reshape(-1, 4).round()
+        boxes = boxes.astype(int).tolist()
+        texts = state.data.texts()
+        texts = texts + [""] * (len(boxes) - len(texts))
+
+        self.draw_style(state)
+        while len(self.rectangles) < len(boxes):
+            self.create_items(state)
+
+        path = str(self.canvas)
+        script = []
+        for i, (coords, text) in enumerate(zip(boxes, texts)):
+            rectangle, text_item = self.rectangles[i], self.texts[i]
+
+            if self.drawn_coords[i] != coords:
+                script.append(f"{path} coords {rectangle} {' '.join(map(str, coords))}")
+                script.append(f"{path} coords {text_item} {coords[0]} {coords[1]}")
+                self.drawn_coords[i] = coords
+
+            if self.drawn_texts[i] != text:
+                script.append(
+                    f"{path} itemconfigure {text_item} -text {tcl_quote(text)}"
+                )
+                self.drawn_texts[i] = text
+
+            if i >= self.n_visible:
+                script.append(f"{path} itemconfigure {rectangle} -state normal")
+                script.append(f"{path} itemconfigure {text_item} -state normal")
+
+        for i in range(len(boxes), self.n_visible):
+            script.append(f"{path} itemconfigure {self.rectangles[i]} -state hidden")
+            script.append(f"{path} itemconfigure {self.texts[i]} -state hidden")
+
+        self.n_visible = len(boxes)
+        if len(script) > 0:
+            self.canvas.tk.eval("\n".join(script))
+
+    def draw_style(self, state: BoundingBoxCollectionState) -> None:
+        """
+        Apply the style to all items with a single call per item type.
+        """
+        style = state.style.values()
+        if style == self.drawn_style:
+            return
+        self.drawn_style = style
+
+        if len(self.rectangles) == 0:
+            return
+
+        self.canvas.itemconfig(
+            self.tag_rectangle,
+            outline=state.style.color.value,
+            width=state.style.width.value,
+        )
+        self.canvas.itemconfig(
+            self.tag_text,
+            fill=state.style.text_color.value,
+            font=(state.style.font_name.value, state.style.font_size.value),
+        )
+
+    def create_items(self, state: BoundingBoxCollectionState) -> None:
+        """
+        Grow the pool by a single (hidden) rectangle and text item.
+        """
+        rectangle = self.canvas.create_rectangle(
+            0,
+            0,
+            0,
+            0,
+            outline=state.style.color.value,
+            width=state.style.width.value,
+            state="hidden",
+            tags=(self.id, self.tag_rectangle),
+        )
+        text = self.canvas.create_text(
+            0,
+            0,
+            anchor="sw",
+            fill=state.style.text_color.value,
+            font=(state.style.font_name.value, state.style.font_size.value),
+            state="hidden",
+            tags=(self.id, self.tag_text),
+        )
+
+        self.index[rectangle] = self.index[text] = len(self.rectangles)
+        self.rectangles.append(rectangle)
+        self.texts.append(text)
+        self.drawn_coords.append(None)
+        self.drawn_texts.append(None)
+
+    def box_at(self, event: tk.Event) -> Optional[int]:
+        """
+        Get the index of the box the current event refers to.
+        """
+        current = self.canvas.find_withtag("current")
+        if len(current) == 0:
+            return None
+
+        index = self.index.get(current[0])
+        return index if index is not None and index < self.n_visible else None
+
+
+__all__ = [
+    "BoundingBoxCollection",
+    "BoundingBoxCollectionData",
+    "BoundingBoxCollectionState",
+    "BoundingBoxCollectionStyle",
+]
@@ -4,6 +4,7 @@ from typing import Optional
 from widget_state import HigherOrderState, IntState, StringState
 
 from ...decorator import stateful
+from ...decorator.visibility import VIEW_CHANGED
 
 
 class CanvasState(HigherOrderState):
@@ -32,6 +33,7 @@ class Canvas(tk.Canvas):
         self._state.width.value = int(self["width"])
         self._state.height.value = int(self["height"])
 
+        self._visible_region = None
         self.bind("<Configure>", self.on_resize)
 
     def on_resize(self, event):
@@ -43,6 +45,62 @@ class Canvas(tk.Canvas):
         self._state.height.value = event.height - 2 * (
             border_width + highlight_thickness
         )
+        self.view_changed()
+
+    def visible_region(self) -> tuple[float, float, float, float]:
+        """
+        Get the region (left, top, right, bottom) of the canvas that is visible.
+
+        The region is given in canvas coordinates and thus considers scrolling.
+        """
+        if self._visible_region is None:
+            self._visible_region = (
+                self.canvasx(0),
+                self.canvasy(0),
+                self.canvasx(self.winfo_width()),
+                self.canvasy(self.winfo_height()),
+            )
+        return self._visible_region
+
+    def view_changed(self) -> None:
+        """
+        Notify that the visible region changed, so that items skipped
+        because they were outside are drawn.
+        """
+        self._visible_region = None
+        self.event_generate(VIEW_CHANGED)
+
+    def xview(self, *args):
+        result = super().xview(*args)
+        if args:
+            self.view_changed()
+        return result
+
+    def yview(self, *args):
+        result = super().yview(*args)
+        if args:
+            self.view_changed()
+        return result
+
+    def xview_moveto(self, fraction):
+        super().xview_moveto(fraction)
+        self.view_changed()
+
+    def yview_moveto(self, fraction):
+        super().yview_moveto(fraction)
+        self.view_changed()
+
+    def xview_scroll(self, number, what):
+        super().xview_scroll(number, what)
+        self.view_changed()
+
+    def yview_scroll(self, number, what):
+        super().yview_scroll(number, what)
+        self.view_changed()
+
+    def scan_dragto(self, x, y, gain=10):
+        super().scan_dragto(x, y, gain)
+        self.view_changed()
 
     def draw(self, state):
         self.config(
@@ -67,9 +67,14 @@ class Circle(CanvasItem):
 
         self.id = None
 
+    def bounds(self, state: CircleState) -> tuple[float, float, float, float]:
+        left, top, right, bottom = state.data.ltbr()
+        margin = state.style.outline_width.value or 1
+        return (left - margin, top - margin, right + margin, bottom + margin)
+
     def draw(self, state: CircleState):
         if self.id is None:
-            self.id = self.canvas.create_oval(*state.data.ltbr())
+            self.id = self.acquire("oval", *state.data.ltbr())
 
         self.canvas.coords(self.id, *state.data.ltbr())
         self.canvas.itemconfig(
@@ -1,12 +1,14 @@
-from typing import Callable, Literal, Optional
+from typing import Any, Callable, Literal, Optional
+from uuid import uuid4 as uuid
 
 import tkinter as tk
 from widget_state import HigherOrderState, IntState
 
-from ...decorator import stateful
+from ...decorator import get_quality, stateful
+from ...decorator.governor import QUALITY_LOW
 from ...state import ContourState as ContourData
 
-from .lib import CanvasItem
+from .lib import CanvasItem, release_state
 from .line import Line, LineState, LineData, LineStyle
 from .rectangle import Rectangle, RectangleState, RectangleData, RectangleStyle
 
@@ -43,6 +45,14 @@ class ContourState(HigherOrderState):
 
 @stateful
 class Contour:
+    """
+    Draw a contour as lines between consecutive points and a rectangle per point.
+
+    On structural changes of the contour, lines and rectangles whose points
+    are unchanged are kept. Items that are no longer needed are rebound to
+    new segments or points before new ones are created, so that canvas items
+    and their bindings are reused.
+    """
 
     def __init__(self, canvas: tk.Canvas, state: ContourState):
         self.canvas = canvas
@@ -54,45 +64,86 @@ class Contour:
         self.bindings_rectangle = {}
         self.bindings_line = {}
 
-    def draw(self, state: ContourState):
-        self.clear()
+        # tag of all rectangles of this contour to keep them above its lines
+        self.tag_rectangle = f"contour_{uuid().hex}_rectangle"
+        self.rectangles_hidden = False
 
-        if len(state.data) == 0:
-            return
-
-        for start, end in zip(state.data, [*state.data[1:], state.data[0]]):
-            self.lines.append(
-                Line(
-                    self.canvas,
-                    LineState(
-                        data=LineData(start=start, end=end),
-                        style=state.style.line_style,
-                    ),
-                )
+    def draw(self, state: ContourState):
+        points = list(state.data)
+        segments = list(zip(points, [*points[1:], *points[:1]]))
+
+        lines = {
+            (id(line._state.data.start), id(line._state.data.end)): line
+            for line in self.lines
+        }
+        self.lines = [lines.pop((id(start), id(end)), None) for start, end in segments]
+        free_lines = list(lines.values())
+
+        rectangles = {id(rect._state.data.center): rect for rect in self.rectangles}
+        self.rectangles = [rectangles.pop(id(point), None) for point in points]
+        free_rectangles = list(rectangles.values())
+
+        created = False
+        for i, (start, end) in enumerate(segments):
+            if self.lines[i] is not None:
+                continue
+
+            line_state = LineState(
+                data=LineData(start=start, end=end),
+                style=state.style.line_style,
             )
-            for binding, callback in self.bindings_line.items():
-                self.lines[-1].tag_bind(binding, callback)
-
-        for point in state.data:
-            self.rectangles.append(
-                Rectangle(
-                    self.canvas,
-                    RectangleState(
-                        data=RectangleData(point, state.style.rectangle_size),
-                        style=state.style.rectangle_style,
-                    ),
-                )
+            if len(free_lines) > 0:
+                self.lines[i] = free_lines.pop()
+                release_state(self.lines[i]._state)
+                self.lines[i].rebind(line_state)
+                continue
+
+            self.lines[i] = Line(self.canvas, line_state)
+            for binding, (callback, options) in self.bindings_line.items():
+                self.lines[i].tag_bind(binding, callback, **options)
+            created = True
+
+        for i, point in enumerate(points):
+            if self.rectangles[i] is not None:
+                continue
+
+            rectangle_state = RectangleState(
+                data=RectangleData(point, state.style.rectangle_size),
+                style=state.style.rectangle_style,
+            )
+            if len(free_rectangles) > 0:
+                self.rectangles[i] = free_rectangles.pop()
+                release_state(self.rectangles[i]._state)
+                self.rectangles[i].rebind(rectangle_state)
+                continue
+
+            self.rectangles[i] = Rectangle(self.canvas, rectangle_state)
+            self.canvas.addtag_withtag(self.tag_rectangle, self.rectangles[i].id)
+            for binding, (callback, options) in self.bindings_rectangle.items():
+                self.rectangles[i].tag_bind(binding, callback, **options)
+            if self.rectangles_hidden:
+                self.canvas.itemconfig(self.rectangles[i].id, state="hidden")
+
+        for item in [*free_lines, *free_rectangles]:
+            item.delete()
+            release_state(item._state)
+
+        if created:
+            self.canvas.tag_raise(self.tag_rectangle)
+
+        # vertex handles are hidden if the governor reduces the quality to low
+        rectangles_hidden = get_quality() == QUALITY_LOW
+        if rectangles_hidden != self.rectangles_hidden:
+            self.rectangles_hidden = rectangles_hidden
+            self.canvas.itemconfig(
+                self.tag_rectangle, state="hidden" if rectangles_hidden else "normal"
             )
-            for binding, callback in self.bindings_rectangle.items():
-                self.rectangles[-1].tag_bind(binding, callback)
 
     def clear(self):
-        for line in self.lines:
-            line.delete()
+        for item in [*self.lines, *self.rectangles]:
+            item.delete()
+            release_state(item._state)
         self.lines.clear()
-
-        for rectangle in self.rectangles:
-            rectangle.delete()
         self.rectangles.clear()
 
     def tag_bind(
@@ -100,12 +151,20 @@ class Contour:
         binding: str,
         callback: Callable[[tk.Event, CanvasItem], None],
         _type: Literal["rectangle", "line"],
+        **options: Any,
     ) -> None:
+        """
+        Bind a callback to events of the rectangles or lines.
+
+        Options such as `compress` and `snap_to` are passed to `CanvasItem.tag_bind`.
+        """
         bindings = (
             self.bindings_rectangle if _type == "rectangle" else self.bindings_line
         )
-        bindings[binding] = callback
-        self.draw(self._state)
+        bindings[binding] = (callback, options)
+
+        for item in self.rectangles if _type == "rectangle" else self.lines:
+            item.tag_bind(binding, callback, **options)
 
     def delete(self):
         self.clear()
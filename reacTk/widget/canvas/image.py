@@ -1,10 +1,6 @@
-from typing import Optional
+from __future__ import annotations
 
-import cv2 as cv
-import numpy as np
-from numpy.typing import NDArray
-from PIL import ImageTk
-from PIL import Image as PILImage
+from typing import TYPE_CHECKING, Optional
 
 from widget_state import (
     BasicState,
@@ -15,13 +11,24 @@ from widget_state import (
     NumberState,
 )
 
-from ...state import PointState
-from ...decorator import stateful
+from ...state import PointState, remove_observer
+from ...decorator import get_quality, stateful
+from ...decorator.governor import QUALITY_HIGH
+from ...lazy import lazy_import
 from .canvas import Canvas
 from .lib import CanvasItem
 
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
 
-class ImageData(BasicState[NDArray]):
+# loaded on first draw to keep importing this module fast
+cv = lazy_import("cv2")
+ImageTk = lazy_import("PIL.ImageTk")
+PILImage = lazy_import("PIL.Image")
+
+
+class ImageData(BasicState["NDArray"]):
     """
     ImageData is just a reactive container for a numpy array of an image"
     """
@@ -123,6 +130,11 @@ class Image(CanvasItem):
 
         self.scale_x = self.scale_y = 1.0
 
+    def delete(self) -> None:
+        # remove the callback that fits the position to the canvas
+        remove_observer(self.canvas._state, self._state.style.position)
+        super().delete()
+
     def array(self):
         return self._state.data.value
 
@@ -161,13 +173,23 @@ class Image(CanvasItem):
     def draw(self, state: ImageState) -> None:
         self.scale_x, self.scale_y = self.compute_scales()
 
+        # nearest neighbour interpolation is faster if the governor reduces the quality
+        interpolation = (
+            cv.INTER_LINEAR if get_quality() >= QUALITY_HIGH else cv.INTER_NEAREST
+        )
         self.img_tk = img_to_tk(
-            cv.resize(state.data.value, None, fx=self.scale_x, fy=self.scale_y)
+            cv.resize(
+                state.data.value,
+                None,
+                fx=self.scale_x,
+                fy=self.scale_y,
+                interpolation=interpolation,
+            )
         )
 
         if self.id is None:
-            self.id = self.canvas.create_image(
-                *state.style.position.values(), image=self.img_tk
+            self.id = self.acquire(
+                "image", *state.style.position.values(), image=self.img_tk
             )
 
         self.canvas.coords(self.id, *state.style.position.values())
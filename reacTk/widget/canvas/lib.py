@@ -1,8 +1,62 @@
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Callable, Optional
 from typing_extensions import Self
 
 import tkinter as tk
-from widget_state import State
+from widget_state import HigherOrderState, State
+
+from ...state import detach
+from .pool import ItemPool
+
+if TYPE_CHECKING:
+    from .image import Image
+
+
+def release_state(state: HigherOrderState) -> None:
+    """
+    Detach a state created by a composite widget (e.g., the `LineState` of a
+    contour segment) and its data from the states it shares with others.
+    """
+    detach(state)
+    detach(state.data)
+
+
+class EventCompressor:
+    """
+    Compress events so that a handler is only called with the latest one.
+
+    Events are collected until Tk has processed all pending events and the
+    handler is then called once with the latest event. This way, a drag
+    applies a single position per frame instead of one per motion event.
+    """
+
+    def __init__(self, widget: tk.Misc, handler: Callable[[tk.Event], None]):
+        self.widget = widget
+        self.handler = handler
+        self.event: Optional[tk.Event] = None
+
+    def __call__(self, event: tk.Event) -> None:
+        if self.event is None:
+            self.widget.after_idle(self.flush)
+        self.event = event
+
+    def flush(self) -> None:
+        event, self.event = self.event, None
+        if event is not None:
+            self.handler(event)
+
+
+def snap_to_pixels(
+    handler: Callable[[tk.Event], None], image: "Image"
+) -> Callable[[tk.Event], None]:
+    """
+    Move the position of events to the center of the image pixel below it.
+    """
+
+    def _handler(event: tk.Event) -> None:
+        event.x, event.y = image.to_canvas(*image.to_image(event.x, event.y))
+        handler(event)
+
+    return _handler
 
 
 class CanvasItem:
@@ -10,15 +64,64 @@ class CanvasItem:
     def __init__(self, canvas: tk.Canvas, state: State):
         self.canvas = canvas
         self.widget = canvas
+        self.pool = ItemPool.of(canvas)
 
         self.bindings = []
 
-    def tag_bind(self, binding: str, callback: Callable[[tk.Event, Self], None]):
-        self.bindings.append(binding)
-        self.canvas.tag_bind(self.id, binding, lambda event: callback(event, self))
+    def acquire(self, kind: str, *coords: int | float, **options: Any) -> int:
+        """
+        Acquire a Tk item of the given kind from the item pool of the canvas.
+        """
+        return self.pool.acquire(kind, *coords, **options)
+
+    def bounds(self, state: State) -> Optional[tuple[float, float, float, float]]:
+        """
+        Compute the bounds (left, top, right, bottom) of the item for a state.
+
+        The bounds allow to skip draws of items outside the visible region
+        of the canvas. If None (the default), the item is always drawn.
+        """
+        return None
+
+    def tag_bind(
+        self,
+        binding: str,
+        callback: Callable[[tk.Event, Self], None],
+        compress: bool = False,
+        snap_to: Optional["Image"] = None,
+    ):
+        """
+        Bind a callback to events of the item.
+
+        Parameters
+        ----------
+        binding: str
+            the event sequence, e.g., "<B1-Motion>"
+        callback: callable
+            function called with the event and the item
+        compress: bool
+            if True, only the latest of the events pending in Tk is handled,
+            which is recommended for drag interactions with motion events
+        snap_to: Image, optional
+            snap the event position to the pixels of this image
+        """
+
+        def handler(event: tk.Event) -> None:
+            callback(event, self)
+
+        if snap_to is not None:
+            handler = snap_to_pixels(handler, snap_to)
+        if compress:
+            handler = EventCompressor(self.canvas, handler)
+
+        funcid = self.canvas.tag_bind(self.id, binding, handler)
+        self.bindings.append((binding, funcid))
 
     def delete(self):
-        for binding in self.bindings:
-            self.canvas.tag_unbind(self.id, binding)
+        for binding, funcid in self.bindings:
+            self.canvas.tag_unbind(self.id, binding, funcid)
+        self.bindings.clear()
 
-        self.canvas.delete(self.id)
+        if self.id is not None:
+            self.pool.release(self.id)
+        self.id = None
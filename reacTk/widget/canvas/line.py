@@ -50,10 +50,20 @@ class Line(CanvasItem):
 
         self.id = None
 
+    def bounds(self, state: LineState) -> tuple[float, float, float, float]:
+        (x1, y1), (x2, y2) = state.data.start.values(), state.data.end.values()
+        margin = state.style.width.value or 1
+        return (
+            min(x1, x2) - margin,
+            min(y1, y2) - margin,
+            max(x1, x2) + margin,
+            max(y1, y2) + margin,
+        )
+
     def draw(self, state: LineState):
         if self.id is None:
-            self.id = self.canvas.create_line(
-                *state.data.start.values(), *state.data.end.values()
+            self.id = self.acquire(
+                "line", *state.data.start.values(), *state.data.end.values()
             )
 
         self.canvas.coords(
@@ -0,0 +1,125 @@
+"""
+Pool of hidden canvas items.
+
+Creating and deleting Tk canvas items is comparatively expensive and
+item ids grow with every creation. Therefore, canvas items acquire their
+Tk items from a per-canvas pool and release them back to it instead of
+deleting them.
+"""
+
+from typing import Any
+import weakref
+
+import tkinter as tk
+
+KINDS = ("line", "rectangle", "oval", "text", "image")
+
+# tag given to released items in the pool
+POOL_TAG = "reacTk_pool"
+
+# options set on acquire and release instead of being reset to their defaults
+POOL_OPTIONS = ("state", "tags")
+
+
+class ItemPool:
+    """
+    Pool of hidden canvas items by type.
+
+    Acquiring an item behaves like creating it: the item is placed on top
+    of the display list with the given coordinates and options.
+    Releasing an item hides it, removes all of its tags and resets all
+    other options to their defaults, so that the next user does not
+    inherit them (and hidden items do not keep images alive).
+    """
+
+    _pools: weakref.WeakKeyDictionary[tk.Canvas, "ItemPool"] = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self, canvas: tk.Canvas, max_size: int = 1024):
+        self.canvas = canvas
+        self.max_size = max_size
+
+        self.items: dict[str, list[int]] = {kind: [] for kind in KINDS}
+        self.kinds: dict[int, str] = {}
+        self._defaults: dict[str, dict[str, Any]] = {}
+
+    @classmethod
+    def of(cls, canvas: tk.Canvas) -> "ItemPool":
+        """
+        Get the pool of a canvas.
+        """
+        if canvas not in cls._pools:
+            cls._pools[canvas] = cls(canvas)
+        return cls._pools[canvas]
+
+    def defaults(self, kind: str, _id: int) -> dict[str, Any]:
+        """
+        Get the default options of a kind of item - queried once from an item.
+        """
+        if kind not in self._defaults:
+            self._defaults[kind] = {
+                name: spec[3]
+                for name, spec in self.canvas.itemconfigure(_id).items()
+                if name not in POOL_OPTIONS
+            }
+        return self._defaults[kind]
+
+    def acquire(self, kind: str, *coords: int | float, **options: Any) -> int:
+        """
+        Get an item of the given kind - either from the pool or newly created.
+
+        Parameters
+        ----------
+        kind: str
+            one of "line", "rectangle", "oval", "text" or "image"
+        coords: int or float
+            coordinates of the item
+        options: any
+            item options as passed to `create_<kind>`
+
+        Returns
+        -------
+        int
+            the id of the item
+        """
+        assert kind in KINDS, f"Item kind {kind} is not in {KINDS}"
+
+        if len(self.items[kind]) == 0:
+            _id = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+        else:
+            _id = self.items[kind].pop()
+            self.canvas.coords(_id, *coords)
+            self.canvas.itemconfig(_id, **{"state": "normal", "tags": (), **options})
+            self.canvas.tag_raise(_id)
+
+        self.kinds[_id] = kind
+        return _id
+
+    def release(self, _id: int | str) -> None:
+        """
+        Return an item to the pool.
+
+        Items not acquired from the pool (e.g., tags) or items exceeding the
+        maximum size of the pool are deleted.
+        """
+        kind = self.kinds.pop(_id, None)
+        if kind is None or len(self.items[kind]) >= self.max_size:
+            self.canvas.delete(_id)
+            return
+
+        self.canvas.itemconfig(
+            _id, state="hidden", tags=(POOL_TAG,), **self.defaults(kind, _id)
+        )
+        self.items[kind].append(_id)
+
+    def clear(self) -> None:
+        """
+        Delete all pooled items.
+        """
+        self.canvas.delete(POOL_TAG)
+        for items in self.items.values():
+            items.clear()
+
+
+__all__ = ["ItemPool"]
@@ -0,0 +1,62 @@
+from typing import Optional
+
+import tkinter as tk
+
+from ...decorator import get_profiler
+
+
+class ProfilingOverlay:
+    """
+    Show the draw statistics of the most expensive widget classes on a canvas.
+
+    The overlay is refreshed periodically and shows nothing while profiling
+    is disabled (see `enable_profiling`). It is not a stateful widget so that
+    it does not show up in the statistics itself.
+    """
+
+    def __init__(
+        self,
+        canvas: tk.Canvas,
+        interval: int = 500,
+        rows: int = 5,
+        color: str = "yellow",
+    ):
+        self.canvas = canvas
+        self.interval = interval
+        self.rows = rows
+
+        self.id = self.canvas.create_text(
+            8, 8, anchor="nw", fill=color, font=("TkFixedFont",), text=""
+        )
+        self.after_id: Optional[str] = None
+        self.refresh()
+
+    def text(self) -> str:
+        profiler = get_profiler()
+        if profiler is None:
+            return ""
+
+        lines = [
+            f"{'widget':<16} {'draws':>7} {'coalesced':>9} {'total ms':>9} {'p95 ms':>7} {'wait ms':>8}"
+        ]
+        for name, stats in list(profiler.stats().items())[: self.rows]:
+            lines.append(
+                f"{name[:16]:<16} {stats['draws']:>7} {stats['coalesced']:>9}"
+                f" {stats['draw_ms']['total']:>9.1f} {stats['draw_ms']['p95']:>7.2f}"
+                f" {stats['queue_wait_ms']['p95']:>8.2f}"
+            )
+        return "\n".join(lines)
+
+    def refresh(self) -> None:
+        self.canvas.itemconfig(self.id, text=self.text())
+        self.canvas.tag_raise(self.id)
+        self.after_id = self.canvas.after(self.interval, self.refresh)
+
+    def delete(self) -> None:
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        self.canvas.delete(self.id)
+
+
+__all__ = ["ProfilingOverlay"]
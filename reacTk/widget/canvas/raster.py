@@ -0,0 +1,532 @@
+"""
+Rasterized layer for dense overlays.
+
+Instead of creating a Tk canvas item per primitive, the layer draws
+lines, rectangles, circles and texts into a NumPy buffer with OpenCV and
+displays the buffer as a single image item.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from widget_state import BoolState, HigherOrderState, ListState, State
+
+from ...decorator import get_quality, stateful
+from ...decorator.governor import QUALITY_HIGH
+from ...lazy import lazy_import
+from ...state import prepend_callback, remove_callback, weak_callback
+from .canvas import Canvas
+from .circle import CircleState
+from .image import Image
+from .lib import CanvasItem
+from .line import LineState
+from .rectangle import RectangleState
+from .text import TextState
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# loaded on first draw to keep importing this module fast
+cv = lazy_import("cv2")
+np = lazy_import("numpy")
+ImageTk = lazy_import("PIL.ImageTk")
+PILImage = lazy_import("PIL.Image")
+
+Primitive = LineState | RectangleState | CircleState | TextState
+Region = tuple[int, int, int, int]
+
+# if the dirty regions cover more than this fraction of the layer,
+# the whole layer is re-rasterized in one go
+FULL_REDRAW_RATIO = 0.5
+# the whole layer is also re-rasterized if more regions are dirty
+MAX_REGIONS = 256
+
+# size of the grid cells of the spatial index of primitives in pixels
+CELL_SIZE = 64
+# primitives covering more cells are not registered per cell
+MAX_CELLS = 256
+
+
+class RasterLayerStyle(HigherOrderState):
+    """
+    Style properties of a raster layer.
+
+    * antialias: If True (the default) primitives are drawn with anti-aliased edges.
+    """
+
+    def __init__(self, antialias: Optional[BoolState] = None):
+        super().__init__()
+
+        self.antialias = antialias if antialias is not None else BoolState(True)
+
+
+RasterLayerData = ListState
+
+
+class RasterLayerState(HigherOrderState):
+
+    def __init__(
+        self,
+        data: Optional[RasterLayerData] = None,
+        style: Optional[RasterLayerStyle] = None,
+    ):
+        super().__init__()
+
+        self.data = data if data is not None else RasterLayerData()
+        self.style = style if style is not None else RasterLayerStyle()
+
+
+def merge_regions(regions: list[Region]) -> list[Region]:
+    """
+    Merge overlapping regions so that no pixel is rasterized twice.
+
+    Parameters
+    ----------
+    regions: list of tuple
+        regions as (left, top, right, bottom) with exclusive right and bottom
+
+    Returns
+    -------
+    list of tuple
+    """
+    merged: list[Region] = []
+    for region in regions:
+        l1, t1, r1, b1 = region
+        i = 0
+        while i < len(merged):
+            l2, t2, r2, b2 = merged[i]
+            if l1 < r2 and l2 < r1 and t1 < b2 and t2 < b1:
+                # merge and restart since the grown region may overlap others
+                merged.pop(i)
+                l1, t1, r1, b1 = min(l1, l2), min(t1, t2), max(r1, r2), max(b1, b2)
+                i = 0
+                continue
+            i += 1
+        merged.append((l1, t1, r1, b1))
+    return merged
+
+
+def intersects(a: Region, b: Region) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class SpatialIndex:
+    """
+    Uniform grid of the bounds of primitives.
+
+    Each primitive is registered in the cells its bounds overlap. Thus, the
+    primitives intersecting a region are found by visiting the primitives
+    of the cells overlapping the region instead of all primitives.
+    Primitives covering more than `MAX_CELLS` cells (e.g., long lines far
+    outside of the canvas) are kept in a list visited by every query.
+    """
+
+    def __init__(self, cell_size: int = CELL_SIZE) -> None:
+        self.cell_size = cell_size
+        self.bounds: dict[int, Region] = {}
+        self.cells: dict[tuple[int, int], set[int]] = {}
+        self.large: set[int] = set()
+
+    def cell_range(self, region: Region) -> tuple[range, range]:
+        left, top, right, bottom = region
+        size = self.cell_size
+        return (
+            range(left // size, max(right - 1, left) // size + 1),
+            range(top // size, max(bottom - 1, top) // size + 1),
+        )
+
+    def cells_of(self, region: Region) -> Iterator[tuple[int, int]]:
+        columns, rows = self.cell_range(region)
+        for column in columns:
+            for row in rows:
+                yield column, row
+
+    def is_large(self, region: Region) -> bool:
+        columns, rows = self.cell_range(region)
+        return len(columns) * len(rows) > MAX_CELLS
+
+    def insert(self, _id: int, bounds: Region) -> None:
+        self.remove(_id)
+        self.bounds[_id] = bounds
+        if self.is_large(bounds):
+            self.large.add(_id)
+            return
+
+        for cell in self.cells_of(bounds):
+            self.cells.setdefault(cell, set()).add(_id)
+
+    def remove(self, _id: int) -> Optional[Region]:
+        """
+        Remove a primitive and return its bounds.
+        """
+        bounds = self.bounds.pop(_id, None)
+        if bounds is None or _id in self.large:
+            self.large.discard(_id)
+            return bounds
+
+        for cell in self.cells_of(bounds):
+            ids = self.cells[cell]
+            ids.discard(_id)
+            if len(ids) == 0:
+                del self.cells[cell]
+        return bounds
+
+    def query(self, region: Region) -> set[int]:
+        """
+        Get the ids of all primitives whose bounds intersect a region.
+        """
+        candidates = set(self.large)
+        if len(self.cells) > 0 and not self.is_large(region):
+            for cell in self.cells_of(region):
+                candidates.update(self.cells.get(cell, ()))
+        elif len(self.cells) > 0:
+            # visiting all registered cells is cheaper than the covered ones
+            for ids in self.cells.values():
+                candidates.update(ids)
+        return {_id for _id in candidates if intersects(self.bounds[_id], region)}
+
+    def clear(self) -> None:
+        self.bounds.clear()
+        self.cells.clear()
+        self.large.clear()
+
+
+def font_scale(state: TextState) -> float:
+    """
+    Approximate the Tk font size with the scale of an OpenCV Hershey font.
+    """
+    return (state.style.font_size.value or 12) / 16
+
+
+@stateful
+class RasterLayer(CanvasItem):
+    """
+    Draw many primitives into a single image item.
+
+    The layer covers the whole canvas and takes primitive states
+    (`LineState`, `RectangleState`, `CircleState` and `TextState`) in
+    canvas coordinates. On changes, only the bounding regions of the
+    changed primitives are re-rasterized and copied into the displayed image.
+
+    Note: Text is approximated with an OpenCV Hershey font and its angle as well
+    as the dash pattern of lines are ignored.
+    """
+
+    def __init__(
+        self, canvas: Canvas, state: RasterLayerState, image: Optional[Image] = None
+    ):
+        super().__init__(canvas, state)
+
+        self.image = image
+        self.id = None
+        self.img_tk = None
+
+        self.buffer: Optional[NDArray[np.uint8]] = None
+        self.antialias: Optional[bool] = None
+        self.colors: dict[str, tuple[int, int, int, int]] = {}
+
+        self.primitives: dict[int, Primitive] = {}
+        # drawing order of the primitives - later ones are drawn on top
+        self.order: dict[int, int] = {}
+        self.index = SpatialIndex()
+        self.dirty: set[int] = set()
+        self.dirty_lock = threading.Lock()
+
+        # the list of primitives is only compared with the tracked ones if it changed
+        self.data: Optional[RasterLayerData] = None
+        self.data_changed = True
+
+        # state callbacks only reference the layer weakly
+        self.on_resize_callback = weak_callback(self.on_resize)
+        self.on_primitive_change_callback = weak_callback(self.on_primitive_change)
+        self.on_data_change_callback = weak_callback(self.on_data_change)
+        self.canvas._state.on_change(self.on_resize_callback)
+
+    def on_resize(self, state: State) -> None:
+        if self.buffer is None:
+            return
+
+        height, width = self.buffer.shape[:2]
+        if (width, height) != (state.width.value, state.height.value):
+            self._state.notify_change()
+
+    def on_primitive_change(self, primitive: Primitive) -> None:
+        with self.dirty_lock:
+            self.dirty.add(id(primitive))
+        self._state.notify_change()
+
+    def on_data_change(self, data: RasterLayerData) -> None:
+        with self.dirty_lock:
+            self.data_changed = True
+
+    def draw(self, state: RasterLayerState) -> None:
+        width = max(self.canvas._state.width.value or 1, 1)
+        height = max(self.canvas._state.height.value or 1, 1)
+
+        regions = self.update_primitives(state)
+
+        with self.dirty_lock:
+            dirty, self.dirty = self.dirty, set()
+
+        # anti-aliasing is disabled if the governor reduces the quality
+        antialias = state.style.antialias.value and get_quality() >= QUALITY_HIGH
+
+        full = (
+            self.buffer is None
+            or self.buffer.shape[:2] != (height, width)
+            or self.antialias != antialias
+        )
+        if full:
+            self.buffer = np.zeros((height, width, 4), dtype=np.uint8)
+            self.antialias = antialias
+
+        for _id in dirty:
+            if _id not in self.primitives:
+                continue
+
+            bounds = self.index.remove(_id)
+            if bounds is not None:
+                regions.append(bounds)
+            bounds = self.compute_bounds(self.primitives[_id])
+            self.index.insert(_id, bounds)
+            regions.append(bounds)
+
+        # merging is quadratic in the number of regions, which is skipped
+        # if the layer is redrawn anyway
+        full = full or len(regions) > MAX_REGIONS
+        if not full:
+            regions = [self.clip(region) for region in regions]
+            regions = [r for r in regions if r[0] < r[2] and r[1] < r[3]]
+            regions = merge_regions(regions)
+            area = sum((r[2] - r[0]) * (r[3] - r[1]) for r in regions)
+            full = area > FULL_REDRAW_RATIO * width * height
+        if full:
+            self.rasterize((0, 0, width, height))
+            self.img_tk = ImageTk.PhotoImage(PILImage.fromarray(self.buffer))
+        else:
+            for region in regions:
+                self.rasterize(region)
+                self.copy_to_photo(region)
+
+        if self.id is None:
+            self.id = self.acquire("image", 0, 0, anchor="nw", image=self.img_tk)
+            if self.image is not None and self.image.id is not None:
+                self.canvas.tag_raise(self.id, self.image.id)
+        elif full:
+            self.canvas.itemconfig(self.id, image=self.img_tk)
+
+    def update_primitives(self, state: RasterLayerState) -> list[Region]:
+        """
+        Track added and removed primitives.
+
+        The list of primitives is only compared with the tracked primitives
+        if it changed. Added primitives are observed for changes and
+        inserted into the spatial index. The regions of added and removed
+        primitives are returned so that they are drawn or cleared.
+        """
+        if state.data is not self.data:
+            if self.data is not None:
+                remove_callback(self.data, self.on_data_change_callback)
+            self.data = state.data
+            # the change is recorded before the layer is drawn because of it
+            prepend_callback(self.data, self.on_data_change_callback)
+            self.data_changed = True
+
+        with self.dirty_lock:
+            data_changed, self.data_changed = self.data_changed, False
+        if not data_changed:
+            return []
+
+        regions = []
+        current = {id(primitive): primitive for primitive in state.data}
+
+        for _id in self.primitives.keys() - current.keys():
+            remove_callback(self.primitives.pop(_id), self.on_primitive_change_callback)
+            bounds = self.index.remove(_id)
+            if bounds is not None:
+                regions.append(bounds)
+
+        for _id in current.keys() - self.primitives.keys():
+            self.primitives[_id] = current[_id]
+            self.primitives[_id].on_change(self.on_primitive_change_callback)
+            bounds = self.compute_bounds(current[_id])
+            self.index.insert(_id, bounds)
+            regions.append(bounds)
+
+        self.order = {_id: i for i, _id in enumerate(current)}
+        return regions
+
+    def delete(self) -> None:
+        remove_callback(self.canvas._state, self.on_resize_callback)
+        if self.data is not None:
+            remove_callback(self.data, self.on_data_change_callback)
+            self.data = None
+        for primitive in self.primitives.values():
+            remove_callback(primitive, self.on_primitive_change_callback)
+        self.primitives.clear()
+        self.order.clear()
+        self.index.clear()
+
+        super().delete()
+
+    def clip(self, region: Region) -> Region:
+        height, width = self.buffer.shape[:2]
+        left, top, right, bottom = region
+        return (
+            min(max(left, 0), width),
+            min(max(top, 0), height),
+            min(max(right, 0), width),
+            min(max(bottom, 0), height),
+        )
+
+    def rasterize(self, region: Region) -> None:
+        """
+        Clear a region of the buffer and draw all primitives intersecting it.
+        """
+        left, top, right, bottom = region
+        roi = np.zeros((bottom - top, right - left, 4), dtype=np.uint8)
+        for _id in sorted(self.index.query(region), key=self.order.__getitem__):
+            self.draw_primitive(roi, self.primitives[_id], (left, top))
+        self.buffer[top:bottom, left:right] = roi
+
+    def copy_to_photo(self, region: Region) -> None:
+        """
+        Copy a region of the buffer into the displayed image.
+
+        Copying is done by Tk, so that only the pixels of the region
+        have to be converted.
+        """
+        left, top, right, bottom = region
+        patch = ImageTk.PhotoImage(
+            PILImage.fromarray(self.buffer[top:bottom, left:right])
+        )
+        self.canvas.tk.call(
+            str(self.img_tk),
+            "copy",
+            str(patch),
+            "-to",
+            left,
+            top,
+            "-compositingrule",
+            "set",
+        )
+
+    def color(self, color: Optional[str]) -> Optional[tuple[int, int, int, int]]:
+        if color is None or color == "":
+            return None
+
+        if color not in self.colors:
+            r, g, b = self.canvas.winfo_rgb(color)
+            self.colors[color] = (r >> 8, g >> 8, b >> 8, 255)
+        return self.colors[color]
+
+    def compute_bounds(self, primitive: Primitive) -> Region:
+        """
+        Compute the region (left, top, right, bottom) covered by a primitive.
+        """
+        if isinstance(primitive, LineState):
+            x1, y1 = primitive.data.start.values()
+            x2, y2 = primitive.data.end.values()
+            ltrb = [min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)]
+            margin = (primitive.style.width.value or 1) // 2 + 2
+        elif isinstance(primitive, (RectangleState, CircleState)):
+            ltrb = primitive.data.ltbr()
+            margin = (primitive.style.outline_width.value or 1) // 2 + 2
+        elif isinstance(primitive, TextState):
+            ltrb = self.text_bounds(primitive)
+            margin = 2
+        else:
+            raise TypeError(f"Cannot rasterize {primitive.__class__.__name__}")
+
+        left, top, right, bottom = map(round, ltrb)
+        return (left - margin, top - margin, right + margin + 1, bottom + margin + 1)
+
+    def text_size(self, state: TextState) -> tuple[int, int, int]:
+        """
+        Compute the width, height and baseline of a text drawn with OpenCV.
+        """
+        (width, height), baseline = cv.getTextSize(
+            state.data.text.value or "", cv.FONT_HERSHEY_SIMPLEX, font_scale(state), 1
+        )
+        return width, height + baseline, baseline
+
+    def text_bounds(self, state: TextState) -> list[int]:
+        width, height, _ = self.text_size(state)
+
+        x, y = state.data.position.values()
+        anchor = state.style.anchor.value or "center"
+        left = x if "w" in anchor else x - width if "e" in anchor else x - width // 2
+        top = y if "n" in anchor else y - height if "s" in anchor else y - height // 2
+        return [left, top, left + width, top + height]
+
+    def draw_primitive(
+        self, roi: NDArray[np.uint8], primitive: Primitive, offset: tuple[int, int]
+    ) -> None:
+        """
+        Draw a primitive into a region of interest which starts at `offset`.
+        """
+        ox, oy = offset
+        line_type = cv.LINE_AA if self.antialias else cv.LINE_8
+
+        if isinstance(primitive, LineState):
+            x1, y1 = primitive.data.start.values()
+            x2, y2 = primitive.data.end.values()
+            color = self.color(primitive.style.color.value) or (0, 0, 0, 255)
+            cv.line(
+                roi,
+                (round(x1) - ox, round(y1) - oy),
+                (round(x2) - ox, round(y2) - oy),
+                color,
+                thickness=max(primitive.style.width.value or 1, 1),
+                lineType=line_type,
+            )
+        elif isinstance(primitive, RectangleState):
+            left, top, right, bottom = map(round, primitive.data.ltbr())
+            pt1, pt2 = (left - ox, top - oy), (right - ox, bottom - oy)
+            fill = self.color(primitive.style.color.value)
+            if fill is not None:
+                cv.rectangle(roi, pt1, pt2, fill, thickness=-1, lineType=line_type)
+
+            width = primitive.style.outline_width.value
+            width = 1 if width is None else width
+            if width > 0:
+                outline = self.color(primitive.style.outline_color.value)
+                outline = outline or (0, 0, 0, 255)
+                cv.rectangle(roi, pt1, pt2, outline, width, lineType=line_type)
+        elif isinstance(primitive, CircleState):
+            cx, cy = primitive.data.center.values()
+            center = (round(cx) - ox, round(cy) - oy)
+            radius = round(primitive.data.radius.value)
+            fill = self.color(primitive.style.color.value)
+            if fill is not None:
+                cv.circle(roi, center, radius, fill, thickness=-1, lineType=line_type)
+
+            width = primitive.style.outline_width.value
+            width = 1 if width is None else width
+            if width > 0:
+                outline = self.color(primitive.style.outline_color.value)
+                outline = outline or (0, 0, 0, 255)
+                cv.circle(roi, center, radius, outline, width, lineType=line_type)
+        elif isinstance(primitive, TextState):
+            left, _, _, bottom = self.text_bounds(primitive)
+            _, _, baseline = self.text_size(primitive)
+            cv.putText(
+                roi,
+                primitive.data.text.value or "",
+                (round(left) - ox, round(bottom - baseline) - oy),
+                cv.FONT_HERSHEY_SIMPLEX,
+                font_scale(primitive),
+                self.color(primitive.style.color.value) or (0, 0, 0, 255),
+                1,
+                line_type,
+            )
+
+
+__all__ = [
+    "RasterLayer",
+    "RasterLayerData",
+    "RasterLayerState",
+    "RasterLayerStyle",
+]
@@ -66,9 +66,14 @@ class Rectangle(CanvasItem):
 
         self.id = None
 
+    def bounds(self, state: RectangleState) -> tuple[float, float, float, float]:
+        left, top, right, bottom = state.data.ltbr()
+        margin = state.style.outline_width.value or 1
+        return (left - margin, top - margin, right + margin, bottom + margin)
+
     def draw(self, state: RectangleState):
         if self.id is None:
-            self.id = self.canvas.create_rectangle(*state.data.ltbr())
+            self.id = self.acquire("rectangle", *state.data.ltbr())
 
         self.canvas.coords(self.id, *state.data.ltbr())
         self.canvas.itemconfig(
@@ -58,7 +58,7 @@ class Text(CanvasItem):
 
     def draw(self, state: TextState):
         if self.id is None:
-            self.id = self.canvas.create_text(*state.data.position.values())
+            self.id = self.acquire("text", *state.data.position.values())
 
         self.canvas.coords(self.id, *state.data.position.values())
         self.canvas.itemconfig(
@@ -5,8 +5,10 @@ that the asynchron methods have started/finished.
 This is usually achieved by acquiring/releasing locks.
 """
 
+import gc
 import time
 import threading
+import weakref
 
 from reacTk.decorator import async_once
 
@@ -63,11 +65,14 @@ def test_async_on_instance_method():
 
     with instance_a.lock:
         instance_a.increment()
-        instance_b.increment()
+        future_b = instance_b.increment()
 
         with instance_a.exec_lock:
             pass
 
+        # instance_b is not blocked by the running call of instance_a
+        future_b.result(timeout=1.0)
+
         # curent_call: threading.Thread = instance_a.increment.__async_data_map[instance_a].current_call
         # print(f"Current_call {curent_call.is_alive()=}")
 
@@ -75,5 +80,110 @@ def test_async_on_instance_method():
         assert instance_b.value == 11
 
 
+def test_async_once_future():
+    lock = threading.Lock()
+    started = threading.Event()
+
+    @async_once
+    def square(x):
+        started.set()
+        with lock:
+            return x * x
+
+    with lock:
+        future_running = square(2)
+        started.wait(timeout=1.0)
+
+        future_superseded = square(3)
+        future_pending = square(4)
+
+    assert future_running.result(timeout=1.0) == 4
+    assert future_pending.result(timeout=1.0) == 16
+    assert future_superseded.cancelled()
+
+
+def test_async_once_cancel_pending():
+    lock = threading.Lock()
+    started = threading.Event()
+    executions = []
+
+    @async_once
+    def append(x):
+        started.set()
+        executions.append(x)
+        with lock:
+            pass
+
+    with lock:
+        future_running = append(1)
+        started.wait(timeout=1.0)
+
+        future_pending = append(2)
+        assert future_pending.cancel()
+
+    future_running.result(timeout=1.0)
+    assert append(3).result(timeout=1.0) is None
+    assert executions == [1, 3]
+
+
+def test_async_once_thread_count():
+    executing = threading.Event()
+
+    @async_once
+    def noop(i):
+        executing.set()
+        time.sleep(0.001)
+
+    n_threads = threading.active_count()
+    futures = [noop(i) for i in range(500)]
+    futures[-1].result(timeout=1.0)
+
+    # superseded calls were cancelled and no thread was spawned per call
+    assert sum(future.cancelled() for future in futures) > 0
+    assert threading.active_count() - n_threads <= 2
+
+
+class BlockingProcessor:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = threading.Event()
+
+    @async_once
+    def process(self):
+        self.started.set()
+        with self.lock:
+            pass
+
+
+def test_async_once_registry():
+    instance = BlockingProcessor()
+    calls = instance.process.calls
+
+    with instance.lock:
+        future_running = instance.process()
+        instance.started.wait(timeout=1.0)
+        future_pending = instance.process()
+
+        assert calls.running(instance) is future_running
+        assert calls.pending(instance) is future_pending
+        assert calls.instances() == [instance]
+
+    future_pending.result(timeout=1.0)
+
+    # entries are removed once all calls are finished
+    deadline = time.time() + 1.0
+    while len(calls) > 0 and time.time() < deadline:
+        time.sleep(0.001)
+    assert len(calls) == 0
+    assert calls.running(instance) is None
+
+    # the registry does not keep instances alive
+    instance_ref = weakref.ref(instance)
+    del instance, future_running, future_pending
+    gc.collect()
+    assert instance_ref() is None
+
+
 if __name__ == "__main__":
     test_async_on_instance_method()
@@ -0,0 +1,50 @@
+"""
+Tests for batch updates.
+Stateful widgets require a display, so the deferral is tested with
+objects providing the attributes used by `stateful`.
+"""
+
+import threading
+
+from reacTk.decorator import batch_update
+from reacTk.decorator.batch import defer, is_batching
+
+
+class Widget:
+
+    def __init__(self):
+        self._state = None
+        self._stateful_callback = lambda state: None
+        self.draws = 0
+
+    def _stateful_notify(self):
+        self.draws += 1
+
+
+def test_batch_update():
+    widget_a = Widget()
+    widget_b = Widget()
+
+    with batch_update():
+        with batch_update():
+            for _ in range(10):
+                defer(widget_a)
+                defer(widget_b)
+
+        # nested contexts do not flush
+        assert widget_a.draws == 0
+
+    assert widget_a.draws == 1
+    assert widget_b.draws == 1
+    assert not is_batching()
+
+
+def test_batch_update_per_thread():
+    batching = []
+
+    with batch_update():
+        thread = threading.Thread(target=lambda: batching.append(is_batching()))
+        thread.start()
+        thread.join()
+
+    assert batching == [False]
@@ -0,0 +1,80 @@
+"""
+Tests for the asyncio integration of the decorators.
+Coroutines are executed by a shared event loop on a background thread.
+"""
+
+import asyncio
+import threading
+
+from widget_state import IntState
+
+from reacTk.decorator import (
+    async_once,
+    feed,
+    get_event_loop_thread,
+    recurrency_filter,
+)
+
+
+def test_async_once_coroutine():
+    started = threading.Event()
+    release = asyncio.Event()
+    loop_threads = set()
+
+    @async_once
+    async def process(value):
+        loop_threads.add(threading.current_thread())
+        started.set()
+        if value == 0:
+            await release.wait()
+        return value
+
+    future_a = process(0)
+    assert started.wait(timeout=1.0)
+    futures = [process(i) for i in range(1, 10)]
+    get_event_loop_thread().get_loop().call_soon_threadsafe(release.set)
+
+    # only the latest call is executed after the running one
+    assert future_a.result(timeout=1.0) == 0
+    assert futures[-1].result(timeout=1.0) == 9
+    assert all(future.cancelled() for future in futures[:-1])
+    assert len(loop_threads) == 1
+
+
+def test_feed():
+    state = IntState(0)
+    values = []
+    state.on_change(lambda state: values.append(state.value))
+
+    async def source():
+        for i in range(1, 4):
+            await asyncio.sleep(0.01)
+            yield i
+
+    # many feeds share the event loop thread
+    thread_count = threading.active_count()
+    futures = [feed(IntState(0), source()) for _ in range(20)]
+    futures.append(feed(state, source()))
+    assert threading.active_count() <= thread_count + 1
+
+    for future in futures:
+        future.result(timeout=1.0)
+    assert values == [1, 2, 3]
+
+
+def test_recurrency_filter_coroutine():
+    done = threading.Event()
+    calls = []
+
+    @recurrency_filter(0.1)
+    async def throttled(value):
+        calls.append(value)
+        done.set()
+
+    for i in range(10):
+        throttled(i)
+
+    assert done.wait(timeout=1.0)
+    done.clear()
+    assert done.wait(timeout=1.0)
+    assert calls == [0, 9]
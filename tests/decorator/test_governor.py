@@ -0,0 +1,136 @@
+"""
+Tests for the frame-rate governor.
+Frames require a running Tk mainloop. Thus, the adaption is tested with
+simulated frame durations and frames are executed by calling them directly.
+"""
+
+import threading
+
+import tkinter as tk
+
+from reacTk.decorator.governor import (
+    FRAME_EVENT,
+    QUALITY_HIGH,
+    QUALITY_LOW,
+    QUALITY_MEDIUM,
+    Governor,
+    get_quality,
+)
+
+from ..widget.fake_canvas import FakeCanvas
+
+
+class FakeWidget:
+
+    def __init__(self, canvas):
+        self.widget = canvas
+        self._state = object()
+        self._stateful_callback = lambda state: None
+        self.draws = 0
+        self.unsubscribed = False
+
+    def draw(self, state):
+        self.draws += 1
+
+    def unsubscribe(self):
+        self.unsubscribed = True
+        self._stateful_callback = None
+
+
+def test_quality_steps_down():
+    governor = Governor(fps=50.0)
+
+    governor.adapt(2 * governor.budget())
+    assert governor.quality == QUALITY_MEDIUM
+
+    for _ in range(5):
+        governor.adapt(2 * governor.budget())
+    assert governor.quality == QUALITY_LOW
+
+
+def test_quality_steps_up_with_headroom():
+    governor = Governor(fps=50.0, step_up_frames=3)
+    governor.quality = QUALITY_LOW
+
+    # frames within the budget, but without headroom, keep the quality
+    for _ in range(10):
+        assert not governor.adapt(0.9 * governor.budget())
+    assert governor.quality == QUALITY_LOW
+
+    increased = [governor.adapt(0.1 * governor.budget()) for _ in range(3)]
+    assert increased == [False, False, True]
+    assert governor.quality == QUALITY_MEDIUM
+
+
+def test_disabled_by_default():
+    governor = Governor()
+    assert not governor.enabled
+
+    # widgets always draw with high quality if the governor is disabled
+    assert get_quality() == QUALITY_HIGH
+
+
+def test_requests_are_batched_into_frames():
+    governor = Governor()
+    canvas = FakeCanvas()
+    first, second = FakeWidget(canvas), FakeWidget(canvas)
+
+    for _ in range(5):
+        governor.request(first, canvas)
+    governor.request(second, canvas)
+
+    # a single frame is scheduled and each dirty widget is drawn once
+    assert canvas.events == [FRAME_EVENT]
+    governor.frame()
+    assert (first.draws, second.draws) == (1, 1)
+    assert len(governor.dirty) == 0
+
+    governor.request(first, canvas)
+    assert canvas.events == [FRAME_EVENT, FRAME_EVENT]
+    governor.frame()
+    assert (first.draws, second.draws) == (2, 1)
+
+
+def test_frames_skip_unsubscribed_widgets():
+    governor = Governor()
+    canvas = FakeCanvas()
+    widget = FakeWidget(canvas)
+
+    governor.request(widget, canvas)
+    widget.unsubscribe()
+    governor.frame()
+    assert widget.draws == 0
+
+
+def test_destroyed_widgets_are_unsubscribed():
+    class DestroyedCanvas(FakeCanvas):
+        def event_generate(self, sequence, **kwargs):
+            raise tk.TclError("bad window path name")
+
+    governor = Governor()
+    canvas = DestroyedCanvas()
+    widget = FakeWidget(canvas)
+
+    governor.request(widget, canvas)
+    assert widget.unsubscribed
+    assert len(governor.dirty) == 0
+    assert not governor.scheduled
+
+
+def test_roots_are_bound_once():
+    governor = Governor()
+    canvas = FakeCanvas()
+    widgets = [FakeWidget(canvas) for _ in range(8)]
+
+    threads = [
+        threading.Thread(target=governor.request, args=(widget, canvas))
+        for widget in widgets
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert canvas.bindings == [(FRAME_EVENT, governor.on_frame_event)]
+    governor.frame()
+    assert all(widget.draws == 1 for widget in widgets)
@@ -0,0 +1,102 @@
+"""
+Tests for the process decorator.
+Decorated functions are executed in other processes and must thus
+be defined at module level.
+"""
+
+from concurrent.futures import Future
+import threading
+import time
+
+import numpy as np
+import pytest
+from widget_state import IntState
+
+from reacTk.decorator import process_once
+from reacTk.decorator.process import to_state
+from reacTk.state import ContourState, PointState
+
+from ..widget.fake_canvas import FakeCanvas
+
+
+@process_once
+def invert(image):
+    return 255 - image
+
+
+@process_once
+def shape(image, delay=0.0):
+    time.sleep(delay)
+    return image.shape
+
+
+@process_once
+def square(size):
+    return np.array([[0, 0], [size, 0], [size, size], [0, size]])
+
+
+def test_process_once_shared_memory():
+    image = np.random.randint(0, 256, size=(512, 512, 3), dtype=np.uint8)
+
+    result = invert(image).result(timeout=30.0)
+
+    assert result.dtype == np.uint8
+    assert np.array_equal(result, 255 - image)
+
+
+def test_process_once_latest_call_wins():
+    images = [np.zeros((i + 1, 4)) for i in range(10)]
+
+    # the first call is delayed so that the others are issued while it is running
+    futures = [shape(images[0], delay=0.5)]
+    futures.extend(shape(image) for image in images[1:])
+
+    assert futures[0].result(timeout=30.0) == (1, 4)
+    assert futures[-1].result(timeout=30.0) == (10, 4)
+    assert all(future.cancelled() for future in futures[1:-1])
+
+
+def test_to_state_updates_on_tk_thread():
+    canvas = FakeCanvas()
+    state = IntState(0)
+    futures = [Future() for _ in range(3)]
+    for future in futures:
+        to_state(future, state, canvas)
+    assert len(canvas.afters) == 1
+
+    # futures are finished by other threads, which must not call Tk
+    finish = threading.Thread(target=futures[0].set_result, args=(1,))
+    finish.start()
+    finish.join()
+    futures[1].cancel()
+    assert len(canvas.afters) == 1
+    assert state.value == 0
+
+    # the Tk thread polls the results until all futures are done
+    canvas.afters.pop()()
+    assert state.value == 1
+    assert len(canvas.afters) == 1
+
+    futures[2].set_result(2)
+    canvas.afters.pop()()
+    assert state.value == 2
+    assert len(canvas.afters) == 0
+
+
+def test_to_state_sets_arrays_to_contours():
+    canvas = FakeCanvas()
+    contour = ContourState([PointState(0, 0)])
+    future = square(5)
+    to_state(future, contour, canvas)
+
+    future.result(timeout=30.0)
+    # the result is queued by a done-callback, which may still be running
+    deadline = time.perf_counter() + 5.0
+    while len(canvas.afters) > 0 and time.perf_counter() < deadline:
+        canvas.afters.pop()()
+        time.sleep(0.01)
+    assert contour.to_numpy().tolist() == [[0, 0], [5, 0], [5, 5], [0, 5]]
+
+    # states that cannot be set from arrays require an update function
+    with pytest.raises(TypeError):
+        to_state(Future(), PointState(0, 0), canvas)
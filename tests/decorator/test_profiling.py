@@ -0,0 +1,42 @@
+"""
+Tests for the draw profiler.
+Stateful widgets require a display, so the profiler is fed directly.
+"""
+
+from reacTk.decorator import disable_profiling, enable_profiling, get_profiler
+
+
+class Widget:
+
+    def __init__(self):
+        self.draws = 0
+
+    def draw(self, state):
+        self.draws += 1
+
+
+def test_profiler_stats():
+    profiler = enable_profiling()
+    widget_a = Widget()
+    widget_b = Widget()
+
+    for _ in range(3):
+        profiler.change(widget_a)
+    profiler.draw(widget_a, None)
+    profiler.change(widget_b)
+    profiler.draw(widget_b, None)
+
+    stats = profiler.stats()["Widget"]
+    assert stats["changes"] == 4
+    assert stats["draws"] == 2
+    assert stats["coalesced"] == 2
+    assert widget_a.draws == 1
+
+    instance_stats = dict(
+        (id(widget), stats) for widget, stats in profiler.instance_stats()
+    )
+    assert instance_stats[id(widget_a)]["coalesced"] == 2
+    assert instance_stats[id(widget_b)]["coalesced"] == 0
+
+    disable_profiling()
+    assert get_profiler() is None
@@ -0,0 +1,130 @@
+"""
+Tests for the recurrency filter decorator.
+Calls are filtered by time. Thus, intervals are chosen large in comparison
+to the time required to issue calls and results are awaited generously.
+"""
+
+import threading
+import time
+
+from reacTk.decorator import recurrency_filter
+
+INTERVAL = 0.1
+
+
+class Recorder:
+
+    def __init__(self):
+        self.calls = []
+        self.event = threading.Event()
+
+    def record(self, value):
+        self.calls.append(value)
+        self.event.set()
+
+
+def test_throttle():
+    recorder = Recorder()
+
+    @recurrency_filter(INTERVAL)
+    def throttled(value):
+        recorder.record(value)
+
+    for i in range(10):
+        throttled(i)
+
+    # the first call is executed immediately and the latest one after the interval
+    assert recorder.calls == [0]
+    recorder.event.clear()
+    assert recorder.event.wait(timeout=1.0)
+    assert recorder.calls == [0, 9]
+
+
+def test_leading():
+    recorder = Recorder()
+
+    @recurrency_filter(INTERVAL, mode="leading")
+    def leading(value):
+        recorder.record(value)
+
+    for i in range(10):
+        leading(i)
+    time.sleep(2 * INTERVAL)
+
+    assert recorder.calls == [0]
+
+
+def test_trailing():
+    recorder = Recorder()
+
+    @recurrency_filter(INTERVAL, mode="trailing")
+    def trailing(value):
+        recorder.record(value)
+
+    for i in range(10):
+        trailing(i)
+    assert recorder.calls == []
+
+    assert recorder.event.wait(timeout=1.0)
+    assert recorder.calls == [9]
+
+
+def test_debounce():
+    recorder = Recorder()
+
+    @recurrency_filter(INTERVAL, mode="debounce")
+    def debounced(value):
+        recorder.record(value)
+
+    start = time.monotonic()
+    for i in range(5):
+        debounced(i)
+        time.sleep(INTERVAL / 4)
+
+    assert recorder.event.wait(timeout=1.0)
+    assert recorder.calls == [4]
+    assert time.monotonic() - start >= INTERVAL + 4 * INTERVAL / 4
+
+
+class Widget:
+
+    def __init__(self):
+        self.recorder = Recorder()
+
+    @recurrency_filter(INTERVAL)
+    def update(self, value):
+        self.recorder.record(value)
+
+
+def test_per_instance():
+    widget_a = Widget()
+    widget_b = Widget()
+
+    widget_a.update(1)
+    widget_b.update(2)
+
+    # instances do not throttle each other
+    assert widget_a.recorder.calls == [1]
+    assert widget_b.recorder.calls == [2]
+
+
+def test_slow_calls_do_not_delay_others():
+    slow, fast = Recorder(), Recorder()
+
+    @recurrency_filter(INTERVAL, mode="trailing")
+    def trailing_slow(value):
+        time.sleep(10 * INTERVAL)
+        slow.record(value)
+
+    @recurrency_filter(INTERVAL, mode="trailing")
+    def trailing_fast(value):
+        fast.record(value)
+
+    trailing_slow(0)
+    time.sleep(INTERVAL / 2)
+    trailing_fast(1)
+
+    # the fast call is due while the slow one is still running
+    assert fast.event.wait(timeout=5 * INTERVAL)
+    assert slow.calls == []
+    assert slow.event.wait(timeout=20 * INTERVAL)
@@ -0,0 +1,47 @@
+"""
+Tests for the references between stateful widgets, their states and Tk.
+"""
+
+import gc
+import weakref
+
+from reacTk.state import PointState
+from reacTk.widget.canvas.rectangle import Rectangle, RectangleData, RectangleState
+
+from ..widget.fake_canvas import FakeCanvas
+
+
+def create_rectangle() -> tuple[FakeCanvas, RectangleState, Rectangle]:
+    canvas = FakeCanvas()
+    state = RectangleState(RectangleData(PointState(10, 10), 4))
+    rectangle = Rectangle(canvas, state)
+
+    # the mainloop starts and draws are dispatched as events
+    canvas.afters.pop()()
+    return canvas, state, rectangle
+
+
+def test_draws_are_dispatched_as_events():
+    canvas, state, rectangle = create_rectangle()
+
+    state.data.center.set(20, 20)
+    assert canvas.events == [rectangle.event_id]
+    assert canvas.items[rectangle.id]["coords"] == [8, 8, 12, 12]
+
+    canvas.fire(rectangle.event_id)
+    assert canvas.items[rectangle.id]["coords"] == [18, 18, 22, 22]
+
+
+def test_dropped_widgets_are_collected():
+    canvas, state, rectangle = create_rectangle()
+    event_id = rectangle.event_id
+    ref = weakref.ref(rectangle)
+
+    # neither the state nor the bindings of the canvas keep the widget alive
+    del rectangle
+    gc.collect()
+    assert ref() is None
+
+    canvas.fire(event_id)
+    state.data.center.set(20, 20)
+    assert canvas.events == []
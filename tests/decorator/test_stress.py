@@ -0,0 +1,44 @@
+"""
+Stress tests of the decorators with concurrent calls from many threads.
+The sizes are kept moderate - run `python -m benchmarks.stress` for larger ones.
+"""
+
+from concurrent.futures import wait
+import threading
+import time
+
+from reacTk.decorator import async_once
+
+from benchmarks.stress import stress_async_once, stress_recurrency_filter
+
+
+def test_async_once_wait_superseded():
+    release = threading.Event()
+
+    @async_once
+    def process(i):
+        release.wait(timeout=1.0)
+        return i
+
+    futures = [process(i) for i in range(10)]
+    release.set()
+
+    # superseded calls must not block `wait`
+    _, not_done = wait(futures, timeout=1.0)
+    assert len(not_done) == 0
+    assert all(future.cancelled() for future in futures[1:-1])
+    assert futures[-1].result() == 9
+
+
+def test_stress_async_once():
+    report = stress_async_once(n_threads=8, n_instances=4, calls_per_thread=250)
+    assert report.violations == []
+    assert 0 < report.executed <= report.calls
+
+
+def test_stress_recurrency_filter():
+    start = time.perf_counter()
+    report = stress_recurrency_filter(n_threads=8, n_instances=4, calls_per_thread=250)
+    assert report.violations == []
+    assert 0 < report.executed <= report.calls
+    assert report.wall_time <= time.perf_counter() - start
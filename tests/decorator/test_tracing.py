@@ -0,0 +1,39 @@
+"""
+Tests for tracing change propagation.
+"""
+
+import json
+
+from widget_state import IntState, State
+
+from reacTk.decorator import get_tracer, trace
+from reacTk.state import PointState
+
+
+def test_trace_dependent_states(tmp_path):
+    point = PointState(1, 2)
+    shifted = point + PointState(10, 10)
+    path = tmp_path / "trace.json"
+
+    with trace(str(path)):
+        point.x.value = 5
+
+    assert shifted.values() == [15, 12]
+    assert get_tracer() is None
+
+    events = json.loads(path.read_text())["traceEvents"]
+    notifications = [event for event in events if event["ph"] == "X"]
+    assert len(notifications) > 1
+    # all notifications are caused by the same change
+    assert len(set(event["args"]["trace_id"] for event in notifications)) == 1
+    assert "notify PointState" in [event["name"] for event in notifications]
+
+
+def test_trace_restores_notify_change():
+    notify_change = State.notify_change
+
+    with trace() as tracer:
+        IntState(0).value = 1
+
+    assert State.notify_change is notify_change
+    assert len(tracer.events) == 1
@@ -0,0 +1,120 @@
+"""
+Tests for skipping draws of widgets that are not visible.
+Widgets are fakes whose bounds are given by their state, and events
+are fired by calling the bound functions.
+"""
+
+from reacTk.decorator.visibility import (
+    VIEW_CHANGED,
+    StaleWidgets,
+    draw_if_visible,
+    outside,
+)
+from reacTk.widget.canvas.canvas import Canvas
+
+from ..widget.fake_canvas import FakeCanvas
+
+
+class VisibleCanvas(FakeCanvas):
+
+    def __init__(self, region=(0, 0, 100, 100)):
+        super().__init__()
+        self.region = region
+        self.viewable = True
+        self.x_offset = self.y_offset = 0
+        self._visible_region = None
+
+    def visible_region(self):
+        return self.region
+
+    def winfo_viewable(self):
+        return self.viewable
+
+    # scrolling as needed by `Canvas.visible_region`
+    def canvasx(self, x):
+        return x + self.x_offset
+
+    def canvasy(self, y):
+        return y + self.y_offset
+
+    def winfo_width(self):
+        return 100
+
+    def winfo_height(self):
+        return 50
+
+
+class Item:
+
+    def __init__(self, canvas, bounds):
+        self.widget = canvas
+        self._state = bounds
+        self._stateful_callback = lambda state: None
+        self.draws = []
+
+    def bounds(self, state):
+        return state
+
+    def draw(self, state):
+        self.draws.append(state)
+
+
+def test_outside():
+    region = (0, 0, 100, 100)
+    assert not outside((10, 10, 20, 20), region)
+    assert not outside((-10, -10, 0, 0), region)
+    assert outside((101, 0, 110, 10), region)
+    assert outside((0, -20, 10, -1), region)
+
+
+def test_visible_region_follows_scrolling():
+    canvas = VisibleCanvas()
+    assert Canvas.visible_region(canvas) == (0, 0, 100, 50)
+
+    # the region is cached until the view changes
+    canvas.x_offset = 30
+    assert Canvas.visible_region(canvas) == (0, 0, 100, 50)
+    Canvas.view_changed(canvas)
+    assert canvas.events == [VIEW_CHANGED]
+    assert Canvas.visible_region(canvas) == (30, 0, 130, 50)
+
+
+def test_items_outside_are_drawn_when_scrolled_into_view():
+    canvas = VisibleCanvas()
+    item = Item(canvas, (10, 10, 20, 20))
+    draw_if_visible(item, item._state)
+    assert item.draws == [(10, 10, 20, 20)]
+
+    # an item moved outside is drawn once to remove it from its previous position
+    draw_if_visible(item, (200, 10, 210, 20))
+    draw_if_visible(item, (300, 10, 310, 20))
+    assert item.draws == [(10, 10, 20, 20), (200, 10, 210, 20)]
+    assert item in StaleWidgets.of(canvas, VIEW_CHANGED).widgets
+
+    # the latest state is drawn once the region contains the item
+    item._state = (300, 10, 310, 20)
+    canvas.region = (250, 0, 350, 100)
+    canvas.fire(VIEW_CHANGED)
+    assert item.draws[-1] == (300, 10, 310, 20)
+    assert len(StaleWidgets.of(canvas, VIEW_CHANGED).widgets) == 0
+
+
+def test_items_of_hidden_widgets_are_drawn_when_mapped():
+    canvas = VisibleCanvas()
+    canvas.viewable = False
+    item, unsubscribed = Item(canvas, (10, 10, 20, 20)), Item(canvas, (0, 0, 1, 1))
+
+    draw_if_visible(item, item._state)
+    draw_if_visible(unsubscribed, unsubscribed._state)
+    assert item.draws == unsubscribed.draws == []
+
+    # items still not viewable become stale again
+    canvas.fire("<Map>")
+    assert item.draws == []
+    assert item in StaleWidgets.of(canvas, "<Map>").widgets
+
+    canvas.viewable = True
+    unsubscribed._stateful_callback = None
+    canvas.fire("<Map>")
+    assert item.draws == [(10, 10, 20, 20)]
+    assert unsubscribed.draws == []
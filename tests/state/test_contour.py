@@ -0,0 +1,63 @@
+import random
+
+import numpy as np
+
+from reacTk.state import ContourState, PointState, snapshot
+
+
+def test_insert_before_after():
+    points = [PointState(i, i) for i in range(3)]
+    contour = ContourState(points)
+
+    contour.insert_before(points[1], PointState(10, 10))
+    contour.insert_after(points[2], PointState(20, 20))
+    assert [point.x.value for point in contour] == [0, 10, 1, 2, 20]
+
+    contour.remove(points[1])
+    assert [point.x.value for point in contour] == [0, 10, 2, 20]
+    assert contour.index(points[2]) == 2
+
+
+def test_index_consistent_with_list():
+    random.seed(0)
+    contour = ContourState([PointState(i, i) for i in range(50)])
+
+    for _ in range(2000):
+        op = random.random()
+        if op < 0.3:
+            contour.insert(random.randint(-60, 60), PointState(0, 0))
+        elif op < 0.45 and len(contour) > 0:
+            contour.pop(random.randint(-len(contour), len(contour) - 1))
+        elif op < 0.55 and len(contour) > 0:
+            contour.remove(random.choice(list(contour)))
+        elif op < 0.57:
+            contour.reverse()
+        elif op < 0.65:
+            contour.append(PointState(1, 1))
+        elif len(contour) > 0:
+            point = random.choice(list(contour))
+            assert contour.index(point) == list(contour).index(point)
+
+    frozen = snapshot(contour)
+    assert all(frozen.index(point) == i for i, point in enumerate(frozen))
+
+
+def test_notifications():
+    contour = ContourState([PointState(i, i) for i in range(5)])
+    notifications = []
+    contour.on_change(lambda _: notifications.append(1))
+
+    contour.insert_before(contour[2], PointState(0, 0))
+    contour.remove(contour[0])
+    assert len(notifications) == 2
+
+
+def test_from_numpy_casts_to_int():
+    array = np.array([[0.5, 1.75], [2.0, 3.0]])
+    assert ContourState.from_numpy(array).to_numpy().tolist() == [[0, 1], [2, 3]]
+    assert type(ContourState.from_numpy(array)[0].x.value) is int
+
+    contour = ContourState.from_numpy(array, keep_type=True)
+    assert contour.to_numpy().tolist() == [[0.5, 1.75], [2.0, 3.0]]
+    contour.set_numpy(array)
+    assert contour.to_numpy().tolist() == [[0, 1], [2, 3]]
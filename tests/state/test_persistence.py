@@ -0,0 +1,87 @@
+import io
+
+import numpy as np
+import pytest
+
+from reacTk.state import (
+    BoundingBoxState,
+    ContourState,
+    PointState,
+    load_npz,
+    save_npz,
+)
+
+
+def contour(n, offset=0):
+    return ContourState([PointState(offset + i, 2 * i) for i in range(n)])
+
+
+def test_save_load():
+    file = io.BytesIO()
+    save_npz(
+        file,
+        point=PointState(1, 2),
+        points=[PointState(3, 4), PointState(5, 6)],
+        contour=contour(5),
+        contours=[contour(3), contour(1, offset=10), contour(4)],
+        box=BoundingBoxState(1, 2, 3, 4),
+        boxes=[BoundingBoxState(0, 0, 1, 1), BoundingBoxState(2, 2, 3, 3)],
+        nothing=[],
+    )
+    file.seek(0)
+    annotations = load_npz(file)
+
+    assert annotations["point"].values() == [1, 2]
+    assert [point.values() for point in annotations["points"]] == [[3, 4], [5, 6]]
+    assert annotations["contour"].serialize() == contour(5).serialize()
+    assert [len(_contour) for _contour in annotations["contours"]] == [3, 1, 4]
+    assert annotations["contours"][1][0].values() == [10, 0]
+    assert annotations["box"].tlbr() == (1, 2, 3, 4)
+    assert [box.tlbr() for box in annotations["boxes"]] == [(0, 0, 1, 1), (2, 2, 3, 3)]
+    assert annotations["nothing"] == []
+
+
+def test_save_invalid():
+    with pytest.raises(TypeError):
+        save_npz(io.BytesIO(), mixed=[PointState(0, 0), contour(2)])
+
+
+def test_set_numpy_notifies_once():
+    state = contour(10)
+    notifications = []
+    state.on_change(lambda _: notifications.append(1))
+
+    state.set_numpy(np.arange(2000).reshape(-1, 2))
+    assert len(notifications) == 1
+    assert len(state) == 1000
+    assert np.array_equal(state.to_numpy(), np.arange(2000).reshape(-1, 2))
+
+    state.deserialize([{"x": 1, "y": 2}])
+    assert len(notifications) == 2
+    assert state.to_numpy().tolist() == [[1, 2]]
+
+    box = BoundingBoxState(0, 0, 1, 1)
+    box.on_change(lambda _: notifications.append(1))
+    box.set_numpy(np.array([4, 5, 6, 7]))
+    assert len(notifications) == 3
+    assert box.to_numpy().tolist() == [4, 5, 6, 7]
+
+
+def test_load_keeps_coordinate_types():
+    file = io.BytesIO()
+    save_npz(
+        file,
+        points=[PointState(0.5, 1.25)],
+        contour=ContourState([PointState(0.5, 1), PointState(2, 3)]),
+        contours=[contour(2)],
+        boxes=[BoundingBoxState(0, 0, 1, 1)],
+    )
+    file.seek(0)
+    annotations = load_npz(file)
+
+    # coordinates of points and contours are not rounded
+    assert annotations["points"][0].values() == [0.5, 1.25]
+    assert annotations["contour"][0].values() == [0.5, 1.0]
+    assert annotations["contours"][0][1].values() == [1, 2]
+    assert type(annotations["contours"][0][1].x.value) is int
+    assert type(annotations["boxes"][0].x1.value) is int
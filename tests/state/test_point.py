@@ -0,0 +1,108 @@
+import gc
+
+from widget_state import DictState, IntState, NumberState
+
+from reacTk.state import PointExpression, PointState
+
+
+def test_expression_fuses_operations():
+    point = PointState(4, 6)
+    origin = PointState(1, 2)
+    scale = NumberState(2)
+    offset = PointState(10, 10)
+
+    expression = (point.lazy() - origin) * scale + offset
+    assert isinstance(expression, PointExpression)
+    assert expression.value() == (16, 18)
+
+    result = expression.state()
+    assert result.values() == [16, 18]
+
+    notifications = []
+    result.on_change(lambda state: notifications.append(state.values()))
+
+    # each change of an input recomputes the result in one step
+    scale.value = 3
+    point.set(5, 5)
+    origin.x.value = 0
+    assert notifications == [[19, 22], [22, 19], [25, 19]]
+
+    # inputs are observed directly without intermediate states
+    assert len(point._callbacks) == 1
+    assert len(scale._callbacks) == 1
+
+
+def test_expression_operands():
+    point = PointState(2, 4)
+
+    assert (2 * point.lazy()).value() == (4, 8)
+    assert (1 - point.lazy()).value() == (-1, -3)
+    assert (-point.lazy() / 2).value() == (-1.0, -2.0)
+    assert (point - point.lazy()).value() == (0, 0)
+
+    # an input used multiple times is observed once
+    result = (point.lazy() + point).state()
+    notifications = []
+    result.on_change(lambda state: notifications.append(state.values()))
+    point.set(1, 1)
+    assert notifications == [[2, 2]]
+
+
+def test_expression_reflected_operands():
+    point = PointState(2, 4)
+
+    assert (8 / point.lazy()).value() == (4.0, 2.0)
+    assert (2 - point.lazy()).value() == (0, -2)
+
+    # number states on the left are wrapped as expressions
+    number = PointExpression.of(NumberState(8))
+    assert (number + point.lazy()).value() == (10, 12)
+    assert (number - point.lazy()).value() == (6, 4)
+    assert (number * point.lazy()).value() == (16, 32)
+    assert (number / point.lazy()).value() == (4.0, 2.0)
+    assert (PointExpression.of(IntState(1)) - point.lazy()).value() == (-1, -3)
+
+
+def test_expression_state_is_disposed():
+    point = PointState(2, 4)
+    n_callbacks = len(point._callbacks)
+
+    result = (point.lazy() * 2).state()
+    assert len(point._callbacks) == n_callbacks + 1
+
+    del result
+    gc.collect()
+    assert len(point._callbacks) == n_callbacks
+    point.set(1, 1)
+
+
+def test_many_points():
+    points = PointState.many([(1, 2), (3.5, 4)])
+    assert [point.values() for point in points] == [[1, 2], [3.5, 4]]
+    assert type(points[0].x) is NumberState
+
+    # points notify on changes of their coordinates as constructed ones do
+    notifications = []
+    points[0].on_change(lambda state: notifications.append(state.values()))
+    points[0].x.value = 5
+    points[0].set(6, 7)
+    assert notifications == [[5, 2], [6, 7]]
+    assert points[0].x._parent is points[0]
+
+
+def test_many_points_match_states():
+    # `many` and `init_dict_state` set the attributes of widget_state directly
+    point = PointState.many([(1, 2)])[0]
+    constructed = DictState()
+    constructed.x = NumberState(1)
+    constructed.y = NumberState(2)
+
+    for state, expected in [
+        (point, constructed),
+        (PointState(1, 2), constructed),
+        (point.x, constructed.x),
+    ]:
+        assert vars(state).keys() == vars(expected).keys()
+        for name, value in vars(expected).items():
+            if name not in ("_callbacks", "_parent", "x", "y"):
+                assert vars(state)[name] == value, name
@@ -0,0 +1,113 @@
+"""
+Tests for immutable snapshots of states.
+"""
+
+import threading
+
+import pytest
+
+from reacTk.state import (
+    BoundingBoxState,
+    ContourState,
+    PointState,
+    Snapshots,
+    snapshot,
+)
+
+
+def test_snapshot_is_independent():
+    contour = ContourState([PointState(1, 2), PointState(3, 4)])
+
+    frozen = snapshot(contour)
+    contour[0].x.value = 10
+    contour.append(PointState(5, 6))
+
+    assert isinstance(frozen, ContourState)
+    assert [point.values() for point in frozen] == [[1, 2], [3, 4]]
+
+
+def test_snapshot_is_immutable():
+    frozen = snapshot(PointState(1, 2))
+
+    with pytest.raises(AttributeError):
+        frozen.x.value = 3
+    with pytest.raises(AttributeError):
+        frozen.on_change(lambda state: None)
+
+
+def test_snapshot_shares_states():
+    frozen = snapshot(BoundingBoxState(1, 2, 3, 4))
+
+    # corners share the coordinate states as in the original
+    assert frozen.top_left().x is frozen.x1
+    assert frozen.bottom_right().values() == [3, 4]
+
+
+def test_snapshots_copy_changed_states():
+    contour = ContourState([PointState(i, i) for i in range(100)])
+    snapshots = Snapshots(contour)
+
+    first = snapshots.take()
+    assert snapshots.take() is first
+
+    contour[0].x.value = 10
+    second = snapshots.take()
+    assert second[0].values() == [10, 0]
+    assert first[0].values() == [0, 0]
+    # unchanged points are shared with the previous snapshot
+    assert all(second[i] is first[i] for i in range(1, 100))
+
+    contour.append(PointState(5, 6))
+    removed = contour.pop(0)
+    third = snapshots.take()
+    assert third[-1].values() == [5, 6]
+    assert len(third) == 100
+
+    # removed states are no longer observed
+    assert all(id(state) in snapshots.observed for state in contour)
+    assert id(removed) not in snapshots.observed
+
+
+def test_snapshots_are_not_torn_by_concurrent_writers():
+    bounding_box = BoundingBoxState(0, 0, 0, 0)
+    snapshots = Snapshots(bounding_box)
+    stop = threading.Event()
+
+    def write():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            bounding_box.set(i, i, i, i)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for _ in range(2000):
+            frozen = snapshots.take()
+            assert len(set(frozen.tlbr())) == 1
+            assert frozen.top_left().values() == frozen.bottom_right().values()
+    finally:
+        stop.set()
+        writer.join()
+
+    # the last change is part of the next snapshot
+    assert snapshots.take().tlbr() == bounding_box.tlbr()
+
+
+def test_snapshots_close():
+    point = PointState(1, 2)
+    snapshots = Snapshots(point)
+    n_callbacks = len(point.x._callbacks)
+
+    snapshots.close()
+    assert len(point.x._callbacks) == n_callbacks - 1
+
+
+def test_snapshots_are_up_to_date_in_callbacks():
+    point = PointState(1, 2)
+    taken = []
+    point.on_change(lambda _: taken.append(snapshots.take().values()))
+    snapshots = Snapshots(point)
+
+    point.x.value = 5
+    assert taken == [[5, 2]]
@@ -0,0 +1,102 @@
+import numpy as np
+
+from reacTk.state import AnnotationStore, PointState
+
+
+def square(x, y, size=10):
+    return np.array([[x, y], [x + size, y], [x + size, y + size], [x, y + size]])
+
+
+def test_add_and_materialize(tmp_path):
+    store = AnnotationStore(str(tmp_path / "store"))
+    ids = store.add_many(0, [square(0, 0), square(20, 20)])
+    other = store.add(1, square(5, 5))
+
+    assert store.contour_ids(0) == ids
+    assert store.contour_ids(1) == [other]
+    assert store.contour_ids(2) == []
+    assert store.images() == [0, 1]
+
+    contours = store.materialize(0)
+    assert list(contours) == ids
+    assert contours[ids[1]].to_numpy().tolist() == square(20, 20).tolist()
+    # only the contours of the image are materialized
+    assert list(store.callbacks) == ids
+
+
+def test_write_back(tmp_path):
+    path = str(tmp_path / "store")
+    store = AnnotationStore(path)
+    contour_id = store.add(0, square(0, 0))
+    contour = store.materialize(0)[contour_id]
+
+    # a moved vertex is written in place
+    contour[0].set(1, 2)
+    assert store.get(contour_id)[0].tolist() == [1, 2]
+    assert store.garbage() == 0
+
+    # an inserted vertex appends the contour
+    contour.insert(1, PointState(5, 0))
+    assert store.get(contour_id).tolist() == [
+        [1, 2],
+        [5, 0],
+        *square(0, 0)[1:].tolist(),
+    ]
+    assert store.garbage() == 4
+
+    # after release, changes are no longer written
+    store.release(0)
+    contour[0].set(100, 100)
+    assert store.get(contour_id)[0].tolist() == [1, 2]
+
+    reopened = AnnotationStore(path)
+    assert reopened.get(contour_id).tolist() == store.get(contour_id).tolist()
+
+
+def test_remove_and_compact(tmp_path):
+    store = AnnotationStore(str(tmp_path / "store"))
+    ids = store.add_many(0, [square(0, 0), square(20, 20), square(40, 40)])
+    store.materialize(0)
+
+    store.remove(ids[1])
+    assert store.contour_ids(0) == [ids[0], ids[2]]
+    assert list(store.materialize(0)) == [ids[0], ids[2]]
+    assert len(store) == 2
+
+    store.release(0)
+    store.compact()
+    assert len(store) == 2
+    assert store.garbage() == 0
+    assert store.get(1).tolist() == square(40, 40).tolist()
+
+
+def test_write_back_single_vertex(tmp_path):
+    store = AnnotationStore(str(tmp_path / "store"))
+    contour_id = store.add(0, square(0, 0))
+    contour = store.materialize(0)[contour_id]
+
+    # a moved vertex only writes its row
+    writes = []
+    write = store.write
+    store.write = lambda *args: writes.append(args) or write(*args)
+    contour[2].set(7, 8)
+    assert writes == []
+    assert store.get(contour_id)[2].tolist() == [7, 8]
+
+    # points added or removed by structural changes are observed accordingly
+    point = contour.pop(0)
+    assert len(writes) == 1
+    point.set(100, 100)
+    contour.append(PointState(3, 4))
+    contour[-1].set(5, 6)
+    assert store.get(contour_id).tolist() == [[10, 0], [7, 8], [0, 10], [5, 6]]
+
+    # changes of points in a batch are written on exit
+    with contour:
+        contour.insert(0, PointState(1, 1))
+        contour[1].set(9, 9)
+    assert store.get(contour_id).tolist() == [[1, 1], [9, 9], [7, 8], [0, 10], [5, 6]]
+
+    store.release(0)
+    contour[0].set(2, 2)
+    assert store.get(contour_id)[0].tolist() == [1, 1]
@@ -0,0 +1,64 @@
+"""
+Tests for lazy imports of heavy dependencies.
+Imports are tested in fresh interpreters because the test session may
+have imported the dependencies already.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from reacTk.lazy import LazyModule, lazy_import
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "reacTk.widget.label",
+        "reacTk.util",
+        "reacTk.state",
+        "reacTk.decorator",
+        "reacTk.widget.canvas.image",
+        "reacTk.widget.canvas.raster",
+    ],
+)
+def test_import_is_lazy(module):
+    script = (
+        f"import sys, {module}; "
+        "print([m for m in ('cv2', 'numpy', 'PIL', 'screeninfo') if m in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_widget_import_loads_no_unused_features():
+    # coroutines, process pools and annotation stores are loaded on first use
+    modules = ("asyncio", "concurrent.futures.process", "reacTk.state.store")
+    script = (
+        "import sys, reacTk.widget.label; "
+        f"print([m for m in {modules} if m in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_lazy_module():
+    json = LazyModule("json")
+    assert json._module is None
+
+    assert json.dumps([1]) == "[1]"
+    assert json._module is sys.modules["json"]
+    # accessed attributes are cached on the proxy
+    assert "dumps" in json.__dict__
+
+    with pytest.raises(AttributeError):
+        json.dumps = None
+
+
+def test_lazy_import_of_imported_module():
+    assert lazy_import("sys") is sys
@@ -0,0 +1,127 @@
+"""
+Tests for the monitor service.
+Monitors are provided by a fake query so that no display is required.
+"""
+
+from screeninfo import Monitor
+
+from reacTk.util import Geometry, MonitorService
+
+LEFT = Monitor(x=0, y=0, width=1920, height=1080, is_primary=True, name="left")
+RIGHT = Monitor(x=1920, y=0, width=2560, height=1440, name="right")
+
+
+class FakeMonitors:
+
+    def __init__(self, monitors):
+        self.monitors = monitors
+        self.n_queries = 0
+
+    def __call__(self):
+        self.n_queries += 1
+        return list(self.monitors)
+
+
+class FakeToplevel:
+
+    def __init__(self, geometry):
+        self.geometry = geometry
+        self.callbacks = []
+
+    def winfo_toplevel(self):
+        return self
+
+    def winfo_width(self):
+        return self.geometry.width
+
+    def winfo_height(self):
+        return self.geometry.height
+
+    def winfo_rootx(self):
+        return self.geometry.x
+
+    def winfo_rooty(self):
+        return self.geometry.y
+
+    def bind(self, sequence, callback, add=None):
+        self.callbacks.append(callback)
+
+    def move(self, x, y):
+        self.geometry = Geometry(self.geometry.width, self.geometry.height, x, y)
+        for callback in self.callbacks:
+            callback(type("Event", (), {"widget": self})())
+
+
+def test_containment():
+    query = FakeMonitors([LEFT, RIGHT])
+    service = MonitorService(get_monitors=query)
+
+    assert service.monitor_of("800x600+100+100") is LEFT
+    assert service.monitor_of("800x600+2000+700") is RIGHT
+    # the window starts on the left monitor but mostly covers the right one
+    assert service.monitor_of("800x600+1800+100") is RIGHT
+    assert query.n_queries == 1
+
+
+def test_ttl_and_invalidate():
+    query = FakeMonitors([LEFT])
+    service = MonitorService(ttl=0.0, get_monitors=query)
+    service.monitor_of("800x600+100+100")
+    service.monitor_of("800x600+100+100")
+    assert query.n_queries == 2
+
+    service = MonitorService(ttl=None, get_monitors=query)
+    service.monitor_of("800x600+100+100")
+    query.monitors = [LEFT, RIGHT]
+    service.invalidate()
+    assert service.monitor_of("800x600+2000+100") is RIGHT
+
+
+def test_refresh_outside_of_known_monitors():
+    query = FakeMonitors([LEFT])
+    service = MonitorService(ttl=None, get_monitors=query)
+    assert service.monitor_of("800x600+100+100") is LEFT
+
+    # a monitor was connected
+    query.monitors = [LEFT, RIGHT]
+    assert service.monitor_of("800x600+2000+100") is RIGHT
+    assert query.n_queries == 2
+
+    # without any overlap, the primary monitor is used
+    assert service.monitor_of("800x600+9000+100") is LEFT
+
+
+def test_current_monitor():
+    query = FakeMonitors([LEFT, RIGHT])
+    service = MonitorService(get_monitors=query)
+    toplevel = FakeToplevel(Geometry(800, 600, 100, 100))
+
+    state = service.current_monitor(toplevel)
+    assert state.value is LEFT
+    assert service.current_monitor(toplevel) is state
+
+    changes = []
+    state.on_change(lambda state: changes.append(state.value))
+    toplevel.move(200, 100)
+    toplevel.move(2000, 100)
+    assert changes == [RIGHT]
+    assert query.n_queries == 1
+
+
+def test_refreshes_outside_of_known_monitors_are_limited():
+    query = FakeMonitors([LEFT])
+    service = MonitorService(ttl=30.0, get_monitors=query)
+    toplevel = FakeToplevel(Geometry(800, 600, 100, 100))
+    state = service.current_monitor(toplevel)
+
+    # a window dragged off-screen reports a new geometry on every event
+    for x in range(3000, 3100):
+        toplevel.move(x, 100)
+    assert state.value is LEFT
+    assert query.n_queries == 2
+
+    # the same geometry does not cause refreshes without a ttl either
+    service = MonitorService(ttl=None, get_monitors=query)
+    for _ in range(10):
+        service.monitor_of("800x600+9000+100")
+    assert query.n_queries == 4
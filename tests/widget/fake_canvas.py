@@ -0,0 +1,162 @@
+"""
+A canvas that records its items without a display.
+"""
+
+from typing import Any, Callable
+
+import tkinter as tk
+from widget_state import IntState
+
+from reacTk.widget.canvas.canvas import CanvasState
+
+DEFAULTS = {
+    "line": {"fill": "black", "width": "1.0", "dash": "", "arrow": "none"},
+    "rectangle": {"fill": "", "outline": "black", "width": "1.0", "dash": ""},
+    "oval": {"fill": "", "outline": "black", "width": "1.0", "dash": ""},
+    "text": {"text": "", "fill": "black", "anchor": "center", "font": ""},
+    "image": {"image": "", "anchor": "center"},
+}
+
+
+class FakeCanvas(tk.Canvas):
+    """
+    Fake of a `tk.Canvas` that keeps the kind, coordinates and options of
+    its items in dicts instead of drawing them.
+    """
+
+    def __init__(self, width: int = 800, height: int = 600) -> None:
+        self._w = ".fake_canvas"
+        self._state = CanvasState(IntState(width), IntState(height))
+
+        self.items: dict[int, dict[str, Any]] = {}
+        self.next_id = 1
+        self.n_created = 0
+        self.afters: list[Callable[[], None]] = []
+        self.events: list[str] = []
+        self.bindings: list[tuple[str, Callable]] = []
+        self.bound: dict[str, list[Callable]] = {}
+
+    def __str__(self) -> str:
+        return self._w
+
+    def create(self, kind: str, *coords: float, **options: Any) -> int:
+        _id = self.next_id
+        self.next_id += 1
+        self.n_created += 1
+        self.items[_id] = {
+            "kind": kind,
+            "coords": list(coords),
+            "options": {**DEFAULTS[kind], "state": "normal", "tags": ()},
+        }
+        self.itemconfig(_id, **options)
+        return _id
+
+    def create_line(self, *coords: float, **options: Any) -> int:
+        return self.create("line", *coords, **options)
+
+    def create_rectangle(self, *coords: float, **options: Any) -> int:
+        return self.create("rectangle", *coords, **options)
+
+    def create_oval(self, *coords: float, **options: Any) -> int:
+        return self.create("oval", *coords, **options)
+
+    def create_text(self, *coords: float, **options: Any) -> int:
+        return self.create("text", *coords, **options)
+
+    def create_image(self, *coords: float, **options: Any) -> int:
+        return self.create("image", *coords, **options)
+
+    def find_withtag(self, tag_or_id: int | str) -> list[int]:
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.items else []
+        return [
+            _id
+            for _id, item in self.items.items()
+            if tag_or_id in item["options"]["tags"]
+        ]
+
+    def coords(self, _id: int, *coords: float) -> list[float]:
+        if len(coords) > 0:
+            self.items[_id]["coords"] = list(coords)
+        return self.items[_id]["coords"]
+
+    def itemconfig(self, tag_or_id: int | str, **options: Any) -> Any:
+        if len(options) == 0:
+            # query the options as Tk does: name -> (name, "", "", default, value)
+            item = self.items[tag_or_id]
+            return {
+                name: (f"-{name}", "", "", DEFAULTS[item["kind"]].get(name, ""), value)
+                for name, value in item["options"].items()
+            }
+
+        if "tags" in options and isinstance(options["tags"], str):
+            options["tags"] = (options["tags"],)
+        for _id in self.find_withtag(tag_or_id):
+            self.items[_id]["options"].update(options)
+
+    itemconfigure = itemconfig
+
+    def addtag_withtag(self, tag: str, tag_or_id: int | str) -> None:
+        for _id in self.find_withtag(tag_or_id):
+            options = self.items[_id]["options"]
+            options["tags"] = (*options["tags"], tag)
+
+    def tag_raise(self, *args: Any) -> None:
+        pass
+
+    def tag_lower(self, *args: Any) -> None:
+        pass
+
+    def delete(self, tag_or_id: int | str) -> None:
+        for _id in self.find_withtag(tag_or_id):
+            self.items.pop(_id)
+
+    def tag_bind(self, tag_or_id: int | str, sequence: str, func: Callable) -> str:
+        return f"{tag_or_id}{sequence}"
+
+    def tag_unbind(self, *args: Any) -> None:
+        pass
+
+    def bind(self, sequence: str, func: Callable, add: Any = None) -> str:
+        self.bound.setdefault(sequence, []).append(func)
+        return "binding"
+
+    def fire(self, sequence: str) -> None:
+        """
+        Call the functions bound to an event sequence as Tk would.
+        """
+        for func in self.bound.get(sequence, []):
+            func(None)
+
+    def bind_all(self, sequence: str, func: Callable, add: Any = None) -> str:
+        self.bindings.append((sequence, func))
+        return "binding"
+
+    def event_generate(self, sequence: str, **kwargs: Any) -> None:
+        self.events.append(sequence)
+
+    def _root(self) -> "FakeCanvas":
+        return self
+
+    def winfo_toplevel(self) -> "FakeCanvas":
+        return self
+
+    def winfo_viewable(self) -> bool:
+        return True
+
+    def after(self, ms: int, func: Callable[[], None]) -> str:
+        self.afters.append(func)
+        return "after"
+
+    def after_idle(self, func: Callable[[], None]) -> str:
+        return self.after(0, func)
+
+    def visible(self) -> list[int]:
+        """
+        Get the ids of all items that are not hidden.
+        """
+        return [
+            _id
+            for _id, item in self.items.items()
+            if item["options"]["state"] != "hidden"
+        ]
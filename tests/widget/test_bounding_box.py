@@ -0,0 +1,73 @@
+"""
+Tests for drawing bounding boxes as lines and handles.
+"""
+
+from reacTk.widget.canvas.bounding_box import (
+    BoundingBox,
+    BoundingBoxData,
+    BoundingBoxState,
+)
+
+from .fake_canvas import FakeCanvas
+
+
+def item_coords(canvas: FakeCanvas, kind: str) -> list[list[float]]:
+    return [
+        item["coords"]
+        for _id, item in canvas.items.items()
+        if item["kind"] == kind and _id in canvas.visible()
+    ]
+
+
+def test_draw_lines_and_handles():
+    canvas = FakeCanvas()
+    BoundingBox(canvas, BoundingBoxState(BoundingBoxData(0, 0, 10, 20)))
+
+    assert sorted(item_coords(canvas, "line")) == [
+        [0, 0, 0, 20],
+        [0, 0, 10, 0],
+        [0, 20, 10, 20],
+        [10, 20, 10, 0],
+    ]
+    assert len(item_coords(canvas, "rectangle")) == 4
+
+
+def test_changes_are_drawn():
+    canvas = FakeCanvas()
+    state = BoundingBoxState(BoundingBoxData(0, 0, 10, 20))
+    bounding_box = BoundingBox(canvas, state)
+
+    state.data.x1.value = 5
+    state.style.line_style.color.value = "red"
+    state.style.rectangle_size.value = 4
+
+    line = canvas.items[bounding_box.lines[0].id]
+    assert line["coords"] == [5, 0, 10, 0]
+    assert line["options"]["fill"] == "red"
+    assert canvas.items[bounding_box.rectangles[0].id]["coords"] == [3, -2, 7, 2]
+
+
+def test_rebind_reuses_items_and_bindings():
+    canvas = FakeCanvas()
+    bounding_box = BoundingBox(canvas, BoundingBoxState(BoundingBoxData(0, 0, 1, 1)))
+    bounding_box.tag_bind("<Button-1>", lambda event, item: None, "rectangle")
+    n_created = canvas.n_created
+
+    other = BoundingBoxState(BoundingBoxData(0, 0, 10, 20))
+    bounding_box.rebind(other)
+    assert canvas.n_created == n_created
+    assert [0, 20, 10, 20] in item_coords(canvas, "line")
+    assert all(len(rect.bindings) == 1 for rect in bounding_box.rectangles)
+
+    other.style.line_style.color.value = "red"
+    assert canvas.items[bounding_box.lines[0].id]["options"]["fill"] == "red"
+
+
+def test_delete():
+    canvas = FakeCanvas()
+    data = BoundingBoxData(0, 0, 10, 20)
+    bounding_box = BoundingBox(canvas, BoundingBoxState(data))
+
+    bounding_box.delete()
+    data.x1.value = 5
+    assert canvas.visible() == []
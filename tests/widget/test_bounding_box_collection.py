@@ -0,0 +1,83 @@
+"""
+Tests for drawing bounding boxes of detections with a pool of items.
+The Tcl scripts of a draw are recorded instead of being evaluated.
+"""
+
+import tkinter as tk
+
+import numpy as np
+import pytest
+
+from reacTk.widget.canvas.bounding_box_collection import (
+    BoundingBoxCollection,
+    BoundingBoxCollectionData,
+    BoundingBoxCollectionState,
+    tcl_quote,
+)
+
+from .fake_canvas import FakeCanvas
+
+
+class ScriptRecorder:
+
+    def __init__(self):
+        self.scripts = []
+
+    def eval(self, script):
+        self.scripts.append(script.split("\n"))
+
+
+def create_collection(boxes):
+    canvas = FakeCanvas()
+    canvas.tk = ScriptRecorder()
+    data = BoundingBoxCollectionData(np.array(boxes))
+    collection = BoundingBoxCollection(canvas, BoundingBoxCollectionState(data))
+    return canvas, data, collection
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "person 0.93",
+        "{unbalanced",
+        "} {",
+        "back\\slash\\",
+        "$price",
+        "[exit]",
+        'say "hi"; again',
+        "line\nbreak\ttab",
+    ],
+)
+def test_tcl_quote(text):
+    # a Tcl interpreter does not require a display
+    interpreter = tk.Tcl()
+    assert interpreter.eval(f"set text {tcl_quote(text)}") == text
+    assert interpreter.eval(f"llength [list {tcl_quote(text)}]") == "1"
+
+
+def test_shrinking_detections_reuse_items():
+    canvas, data, collection = create_collection(
+        [[0, 0, 10, 10], [20, 20, 30, 30], [40, 40, 50, 50]]
+    )
+    rectangles = list(collection.rectangles)
+    assert len(rectangles) == 3 and canvas.n_created == 6
+
+    # items that are not needed are hidden instead of deleted
+    data.set(np.array([[0, 0, 10, 10]]), labels=["cat"])
+    script = canvas.tk.scripts[-1]
+    assert collection.rectangles == rectangles and canvas.n_created == 6
+    assert collection.n_visible == 1
+    assert f"{canvas} itemconfigure {rectangles[1]} -state hidden" in script
+    assert f"{canvas} itemconfigure {rectangles[2]} -state hidden" in script
+    # the first box is unchanged and only gets its text
+    assert not any(" coords " in line for line in script)
+    assert f"{canvas} itemconfigure {collection.texts[0]} -text cat" in script
+
+    # growing again shows hidden items before creating new ones
+    data.set(np.array([[0, 0, 10, 10], [60, 60, 70, 70]]), labels=["cat", "dog"])
+    script = canvas.tk.scripts[-1]
+    assert canvas.n_created == 6
+    assert f"{canvas} coords {rectangles[1]} 60 60 70 70" in script
+    assert f"{canvas} itemconfigure {rectangles[1]} -state normal" in script
+    assert not any(str(rectangles[2]) in line.split() for line in script)
@@ -0,0 +1,82 @@
+"""
+Tests for the reconciliation of the items of a contour with its points.
+"""
+
+from reacTk.decorator.governor import QUALITY_LOW, get_governor
+from reacTk.state import PointState
+from reacTk.widget.canvas.contour import Contour, ContourData, ContourState
+
+from .fake_canvas import FakeCanvas
+
+
+def create_contour(n_points: int = 4) -> tuple[FakeCanvas, ContourData, Contour]:
+    canvas = FakeCanvas()
+    data = ContourData([PointState(10 * i, i) for i in range(n_points)])
+    return canvas, data, Contour(canvas, ContourState(data))
+
+
+def test_draw_creates_item_per_point_and_segment():
+    canvas, data, contour = create_contour()
+
+    assert len(contour.lines) == len(contour.rectangles) == len(data)
+    assert [rect._state.data.center for rect in contour.rectangles] == list(data)
+    assert contour.lines[-1]._state.data.end is data[0]
+    assert canvas.n_created == 2 * len(data)
+
+
+def test_insert_keeps_unchanged_items():
+    canvas, data, contour = create_contour()
+    lines, rectangles = list(contour.lines), list(contour.rectangles)
+
+    data.insert(2, PointState(15, 5))
+
+    assert contour.rectangles[:2] == rectangles[:2]
+    assert contour.rectangles[3:] == rectangles[2:]
+    # only the split segment is replaced by two new ones
+    assert contour.lines[0] is lines[0]
+    assert contour.lines[3:] == lines[2:]
+    assert contour.lines[1]._state.data.end is data[2]
+    assert contour.lines[2]._state.data.start is data[2]
+
+
+def test_removed_items_are_reused():
+    canvas, data, contour = create_contour()
+    contour.tag_bind("<Button-1>", lambda event, item: None, "rectangle")
+    n_created = canvas.n_created
+
+    point = data[1]
+    data.remove(point)
+    assert len(contour.rectangles) == len(contour.lines) == 3
+    assert point not in [rect._state.data.center for rect in contour.rectangles]
+
+    # items released to the pool are reused for the new point and its segments
+    data.append(PointState(50, 50))
+    assert canvas.n_created == n_created
+    assert contour.rectangles[-1]._state.data.center is data[-1]
+    assert all(len(rect.bindings) == 1 for rect in contour.rectangles)
+
+
+def test_delete_releases_items():
+    canvas, data, contour = create_contour()
+
+    contour.delete()
+    assert canvas.visible() == []
+
+    # the contour no longer reacts to changes
+    data.append(PointState(50, 50))
+    assert canvas.visible() == []
+
+
+def test_handles_are_hidden_with_low_quality():
+    governor = get_governor()
+    governor.configure(enabled=True)
+    governor.quality = QUALITY_LOW
+    try:
+        canvas, data, contour = create_contour()
+        data.append(PointState(50, 50))
+
+        # only lines are visible, including the ones of the added point
+        visible = [canvas.items[_id]["kind"] for _id in canvas.visible()]
+        assert visible == ["line"] * len(data)
+    finally:
+        governor.configure(enabled=False)
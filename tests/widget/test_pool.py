@@ -0,0 +1,59 @@
+"""
+Tests for the pool of hidden canvas items.
+"""
+
+from reacTk.widget.canvas.pool import POOL_TAG, ItemPool
+
+from .fake_canvas import FakeCanvas
+
+
+def test_released_items_are_reused():
+    canvas = FakeCanvas()
+    pool = ItemPool(canvas)
+
+    _id = pool.acquire("line", 0, 0, 10, 10)
+    pool.release(_id)
+    assert canvas.items[_id]["options"]["state"] == "hidden"
+    assert canvas.items[_id]["options"]["tags"] == (POOL_TAG,)
+
+    assert pool.acquire("line", 1, 1, 2, 2, tags="a") == _id
+    assert canvas.n_created == 1
+    assert canvas.items[_id]["coords"] == [1, 1, 2, 2]
+    assert canvas.items[_id]["options"]["state"] == "normal"
+    assert canvas.items[_id]["options"]["tags"] == ("a",)
+
+    # items of other kinds are not reused
+    assert pool.acquire("rectangle", 0, 0, 1, 1) != _id
+
+
+def test_released_items_are_reset_to_defaults():
+    canvas = FakeCanvas()
+    pool = ItemPool(canvas)
+
+    _id = pool.acquire("text", 0, 0, text="label", anchor="nw", fill="red")
+    canvas.itemconfig(_id, font="Arial 20")
+    pool.release(_id)
+
+    assert pool.acquire("text", 0, 0, text="other") == _id
+    options = canvas.items[_id]["options"]
+    assert options["text"] == "other"
+    assert options["anchor"] == "center"
+    assert options["fill"] == "black"
+    assert options["font"] == ""
+
+
+def test_pool_size_is_limited():
+    canvas = FakeCanvas()
+    pool = ItemPool(canvas, max_size=1)
+
+    ids = [pool.acquire("oval", 0, 0, 1, 1) for _ in range(3)]
+    for _id in ids:
+        pool.release(_id)
+
+    assert len(pool.items["oval"]) == 1
+    assert list(canvas.items) == ids[:1]
+
+    # ids that were not acquired from the pool are deleted
+    pool.release(ids[0])
+    pool.release(ids[0])
+    assert len(canvas.items) == 0
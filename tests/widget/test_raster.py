@@ -0,0 +1,175 @@
+"""
+Tests for the partial re-rasterization of a raster layer.
+The layer rasterizes into its NumPy buffer and the regions copied into
+the displayed image are recorded instead of being copied by Tk.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from reacTk.state import PointState
+from reacTk.widget.canvas import raster
+from reacTk.widget.canvas.line import LineData, LineState
+from reacTk.widget.canvas.raster import (
+    RasterLayer,
+    RasterLayerData,
+    RasterLayerState,
+    SpatialIndex,
+    merge_regions,
+)
+
+from .fake_canvas import FakeCanvas
+
+
+class RecordingLayer(RasterLayer):
+
+    def __init__(self, canvas, state):
+        self.copied = []
+        super().__init__(canvas, state)
+
+    def copy_to_photo(self, region):
+        self.copied.append(region)
+
+
+@pytest.fixture(autouse=True)
+def no_photo_images(monkeypatch):
+    monkeypatch.setattr(
+        raster, "ImageTk", SimpleNamespace(PhotoImage=lambda image: object())
+    )
+
+
+def create_layer(*lines, size=100):
+    canvas = FakeCanvas(width=size, height=size)
+    data = RasterLayerData([line(*coords) for coords in lines])
+    return canvas, data, RecordingLayer(canvas, RasterLayerState(data))
+
+
+def line(x1, y1, x2, y2):
+    return LineState(LineData(PointState(x1, y1), PointState(x2, y2)))
+
+
+def drawn(layer, x, y):
+    return layer.buffer[y, x, 3] > 0
+
+
+def test_merge_regions():
+    assert merge_regions([(0, 0, 10, 10), (20, 20, 30, 30)]) == [
+        (0, 0, 10, 10),
+        (20, 20, 30, 30),
+    ]
+    # regions sharing an edge do not overlap since right and bottom are exclusive
+    assert len(merge_regions([(0, 0, 10, 10), (10, 0, 20, 10)])) == 2
+
+    # a merged region that grows over others is merged with them as well
+    regions = [(0, 0, 10, 10), (20, 0, 30, 10), (5, 5, 25, 8)]
+    assert merge_regions(regions) == [(0, 0, 30, 10)]
+
+
+def test_moved_primitive_redraws_old_and_new_region():
+    canvas, data, layer = create_layer((10, 10, 20, 10))
+    assert layer.copied == []
+    assert drawn(layer, 15, 10)
+
+    with data[0]:
+        data[0].data.start.set(30, 30)
+        data[0].data.end.set(40, 30)
+
+    # only the previous and the new bounds of the line are re-rasterized
+    assert layer.index.bounds[id(data[0])] == (28, 28, 43, 33)
+    assert sorted(layer.copied) == [(8, 8, 23, 13), (28, 28, 43, 33)]
+    assert not drawn(layer, 15, 10)
+    assert drawn(layer, 35, 30)
+    assert canvas.n_created == 1
+
+
+def test_overlapping_regions_are_redrawn_once():
+    canvas, data, layer = create_layer((10, 10, 20, 10))
+
+    data[0].data.end.set(21, 10)
+    assert layer.copied == [(8, 8, 24, 13)]
+    assert drawn(layer, 21, 10)
+
+
+def test_regions_are_clipped_to_the_canvas():
+    canvas, data, layer = create_layer((10, 50, 20, 50))
+
+    data[0].data.start.set(-50, 50)
+    assert layer.index.bounds[id(data[0])] == (-52, 48, 23, 53)
+    assert layer.copied == [(0, 48, 23, 53)]
+    assert drawn(layer, 0, 50)
+
+    # regions outside the canvas are not rasterized
+    with data[0]:
+        data[0].data.start.set(-50, -50)
+        data[0].data.end.set(-40, -50)
+    n_copied = len(layer.copied)
+    data[0].data.start.set(-60, -50)
+    assert len(layer.copied) == n_copied
+    assert layer.copied[-1] == (0, 48, 23, 53)
+    assert not layer.buffer[:, :, 3].any()
+
+
+def test_large_changes_redraw_the_layer():
+    canvas, data, layer = create_layer((10, 10, 20, 10))
+    image = layer.img_tk
+
+    data.append(line(0, 0, 99, 99))
+    assert layer.copied == []
+    assert layer.img_tk is not image
+    assert canvas.items[layer.id]["options"]["image"] is layer.img_tk
+
+
+def test_spatial_index():
+    index = SpatialIndex(cell_size=10)
+    index.insert(1, (0, 0, 5, 5))
+    index.insert(2, (8, 8, 25, 12))
+    index.insert(3, (-10000, 0, 10000, 5))
+
+    assert index.query((0, 0, 10, 10)) == {1, 2, 3}
+    assert index.query((20, 10, 30, 20)) == {2}
+    assert index.query((50, 50, 60, 60)) == set()
+    assert 3 in index.large
+
+    index.insert(2, (50, 50, 55, 55))
+    assert index.query((20, 10, 30, 20)) == set()
+    assert index.remove(2) == (50, 50, 55, 55)
+    assert index.query((0, 0, 100, 100)) == {1, 3}
+    # cells without primitives are dropped
+    assert sorted(index.cells) == [(0, 0)]
+
+
+def test_rasterizing_visits_primitives_of_the_region(monkeypatch):
+    spacing = 50
+    canvas, data, layer = create_layer(
+        *[
+            (x, y, x + 4, y)
+            for x in range(0, 1000, spacing)
+            for y in range(0, 1000, spacing)
+        ],
+        size=1000,
+    )
+    assert len(data) == 400
+
+    visited, painted = [], []
+    intersects = raster.intersects
+    monkeypatch.setattr(
+        raster, "intersects", lambda a, b: visited.append(a) or intersects(a, b)
+    )
+    draw_primitive = layer.draw_primitive
+    layer.draw_primitive = lambda *args: painted.append(args[1]) or draw_primitive(
+        *args
+    )
+
+    line = data[42]
+    line.data.end.set(106, 100)
+    assert painted == [line]
+    # only the primitives in the grid cells of the changed region are visited
+    assert 0 < len(visited) <= 4
+
+    # removed primitives are cleared and no longer observed
+    data.remove(line)
+    assert not drawn(layer, 102, 100)
+    visited.clear()
+    line.data.start.set(0, 0)
+    assert visited == []